@@ -7,6 +7,7 @@ from flask_bcrypt import Bcrypt
 from flask_marshmallow import Marshmallow
 
 from config.config import config
+from app.utils.json_provider import JSONProvider
 
 db = SQLAlchemy()
 migrate = Migrate()
@@ -18,7 +19,11 @@ ma = Marshmallow()
 def create_app(config_name='default'):
     app = Flask(__name__)
     app.config.from_object(config[config_name])
+    app.json = JSONProvider(app)
     
+    if app.config['METRICS_ENABLED']:
+        from app.services.metrics import metrics
+        metrics.init_app(app)
     
     db.init_app(app)
     migrate.init_app(app, db)
@@ -27,8 +32,23 @@ def create_app(config_name='default'):
     bcrypt.init_app(app)
     ma.init_app(app)
     
+    from app.services.response_cache import response_cache
+    response_cache.init_app(app)
+    
+    if app.config['COMPRESSION_ENABLED']:
+        from app.utils.compression import compression
+        compression.init_app(app)
+    
+    if app.config['SQL_INSTRUMENTATION']:
+        from app.utils.sql_instrumentation import sql_instrumentation
+        sql_instrumentation.init_app(app)
+    
+    if app.config['PROFILER_ENABLED']:
+        from app.services.profiler import profiler
+        profiler.init_app(app)
+    
    
-    from app.models import user, childrens_home, donation, review, visit
+    from app.models import user, childrens_home, donation, review, visit, rating_summary, home_stats, visit_capacity, export_job
     
     
     from app.routes.auth import auth_bp
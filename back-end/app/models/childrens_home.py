@@ -1,24 +1,76 @@
-from flask import Blueprint, request, jsonify
-from app.models.childrens_home import ChildrenHome
+from datetime import datetime
+from app import db
 
+class ChildrensHome(db.Model):
+    __tablename__ = 'childrens_homes'
 
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(200), nullable=False)
+    description = db.Column(db.Text)
+    location = db.Column(db.String(200), nullable=False)
+    address = db.Column(db.String(300))
+    phone_number = db.Column(db.String(20))
+    email = db.Column(db.String(120))
+    capacity = db.Column(db.Integer)
+    current_children_count = db.Column(db.Integer, default=0)
+    established_date = db.Column(db.Date)
+    contact_person = db.Column(db.String(100))
+    website = db.Column(db.String(200))
+    image_url = db.Column(db.String(300))
+    needs_description = db.Column(db.Text)
+    is_active = db.Column(db.Boolean, default=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
-home_bp = Blueprint('home', __name__)
+    # Public lists only show active homes, newest first; the partial index
+    # covers that filter and order without indexing inactive homes.
+    __table_args__ = (
+        db.Index(
+            'ix_childrens_homes_active_created_at',
+            'created_at', 'id',
+            postgresql_where=db.text('is_active'),
+            sqlite_where=db.text('is_active = 1')
+        ),
+    )
 
-@home_bp.route('/homes', methods=['GET'])
-def list_homes():
-    homes = ChildrenHome.query.all()
-    return jsonify([home.to_dict() for home in homes])
 
-@home_bp.route('/homes', methods=['POST'])
-def add_home():
-    data = request.json
-    home = ChildrenHome(**data)
-    if not home.name or not home.location:
-        return jsonify({'error': 'Name and location are required'}), 400
-    return jsonify(home.to_dict()), 201
+    donations = db.relationship('Donation', backref='home', lazy=True)
+    reviews = db.relationship('Review', backref='home', lazy=True)
+    visits = db.relationship('Visit', backref='home', lazy=True)
+    rating_summary = db.relationship('HomeRatingSummary', uselist=False, lazy=True, viewonly=True)
+    stats = db.relationship('HomeStats', uselist=False, lazy=True, viewonly=True)
 
-@home_bp.route('/homes/<int:id>', methods=['GET'])
-def get_home(id):
-    home = ChildrenHome.query.get_or_404(id)
-    return jsonify(home.to_dict())
\ No newline at end of file
+    SERIALIZED_FIELDS = (
+        'id', 'name', 'description', 'location', 'address', 'phone_number', 'email',
+        'capacity', 'current_children_count', 'established_date', 'contact_person',
+        'website', 'image_url', 'needs_description', 'is_active', 'average_rating',
+        'total_donations_received', 'total_visits', 'reviews_count', 'created_at', 'updated_at'
+    )
+
+    # Serialized fields read from a one-to-one summary row rather than a column:
+    # field -> (relationship, value from the related row); 0 when it is missing.
+    DERIVED_FIELDS = {
+        'average_rating': ('rating_summary', lambda summary: round(summary.average_rating or 0, 2)),
+        'reviews_count': ('rating_summary', lambda summary: summary.approved_count),
+        'total_donations_received': ('stats', lambda stats: float(stats.donation_total)),
+        'total_visits': ('stats', lambda stats: stats.visit_count)
+    }
+
+    def to_dict(self, fields=None):
+        """Serialize the home, or only `fields` when given.
+
+        Dates are left as date/datetime for the app's JSON provider to encode.
+        """
+        data = {}
+        for name in self.SERIALIZED_FIELDS if fields is None else fields:
+            derived = self.DERIVED_FIELDS.get(name)
+            if derived is None:
+                data[name] = getattr(self, name)
+            else:
+                relationship, value = derived
+                related = getattr(self, relationship)
+                data[name] = value(related) if related else 0
+        return data
+
+    def __repr__(self):
+        return f'<ChildrensHome {self.name}>'
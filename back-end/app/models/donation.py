@@ -1,5 +1,6 @@
 from datetime import datetime
 from app import db
+from app.services.home_registry import get_home
 
 class Donation(db.Model):
     __tablename__ = 'donations'
@@ -18,7 +19,13 @@ class Donation(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    __table_args__ = (
+        db.Index('ix_donations_user_status_created_at', 'user_id', 'status', 'created_at'),
+        db.Index('ix_donations_home_status', 'home_id', 'status'),
+    )
+    
     def to_dict(self):
+        home = get_home(self.home_id)
         return {
             'id': self.id,
             'user_id': self.user_id,
@@ -34,7 +41,7 @@ class Donation(db.Model):
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None,
             'donor_name': f"{self.donor.first_name} {self.donor.last_name}" if not self.anonymous and self.donor else "Anonymous",
-            'home_name': self.home.name if self.home else None
+            'home_name': home.name if home else None
         }
     
     def __repr__(self):
@@ -0,0 +1,48 @@
+from datetime import datetime
+from app import db
+
+class ExportJob(db.Model):
+    __tablename__ = 'export_jobs'
+
+    id = db.Column(db.String(32), primary_key=True)
+    report = db.Column(db.String(50), nullable=False)  # donations, visits, home-statements
+    format = db.Column(db.String(10), nullable=False)  # csv, jsonl
+    parameters = db.Column(db.JSON, default=dict)
+    status = db.Column(db.String(20), default='queued')  # queued, running, completed, failed, expired
+    total_rows = db.Column(db.Integer)
+    rows_written = db.Column(db.Integer, default=0)
+    file_path = db.Column(db.String(500))
+    error = db.Column(db.Text)
+    requested_by = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    worker = db.Column(db.String(100))  # host:pid of the process running the job
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime)
+    finished_at = db.Column(db.DateTime)
+
+    def to_dict(self, rows_written=None):
+        rows_written = self.rows_written if rows_written is None else rows_written
+        if self.status in ('completed', 'expired'):
+            progress = 100
+        elif self.total_rows:
+            progress = min(99, int(rows_written * 100 / self.total_rows))
+        else:
+            progress = 0
+
+        return {
+            'id': self.id,
+            'report': self.report,
+            'format': self.format,
+            'parameters': self.parameters or {},
+            'status': self.status,
+            'total_rows': self.total_rows,
+            'rows_written': rows_written,
+            'progress': progress,
+            'error': self.error,
+            'requested_by': self.requested_by,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None
+        }
+
+    def __repr__(self):
+        return f'<ExportJob {self.id} {self.report} {self.status}>'
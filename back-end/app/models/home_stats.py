@@ -0,0 +1,133 @@
+from collections import defaultdict
+from datetime import datetime
+from decimal import Decimal
+from sqlalchemy import event, func, inspect, select, insert
+from sqlalchemy.orm import object_session
+from app import db
+from app.models.childrens_home import ChildrensHome
+from app.models.donation import Donation
+from app.models.visit import Visit
+from app.services.response_cache import invalidate_homes_on_commit
+from app.utils.counters import apply_counter_deltas, track_previous_values
+
+
+class HomeStats(db.Model):
+    __tablename__ = 'home_stats'
+
+    # Per-home visit and completed-donation totals for the admin analytics,
+    # maintained by the mapper events below. Approved review counts and sums
+    # live in home_rating_summaries.
+    home_id = db.Column(db.Integer, db.ForeignKey('childrens_homes.id'), primary_key=True)
+    visit_count = db.Column(db.Integer, nullable=False, default=0)
+    donation_count = db.Column(db.Integer, nullable=False, default=0)
+    donation_total = db.Column(db.Numeric(14, 2), nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        db.Index('ix_home_stats_visit_count', 'visit_count'),
+        db.Index('ix_home_stats_donation_total', 'donation_total'),
+    )
+
+    @classmethod
+    def rebuild(cls):
+        """Recompute every home's stats from the visits and donations tables."""
+        visits = select(
+            Visit.home_id,
+            func.count(Visit.id).label('visit_count')
+        ).group_by(Visit.home_id).subquery()
+
+        donations = select(
+            Donation.home_id,
+            func.count(Donation.id).label('donation_count'),
+            func.sum(Donation.amount).label('donation_total')
+        ).where(Donation.status == 'completed').group_by(Donation.home_id).subquery()
+
+        stats = select(
+            ChildrensHome.id,
+            func.coalesce(visits.c.visit_count, 0),
+            func.coalesce(donations.c.donation_count, 0),
+            func.coalesce(donations.c.donation_total, 0),
+            func.now()
+        ).outerjoin(visits, visits.c.home_id == ChildrensHome.id).outerjoin(
+            donations, donations.c.home_id == ChildrensHome.id
+        )
+
+        db.session.execute(cls.__table__.delete())
+        db.session.execute(insert(cls.__table__).from_select(
+            ['home_id', 'visit_count', 'donation_count', 'donation_total', 'updated_at'],
+            stats
+        ))
+        db.session.commit()
+
+    def __repr__(self):
+        return f'<HomeStats home={self.home_id}>'
+
+
+def _apply(target, connection, changes):
+    deltas = defaultdict(lambda: defaultdict(int))
+    for home_id, columns, sign in changes:
+        for column, value in columns.items():
+            deltas[home_id][column] += sign * value
+
+    changed = set()
+    for home_id, columns in deltas.items():
+        columns = {column: value for column, value in columns.items() if value}
+        if columns:
+            apply_counter_deltas(connection, HomeStats.__table__, {'home_id': home_id}, columns)
+            changed.add(home_id)
+
+    # Home lists and details show these totals.
+    if changed:
+        invalidate_homes_on_commit(object_session(target), changed)
+
+
+def _donation_contribution(status, amount):
+    if status != 'completed' or amount is None:
+        return {}
+    return {'donation_count': 1, 'donation_total': Decimal(str(amount))}
+
+
+def _previous(target, attribute):
+    history = inspect(target).attrs[attribute].history
+    return history.deleted[0] if history.deleted else getattr(target, attribute)
+
+
+track_previous_values(Donation.home_id, Donation.status, Donation.amount, Visit.home_id)
+
+
+@event.listens_for(ChildrensHome, 'after_insert')
+def _home_inserted(mapper, connection, home):
+    # Every home gets a stats row so "least donated" can read it from the index.
+    apply_counter_deltas(connection, HomeStats.__table__, {'home_id': home.id}, {})
+
+
+@event.listens_for(Donation, 'after_insert')
+def _donation_inserted(mapper, connection, donation):
+    _apply(donation, connection, [(donation.home_id, _donation_contribution(donation.status, donation.amount), 1)])
+
+
+@event.listens_for(Donation, 'after_update')
+def _donation_updated(mapper, connection, donation):
+    before = _donation_contribution(_previous(donation, 'status'), _previous(donation, 'amount'))
+    after = _donation_contribution(donation.status, donation.amount)
+    _apply(donation, connection, [(_previous(donation, 'home_id'), before, -1), (donation.home_id, after, 1)])
+
+
+@event.listens_for(Donation, 'after_delete')
+def _donation_deleted(mapper, connection, donation):
+    _apply(donation, connection, [(donation.home_id, _donation_contribution(donation.status, donation.amount), -1)])
+
+
+@event.listens_for(Visit, 'after_insert')
+def _visit_inserted(mapper, connection, visit):
+    _apply(visit, connection, [(visit.home_id, {'visit_count': 1}, 1)])
+
+
+@event.listens_for(Visit, 'after_update')
+def _visit_updated(mapper, connection, visit):
+    _apply(visit, connection, [(_previous(visit, 'home_id'), {'visit_count': 1}, -1), (visit.home_id, {'visit_count': 1}, 1)])
+
+
+@event.listens_for(Visit, 'after_delete')
+def _visit_deleted(mapper, connection, visit):
+    _apply(visit, connection, [(visit.home_id, {'visit_count': 1}, -1)])
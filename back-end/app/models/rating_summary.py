@@ -0,0 +1,121 @@
+from collections import defaultdict
+from datetime import datetime
+from sqlalchemy import event, case, cast, func, inspect, select, insert
+from app import db
+from app.models.review import Review
+from app.utils.counters import apply_counter_deltas, track_previous_values
+
+RATINGS = (1, 2, 3, 4, 5)
+BEST_RATED_MIN_REVIEWS = 3
+
+
+class HomeRatingSummary(db.Model):
+    __tablename__ = 'home_rating_summaries'
+
+    # One row per home with approved reviews, kept in step with the reviews
+    # table by the mapper events below so readers never scan reviews.
+    home_id = db.Column(db.Integer, db.ForeignKey('childrens_homes.id'), primary_key=True)
+    count_1 = db.Column(db.Integer, nullable=False, default=0)
+    count_2 = db.Column(db.Integer, nullable=False, default=0)
+    count_3 = db.Column(db.Integer, nullable=False, default=0)
+    count_4 = db.Column(db.Integer, nullable=False, default=0)
+    count_5 = db.Column(db.Integer, nullable=False, default=0)
+    rating_sum = db.Column(db.Integer, nullable=False, default=0)
+    approved_count = db.Column(db.Integer, nullable=False, default=0)
+    average_rating = db.Column(db.Float)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        db.Index(
+            'ix_home_rating_summaries_best_rated',
+            'average_rating',
+            postgresql_where=db.text(f'approved_count >= {BEST_RATED_MIN_REVIEWS}'),
+            sqlite_where=db.text(f'approved_count >= {BEST_RATED_MIN_REVIEWS}')
+        ),
+    )
+
+    @property
+    def rating_distribution(self):
+        return {rating: getattr(self, f'count_{rating}') for rating in RATINGS}
+
+    @staticmethod
+    def empty_distribution():
+        return {rating: 0 for rating in RATINGS}
+
+    @classmethod
+    def rebuild(cls):
+        """Recompute every summary from the reviews table to repair drift."""
+        approved = select(
+            Review.home_id,
+            *[func.sum(case((Review.rating == rating, 1), else_=0)) for rating in RATINGS],
+            func.sum(Review.rating),
+            func.count(Review.id),
+            func.avg(cast(Review.rating, db.Float)),
+            func.now()
+        ).where(Review.is_approved == True).group_by(Review.home_id)
+
+        db.session.execute(cls.__table__.delete())
+        db.session.execute(insert(cls.__table__).from_select(
+            ['home_id', *[f'count_{rating}' for rating in RATINGS], 'rating_sum', 'approved_count', 'average_rating', 'updated_at'],
+            approved
+        ))
+        db.session.commit()
+
+    def __repr__(self):
+        return f'<HomeRatingSummary home={self.home_id} {self.approved_count} reviews>'
+
+
+def _contribution(rating, is_approved):
+    if not is_approved or rating not in RATINGS:
+        return {}
+    return {f'count_{rating}': 1, 'rating_sum': rating, 'approved_count': 1}
+
+
+def _average(counter):
+    return counter('rating_sum') * 1.0 / func.nullif(counter('approved_count'), 0)
+
+
+def record_review_change(connection, before, after):
+    """Apply the difference between two (home_id, rating, is_approved) states."""
+    deltas = defaultdict(lambda: defaultdict(int))
+    if after:
+        for column, value in _contribution(after[1], after[2]).items():
+            deltas[after[0]][column] += value
+    if before:
+        for column, value in _contribution(before[1], before[2]).items():
+            deltas[before[0]][column] -= value
+
+    for home_id, columns in deltas.items():
+        columns = {column: value for column, value in columns.items() if value}
+        if columns:
+            apply_counter_deltas(
+                connection,
+                HomeRatingSummary.__table__,
+                {'home_id': home_id},
+                columns,
+                derived={'average_rating': _average}
+            )
+
+
+def _previous(review, attribute):
+    history = inspect(review).attrs[attribute].history
+    return history.deleted[0] if history.deleted else getattr(review, attribute)
+
+
+track_previous_values(Review.home_id, Review.rating, Review.is_approved)
+
+
+@event.listens_for(Review, 'after_insert')
+def _review_inserted(mapper, connection, review):
+    record_review_change(connection, None, (review.home_id, review.rating, review.is_approved))
+
+
+@event.listens_for(Review, 'after_update')
+def _review_updated(mapper, connection, review):
+    before = (_previous(review, 'home_id'), _previous(review, 'rating'), _previous(review, 'is_approved'))
+    record_review_change(connection, before, (review.home_id, review.rating, review.is_approved))
+
+
+@event.listens_for(Review, 'after_delete')
+def _review_deleted(mapper, connection, review):
+    record_review_change(connection, (review.home_id, review.rating, review.is_approved), None)
@@ -1,5 +1,6 @@
 from datetime import datetime
 from app import db
+from app.services.home_registry import get_home
 
 class Review(db.Model):
     __tablename__ = 'reviews'
@@ -17,9 +18,13 @@ class Review(db.Model):
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     
-    __table_args__ = (db.UniqueConstraint('user_id', 'home_id', name='unique_user_home_review'),)
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'home_id', name='unique_user_home_review'),
+        db.Index('ix_reviews_home_approved_created_at', 'home_id', 'is_approved', 'created_at'),
+    )
     
     def to_dict(self):
+        home = get_home(self.home_id)
         return {
             'id': self.id,
             'user_id': self.user_id,
@@ -33,7 +38,7 @@ class Review(db.Model):
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None,
             'reviewer_name': f"{self.reviewer.first_name} {self.reviewer.last_name}" if not self.anonymous and self.reviewer else "Anonymous",
-            'home_name': self.home.name if self.home else None
+            'home_name': home.name if home else None
         }
     
     def __repr__(self):
@@ -1,5 +1,6 @@
 from datetime import datetime
-from app import db, bcrypt
+from app import db
+from app.services.passwords import PasswordHasherBusy, current_cost, hash_cost, hash_password, verify_password
 
 class User(db.Model):
     __tablename__ = 'users'
@@ -13,6 +14,11 @@ class User(db.Model):
     role = db.Column(db.String(20), default='user')  
     is_active = db.Column(db.Boolean, default=True)
     date_joined = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    __table_args__ = (
+        db.Index('ix_users_date_joined', 'date_joined'),
+    )
     
     
     donations = db.relationship('Donation', backref='donor', lazy=True)
@@ -24,12 +30,12 @@ class User(db.Model):
         if not password or not isinstance(password, str) or len(password.strip()) == 0:
             raise ValueError("Password cannot be empty or None")
         
-        # Generate secure hash
-        hash_bytes = bcrypt.generate_password_hash(password)
-        if not hash_bytes:
+        # Generate secure hash (runs in the password hashing pool)
+        password_hash = hash_password(password)
+        if not password_hash:
             raise ValueError("Failed to generate password hash")
             
-        self.password_hash = hash_bytes.decode('utf-8')
+        self.password_hash = password_hash
         
         # Verify the hash was set correctly
         if not self.password_hash or len(self.password_hash.strip()) == 0:
@@ -45,11 +51,17 @@ class User(db.Model):
             return False
             
         try:
-            return bcrypt.check_password_hash(self.password_hash, password)
+            return verify_password(self.password_hash, password)
+        except PasswordHasherBusy:
+            # Overload is not a failed login; let the caller answer 503
+            raise
         except Exception:
             # If bcrypt fails for any reason, deny access
             return False
     
+    def password_needs_rehash(self):
+        return hash_cost(self.password_hash) != current_cost()
+    
     def to_dict(self):
         return {
             'id': self.id,
@@ -1,5 +1,6 @@
 from datetime import datetime
 from app import db
+from app.services.home_registry import get_home
 
 class Visit(db.Model):
     __tablename__ = 'visits'
@@ -19,7 +20,13 @@ class Visit(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    __table_args__ = (
+        db.Index('ix_visits_home_date_status', 'home_id', 'visit_date', 'status'),
+        db.Index('ix_visits_user_date', 'user_id', 'visit_date'),
+    )
+    
     def to_dict(self):
+        home = get_home(self.home_id)
         return {
             'id': self.id,
             'user_id': self.user_id,
@@ -36,8 +43,8 @@ class Visit(db.Model):
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None,
             'visitor_name': f"{self.visitor.first_name} {self.visitor.last_name}" if self.visitor else None,
-            'home_name': self.home.name if self.home else None,
-            'home_location': self.home.location if self.home else None
+            'home_name': home.name if home else None,
+            'home_location': home.location if home else None
         }
     
     def __repr__(self):
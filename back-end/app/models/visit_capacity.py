@@ -0,0 +1,25 @@
+from datetime import datetime
+from app import db
+
+class VisitCapacity(db.Model):
+    __tablename__ = 'visit_capacities'
+
+    # One row per home and day that has bookings or a custom limit. Days
+    # without a row have the default capacity and no reservations.
+    home_id = db.Column(db.Integer, db.ForeignKey('childrens_homes.id'), primary_key=True)
+    visit_date = db.Column(db.Date, primary_key=True)
+    capacity = db.Column(db.Integer, nullable=False)
+    reserved = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def to_dict(self):
+        return {
+            'home_id': self.home_id,
+            'visit_date': self.visit_date.isoformat(),
+            'capacity': self.capacity,
+            'reserved': self.reserved,
+            'available_slots': max(self.capacity - self.reserved, 0)
+        }
+
+    def __repr__(self):
+        return f'<VisitCapacity home={self.home_id} {self.visit_date} {self.reserved}/{self.capacity}>'
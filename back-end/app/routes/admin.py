@@ -1,22 +1,45 @@
-from flask import Blueprint, request, jsonify
+import os
+from flask import Blueprint, Response, request, jsonify, send_file, stream_with_context
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from datetime import datetime, date
-from sqlalchemy import func, desc
 from app import db
 from app.models.user import User
 from app.models.childrens_home import ChildrensHome
-from app.models.donation import Donation
-from app.models.review import Review
 from app.models.visit import Visit
+from app.models.home_stats import HomeStats
+from app.models.visit_capacity import VisitCapacity
+from app.models.export_job import ExportJob
+from app.models.rating_summary import HomeRatingSummary, BEST_RATED_MIN_REVIEWS
+from app.services.search import apply_search, index_home
+from app.services.home_import import IMPORT_FORMATS, ImportAborted, InvalidHome, home_values, import_homes
+from app.services.analytics import get_overview
+from app.services.exports import EXPORT_FORMATS, InvalidExport, encode_rows, export_format, export_statement
+from app.services.export_jobs import ExportQueueFull, job_status, submit_job
+from app.services.home_registry import registry
+from app.services.profiler import InvalidCapture, profiler
+from app.services.response_cache import invalidate_reviewer_on_commit, response_cache
+from app.services.visit_capacity import move_reservation, set_capacity
+from app.services.passwords import PasswordHasherBusy
+from app.services.user_cache import get_user_snapshot, invalidate_user
+from app.utils.pagination import paginate, InvalidCursor
+from app.utils.serialization import load_for_serialization
 
 admin_bp = Blueprint('admin', __name__)
 
 
+def is_admin():
+    """Whether the JWT verified for this request belongs to an active admin."""
+    # Tokens never expire, so their role claim can be out of date; the role is
+    # read from the cached user snapshot instead. A role change made through
+    # this worker applies at once (update_user invalidates the snapshot), and
+    # on other workers within USER_CACHE_TTL.
+    user = get_user_snapshot(get_jwt_identity())
+    return bool(user and user['role'] == 'admin' and user['is_active'])
+
+
 def admin_required(f):
     def decorated_function(*args, **kwargs):
-        user_id = get_jwt_identity()
-        user = User.query.get(user_id)
-        if not user or user.role != 'admin':
+        if not is_admin():
             return jsonify({'error': 'Admin access required'}), 403
         return f(*args, **kwargs)
     decorated_function.__name__ = f.__name__
@@ -28,8 +51,6 @@ def admin_required(f):
 @admin_required
 def get_users():
     try:
-        page = request.args.get('page', 1, type=int)
-        per_page = request.args.get('per_page', 10, type=int)
         search = request.args.get('search', '')
         
         query = User.query
@@ -42,26 +63,18 @@ def get_users():
                 (User.last_name.ilike(f'%{search}%'))
             )
         
-        users_pagination = query.order_by(User.date_joined.desc()).paginate(
-            page=page,
-            per_page=per_page,
-            error_out=False
-        )
+        items, pagination = paginate(query, [User.date_joined, User.id])
         
-        users = [user.to_dict() for user in users_pagination.items]
+        users = [user.to_dict() for user in items]
         
         return jsonify({
             'users': users,
-            'pagination': {
-                'page': page,
-                'per_page': per_page,
-                'total': users_pagination.total,
-                'pages': users_pagination.pages,
-                'has_prev': users_pagination.has_prev,
-                'has_next': users_pagination.has_next
-            }
+            'pagination': pagination
         }), 200
         
+    except InvalidCursor as e:
+        return jsonify({'error': str(e)}), 400
+
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -103,6 +116,10 @@ def create_user():
             'user': user.to_dict()
         }), 201
         
+    except PasswordHasherBusy as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 503, {'Retry-After': '1'}
+
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
@@ -123,6 +140,8 @@ def update_user(user_id):
             user.first_name = data['first_name']
         if 'last_name' in data:
             user.last_name = data['last_name']
+        if 'first_name' in data or 'last_name' in data:
+            invalidate_reviewer_on_commit(db.session, user)
         if 'email' in data:
             
             existing_user = User.query.filter(User.email == data['email'], User.id != user_id).first()
@@ -135,6 +154,7 @@ def update_user(user_id):
             user.is_active = data['is_active']
         
         db.session.commit()
+        invalidate_user(user_id)
         
         return jsonify({
             'message': 'User updated successfully',
@@ -151,38 +171,31 @@ def update_user(user_id):
 @admin_required
 def get_all_homes():
     try:
-        page = request.args.get('page', 1, type=int)
-        per_page = request.args.get('per_page', 10, type=int)
         search = request.args.get('search', '')
         
-        query = ChildrensHome.query
+        query = load_for_serialization(
+            ChildrensHome.query,
+            ChildrensHome.rating_summary,
+            ChildrensHome.stats
+        )
+        sort_keys = [ChildrensHome.created_at, ChildrensHome.id]
         
         if search:
-            query = query.filter(
-                (ChildrensHome.name.ilike(f'%{search}%')) |
-                (ChildrensHome.location.ilike(f'%{search}%'))
-            )
+            query = apply_search(query, search)
+            sort_keys = None
         
-        homes_pagination = query.order_by(ChildrensHome.created_at.desc()).paginate(
-            page=page,
-            per_page=per_page,
-            error_out=False
-        )
+        items, pagination = paginate(query, sort_keys)
         
-        homes = [home.to_dict() for home in homes_pagination.items]
+        homes = [home.to_dict() for home in items]
         
         return jsonify({
             'homes': homes,
-            'pagination': {
-                'page': page,
-                'per_page': per_page,
-                'total': homes_pagination.total,
-                'pages': homes_pagination.pages,
-                'has_prev': homes_pagination.has_prev,
-                'has_next': homes_pagination.has_next
-            }
+            'pagination': pagination
         }), 200
         
+    except InvalidCursor as e:
+        return jsonify({'error': str(e)}), 400
+
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -193,46 +206,55 @@ def create_home():
     try:
         data = request.get_json()
         
-        
-        required_fields = ['name', 'location']
-        for field in required_fields:
-            if not data.get(field):
-                return jsonify({'error': f'{field} is required'}), 400
-        
-        
-        established_date = None
-        if data.get('established_date'):
-            try:
-                established_date = datetime.strptime(data['established_date'], '%Y-%m-%d').date()
-            except ValueError:
-                return jsonify({'error': 'Invalid established_date format. Use YYYY-MM-DD'}), 400
-        
-       
-        home = ChildrensHome(
-            name=data['name'],
-            description=data.get('description'),
-            location=data['location'],
-            address=data.get('address'),
-            phone_number=data.get('phone_number'),
-            email=data.get('email'),
-            capacity=data.get('capacity'),
-            current_children_count=data.get('current_children_count', 0),
-            established_date=established_date,
-            contact_person=data.get('contact_person'),
-            website=data.get('website'),
-            image_url=data.get('image_url'),
-            needs_description=data.get('needs_description'),
-            is_active=data.get('is_active', True)
-        )
+        home = ChildrensHome(**home_values(data))
         
         db.session.add(home)
+        db.session.flush()
+        index_home(home)
         db.session.commit()
+        registry.update(home)
         
         return jsonify({
             'message': 'Children\'s home created successfully',
             'home': home.to_dict()
         }), 201
         
+    except InvalidHome as e:
+        return jsonify({'error': str(e)}), 400
+
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+@admin_bp.route('/homes/import', methods=['POST'])
+@jwt_required()
+@admin_required
+def import_homes_file():
+    try:
+        upload = request.files.get('file')
+        filename = upload.filename if upload else ''
+        fmt = request.args.get('format')
+        if not fmt:
+            if filename.endswith('.jsonl') or request.mimetype == 'application/x-ndjson':
+                fmt = 'jsonl'
+            else:
+                fmt = 'csv'
+        if fmt not in IMPORT_FORMATS:
+            return jsonify({'error': f'Invalid format, use one of: {", ".join(IMPORT_FORMATS)}'}), 400
+        
+        result = import_homes(upload.stream if upload else request.stream, fmt)
+        
+        return jsonify({
+            'message': f'{result["imported"]} homes imported, {result["rejected"]} rejected',
+            **result
+        }), 200
+        
+    except ImportAborted as e:
+        return jsonify({'error': str(e), **e.result}), 400
+
+    except InvalidHome as e:
+        return jsonify({'error': str(e)}), 400
+
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
@@ -285,7 +307,10 @@ def update_home(home_id):
             home.is_active = data['is_active']
         
         home.updated_at = datetime.utcnow()
+        db.session.flush()
+        index_home(home)
         db.session.commit()
+        registry.update(home)
         
         return jsonify({
             'message': 'Children\'s home updated successfully',
@@ -309,6 +334,7 @@ def delete_home(home_id):
         home.is_active = False
         home.updated_at = datetime.utcnow()
         db.session.commit()
+        registry.update(home)
         
         return jsonify({'message': 'Children\'s home deactivated successfully'}), 200
         
@@ -317,45 +343,56 @@ def delete_home(home_id):
         return jsonify({'error': str(e)}), 500
 
 
-@admin_bp.route('/analytics/overview', methods=['GET'])
+@admin_bp.route('/homes/<int:home_id>/visit-capacity', methods=['PUT'])
 @jwt_required()
 @admin_required
-def get_analytics_overview():
+def update_visit_capacity(home_id):
     try:
-       
-        total_users = User.query.count()
-        total_homes = ChildrensHome.query.filter_by(is_active=True).count()
-        total_donations = Donation.query.count()
-        total_visits = Visit.query.count()
-        total_reviews = Review.query.count()
-        
-        
-        total_donation_amount = db.session.query(func.sum(Donation.amount)).filter_by(status='completed').scalar() or 0
-        pending_donations = Donation.query.filter_by(status='pending').count()
+        home = ChildrensHome.query.get(home_id)
+        if not home:
+            return jsonify({'error': 'Children\'s home not found'}), 404
         
+        data = request.get_json()
         
-        from datetime import timedelta
-        thirty_days_ago = datetime.utcnow() - timedelta(days=30)
+        required_fields = ['visit_date', 'capacity']
+        for field in required_fields:
+            if data.get(field) is None:
+                return jsonify({'error': f'{field} is required'}), 400
         
-        new_users_30_days = User.query.filter(User.date_joined >= thirty_days_ago).count()
-        new_donations_30_days = Donation.query.filter(Donation.created_at >= thirty_days_ago).count()
-        new_visits_30_days = Visit.query.filter(Visit.created_at >= thirty_days_ago).count()
+        try:
+            visit_date = datetime.strptime(data['visit_date'], '%Y-%m-%d').date()
+        except ValueError:
+            return jsonify({'error': 'Invalid visit_date format. Use YYYY-MM-DD'}), 400
+        
+        try:
+            capacity = int(data['capacity'])
+            if capacity < 0:
+                return jsonify({'error': 'Capacity cannot be negative'}), 400
+        except ValueError:
+            return jsonify({'error': 'Invalid capacity format'}), 400
+        
+        if not set_capacity(home_id, visit_date, capacity):
+            db.session.rollback()
+            return jsonify({'error': 'Capacity is below the number of visits already booked on this date'}), 409
+        db.session.commit()
         
         return jsonify({
-            'overview': {
-                'total_users': total_users,
-                'total_homes': total_homes,
-                'total_donations': total_donations,
-                'total_visits': total_visits,
-                'total_reviews': total_reviews,
-                'total_donation_amount': float(total_donation_amount),
-                'pending_donations': pending_donations,
-                'new_users_30_days': new_users_30_days,
-                'new_donations_30_days': new_donations_30_days,
-                'new_visits_30_days': new_visits_30_days
-            }
+            'message': 'Visit capacity updated successfully',
+            'visit_capacity': db.session.get(VisitCapacity, (home_id, visit_date)).to_dict()
         }), 200
         
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+
+@admin_bp.route('/analytics/overview', methods=['GET'])
+@jwt_required()
+@admin_required
+def get_analytics_overview():
+    try:
+        return jsonify(get_overview()), 200
+        
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -365,38 +402,40 @@ def get_analytics_overview():
 def get_homes_analytics():
     try:
         
+        home_columns = (ChildrensHome.id, ChildrensHome.name, ChildrensHome.location)
+        
         most_visited = db.session.query(
-            ChildrensHome.id,
-            ChildrensHome.name,
-            ChildrensHome.location,
-            func.count(Visit.id).label('visit_count')
-        ).join(Visit).group_by(ChildrensHome.id).order_by(desc('visit_count')).limit(10).all()
+            *home_columns,
+            HomeStats.visit_count
+        ).join(HomeStats, HomeStats.home_id == ChildrensHome.id).filter(
+            HomeStats.visit_count > 0
+        ).order_by(HomeStats.visit_count.desc()).limit(10).all()
         
         
         most_donated = db.session.query(
-            ChildrensHome.id,
-            ChildrensHome.name,
-            ChildrensHome.location,
-            func.sum(Donation.amount).label('total_donations'),
-            func.count(Donation.id).label('donation_count')
-        ).join(Donation).filter(Donation.status == 'completed').group_by(ChildrensHome.id).order_by(desc('total_donations')).limit(10).all()
+            *home_columns,
+            HomeStats.donation_total.label('total_donations'),
+            HomeStats.donation_count
+        ).join(HomeStats, HomeStats.home_id == ChildrensHome.id).filter(
+            HomeStats.donation_count > 0
+        ).order_by(HomeStats.donation_total.desc()).limit(10).all()
         
         
         least_donated = db.session.query(
-            ChildrensHome.id,
-            ChildrensHome.name,
-            ChildrensHome.location,
-            func.coalesce(func.sum(Donation.amount), 0).label('total_donations')
-        ).outerjoin(Donation, (Donation.home_id == ChildrensHome.id) & (Donation.status == 'completed')).filter(ChildrensHome.is_active == True).group_by(ChildrensHome.id).order_by('total_donations').limit(10).all()
+            *home_columns,
+            HomeStats.donation_total.label('total_donations')
+        ).join(HomeStats, HomeStats.home_id == ChildrensHome.id).filter(
+            ChildrensHome.is_active == True
+        ).order_by(HomeStats.donation_total).limit(10).all()
         
        
         best_rated = db.session.query(
-            ChildrensHome.id,
-            ChildrensHome.name,
-            ChildrensHome.location,
-            func.avg(Review.rating).label('average_rating'),
-            func.count(Review.id).label('review_count')
-        ).join(Review).filter(Review.is_approved == True).group_by(ChildrensHome.id).having(func.count(Review.id) >= 3).order_by(desc('average_rating')).limit(10).all()
+            *home_columns,
+            HomeRatingSummary.average_rating,
+            HomeRatingSummary.approved_count.label('review_count')
+        ).join(HomeRatingSummary, HomeRatingSummary.home_id == ChildrensHome.id).filter(
+            HomeRatingSummary.approved_count >= BEST_RATED_MIN_REVIEWS
+        ).order_by(HomeRatingSummary.average_rating.desc()).limit(10).all()
         
         return jsonify({
             'analytics': {
@@ -441,40 +480,120 @@ def get_homes_analytics():
         return jsonify({'error': str(e)}), 500
 
 
+@admin_bp.route('/exports/<any(donations, visits):name>', methods=['GET'])
+@jwt_required()
+@admin_required
+def export_records(name):
+    try:
+        fmt = export_format(request.args.get('format'))
+        statement = export_statement(name, request.args)
+        
+        return Response(
+            stream_with_context(encode_rows(statement, fmt)),
+            mimetype=EXPORT_FORMATS[fmt],
+            headers={'Content-Disposition': f'attachment; filename={name}-{date.today().isoformat()}.{fmt}'}
+        )
+        
+    except InvalidExport as e:
+        return jsonify({'error': str(e)}), 400
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@admin_bp.route('/export-jobs', methods=['POST'])
+@jwt_required()
+@admin_required
+def create_export_job():
+    try:
+        data = request.get_json() or {}
+        
+        job = submit_job(
+            data.get('report'),
+            data.get('format'),
+            data.get('parameters'),
+            get_jwt_identity()
+        )
+        
+        return jsonify({
+            'message': 'Export job queued',
+            'job': job_status(job)
+        }), 202
+        
+    except InvalidExport as e:
+        return jsonify({'error': str(e)}), 400
+
+    except ExportQueueFull as e:
+        return jsonify({'error': str(e)}), 503, {'Retry-After': '30'}
+
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+@admin_bp.route('/export-jobs/<job_id>', methods=['GET'])
+@jwt_required()
+@admin_required
+def get_export_job(job_id):
+    try:
+        job = db.session.get(ExportJob, job_id)
+        if not job:
+            return jsonify({'error': 'Export job not found'}), 404
+        
+        return jsonify({'job': job_status(job)}), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@admin_bp.route('/export-jobs/<job_id>/download', methods=['GET'])
+@jwt_required()
+@admin_required
+def download_export_job(job_id):
+    try:
+        job = db.session.get(ExportJob, job_id)
+        if not job:
+            return jsonify({'error': 'Export job not found'}), 404
+        
+        if job.status != 'completed':
+            return jsonify({'error': f'Export job is {job.status}'}), 409
+        
+        return send_file(
+            job.file_path,
+            mimetype=EXPORT_FORMATS[job.format],
+            as_attachment=True,
+            download_name=os.path.basename(job.file_path)
+        )
+        
+    except FileNotFoundError:
+        return jsonify({'error': 'Export file is no longer available'}), 410
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
 @admin_bp.route('/visits', methods=['GET'])
 @jwt_required()
 @admin_required
 def get_all_visits():
     try:
-        page = request.args.get('page', 1, type=int)
-        per_page = request.args.get('per_page', 10, type=int)
         status = request.args.get('status', '')
         
-        query = Visit.query
+        query = load_for_serialization(Visit.query, Visit.visitor)
         
         if status:
             query = query.filter_by(status=status)
         
-        visits_pagination = query.order_by(Visit.visit_date.desc()).paginate(
-            page=page,
-            per_page=per_page,
-            error_out=False
-        )
+        items, pagination = paginate(query, [Visit.visit_date, Visit.id])
         
-        visits = [visit.to_dict() for visit in visits_pagination.items]
+        visits = [visit.to_dict() for visit in items]
         
         return jsonify({
             'visits': visits,
-            'pagination': {
-                'page': page,
-                'per_page': per_page,
-                'total': visits_pagination.total,
-                'pages': visits_pagination.pages,
-                'has_prev': visits_pagination.has_prev,
-                'has_next': visits_pagination.has_next
-            }
+            'pagination': pagination
         }), 200
         
+    except InvalidCursor as e:
+        return jsonify({'error': str(e)}), 400
+
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -496,6 +615,9 @@ def update_visit_status(visit_id):
         if data['status'] not in valid_statuses:
             return jsonify({'error': f'status must be one of: {", ".join(valid_statuses)}'}), 400
         
+        if not move_reservation(visit.home_id, visit.visit_date, visit.status, visit.visit_date, data['status']):
+            return jsonify({'error': 'No visit slots available on this date'}), 409
+        
         visit.status = data['status']
         if data.get('admin_notes'):
             visit.admin_notes = data['admin_notes']
@@ -510,4 +632,75 @@ def update_visit_status(visit_id):
         
     except Exception as e:
         db.session.rollback()
-        return jsonify({'error': str(e)}), 500
\ No newline at end of file
+        return jsonify({'error': str(e)}), 500
+
+@admin_bp.route('/profiles', methods=['GET'])
+@jwt_required()
+@admin_required
+def get_profiles():
+    try:
+        return jsonify({
+            'profiles': profiler.profiles(),
+            'captures': profiler.armed()
+        }), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@admin_bp.route('/profiles/<profile_id>', methods=['GET'])
+@jwt_required()
+@admin_required
+def download_profile(profile_id):
+    try:
+        path = profiler.folded_path(profile_id)
+        if not path:
+            return jsonify({'error': 'Profile not found'}), 404
+        
+        return send_file(path, mimetype='text/plain', as_attachment=True, download_name=f'{profile_id}.folded')
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@admin_bp.route('/profiles/captures', methods=['POST'])
+@jwt_required()
+@admin_required
+def arm_profile_capture():
+    try:
+        data = request.get_json() or {}
+        
+        expires_at = profiler.arm(data.get('endpoint'), data.get('seconds', 300))
+        
+        return jsonify({
+            'message': f'Profiling every request to {data["endpoint"]}',
+            'endpoint': data['endpoint'],
+            'expires_at': datetime.utcfromtimestamp(expires_at).isoformat()
+        }), 201
+        
+    except InvalidCapture as e:
+        return jsonify({'error': str(e)}), 400
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@admin_bp.route('/profiles/captures/<endpoint>', methods=['DELETE'])
+@jwt_required()
+@admin_required
+def disarm_profile_capture(endpoint):
+    try:
+        if not profiler.disarm(endpoint):
+            return jsonify({'error': 'No capture armed for this endpoint'}), 404
+        
+        return jsonify({'message': f'Stopped profiling {endpoint}'}), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@admin_bp.route('/cache/stats', methods=['GET'])
+@jwt_required()
+@admin_required
+def get_cache_stats():
+    try:
+        return jsonify({'response_cache': response_cache.stats()}), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
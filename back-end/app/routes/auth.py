@@ -2,6 +2,10 @@ from flask import Blueprint, request, jsonify
 from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity
 from app import db
 from app.models.user import User
+from app.services.metrics import record_login, record_registration
+from app.services.passwords import PasswordHasherBusy
+from app.services.response_cache import invalidate_reviewer_on_commit
+from app.services.user_cache import get_user_snapshot, invalidate_user, token_claims
 
 auth_bp = Blueprint('auth', __name__)
 
@@ -35,9 +39,10 @@ def register():
         
         db.session.add(user)
         db.session.commit()
+        record_registration()
         
         
-        access_token = create_access_token(identity=user.id)
+        access_token = create_access_token(identity=user.id, additional_claims=token_claims(user))
         
         return jsonify({
             'message': 'User created successfully',
@@ -45,6 +50,10 @@ def register():
             'user': user.to_dict()
         }), 201
         
+    except PasswordHasherBusy as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 503, {'Retry-After': '1'}
+
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
@@ -71,17 +80,30 @@ def login():
         ).first()
         
         if not user or not user.check_password(password):
+            record_login('invalid_credentials')
             return jsonify({'error': 'Invalid credentials'}), 401
         
         # Additional security: Verify user has a valid password hash
         if not hasattr(user, 'password_hash') or not user.password_hash:
+            record_login('invalid_credentials')
             return jsonify({'error': 'Invalid credentials'}), 401
         
         if not user.is_active:
+            record_login('deactivated')
             return jsonify({'error': 'Account is deactivated'}), 401
         
+        # Upgrade hashes made with a different cost factor while we have the password;
+        # when the hashing pool is busy the upgrade waits for a later login
+        if user.password_needs_rehash():
+            try:
+                user.set_password(password)
+                db.session.commit()
+            except PasswordHasherBusy:
+                pass
         
-        access_token = create_access_token(identity=user.id)
+        
+        access_token = create_access_token(identity=user.id, additional_claims=token_claims(user))
+        record_login('success')
         
         return jsonify({
             'message': 'Login successful',
@@ -89,6 +111,11 @@ def login():
             'user': user.to_dict()
         }), 200
         
+    except PasswordHasherBusy as e:
+        db.session.rollback()
+        record_login('busy')
+        return jsonify({'error': str(e)}), 503, {'Retry-After': '1'}
+
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -96,13 +123,12 @@ def login():
 @jwt_required()
 def get_profile():
     try:
-        user_id = get_jwt_identity()
-        user = User.query.get(user_id)
+        user = get_user_snapshot(get_jwt_identity())
         
         if not user:
             return jsonify({'error': 'User not found'}), 404
         
-        return jsonify({'user': user.to_dict()}), 200
+        return jsonify({'user': user}), 200
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -124,6 +150,8 @@ def update_profile():
             user.first_name = data['first_name']
         if 'last_name' in data:
             user.last_name = data['last_name']
+        if 'first_name' in data or 'last_name' in data:
+            invalidate_reviewer_on_commit(db.session, user)
         if 'email' in data:
             # Check if email is already taken by another user
             existing_user = User.query.filter(User.email == data['email'], User.id != user_id).first()
@@ -132,6 +160,7 @@ def update_profile():
             user.email = data['email']
         
         db.session.commit()
+        invalidate_user(user_id)
         
         return jsonify({
             'message': 'Profile updated successfully',
@@ -1,10 +1,14 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from datetime import datetime
+from sqlalchemy import insert
 from app import db
 from app.models.donation import Donation
 from app.models.childrens_home import ChildrensHome
-from app.models.user import User
+from app.services.analytics import invalidate_overview
+from app.services.home_registry import get_active_home, registry
+from app.services.metrics import record_donations
+from app.utils.pagination import paginate, InvalidCursor
+from app.utils.serialization import load_for_serialization
 
 donations_bp = Blueprint('donations', __name__)
 
@@ -22,7 +26,7 @@ def create_donation():
                 return jsonify({'error': f'{field} is required'}), 400
         
         
-        home = ChildrensHome.query.filter_by(id=data['home_id'], is_active=True).first()
+        home = get_active_home(data['home_id'])
         if not home:
             return jsonify({'error': 'Children\'s home not found'}), 404
         
@@ -49,6 +53,7 @@ def create_donation():
         
         db.session.add(donation)
         db.session.commit()
+        record_donations([amount])
         
         return jsonify({
             'message': 'Donation created successfully',
@@ -69,47 +74,77 @@ def create_multiple_donations():
         if not data.get('donations') or not isinstance(data['donations'], list):
             return jsonify({'error': 'donations list is required'}), 400
         
-        created_donations = []
+        max_batch = current_app.config['MAX_DONATIONS_PER_BATCH']
+        if len(data['donations']) > max_batch:
+            return jsonify({'error': f'A batch can contain at most {max_batch} donations'}), 400
+        
+        chunk_size = current_app.config['DONATION_BATCH_CHUNK_SIZE']
+        errors = []
+        rows = []
         
-        for donation_data in data['donations']:
+        for index, donation_data in enumerate(data['donations']):
             
-            if not donation_data.get('home_id') or not donation_data.get('amount'):
-                return jsonify({'error': 'home_id and amount are required for each donation'}), 400
+            if not isinstance(donation_data, dict) or not donation_data.get('home_id') or not donation_data.get('amount'):
+                errors.append({'index': index, 'error': 'home_id and amount are required for each donation'})
+                continue
             
-           
-            home = ChildrensHome.query.filter_by(id=donation_data['home_id'], is_active=True).first()
-            if not home:
-                return jsonify({'error': f'Children\'s home with id {donation_data["home_id"]} not found'}), 404
+            try:
+                home_id = int(donation_data['home_id'])
+            except (TypeError, ValueError):
+                errors.append({'index': index, 'error': 'Invalid home_id format'})
+                continue
             
-          
             try:
                 amount = float(donation_data['amount'])
                 if amount <= 0:
-                    return jsonify({'error': 'Amount must be greater than 0'}), 400
-            except ValueError:
-                return jsonify({'error': 'Invalid amount format'}), 400
-            
-            
-            donation = Donation(
-                user_id=user_id,
-                home_id=donation_data['home_id'],
-                amount=amount,
-                donation_type=donation_data.get('donation_type', 'monetary'),
-                description=donation_data.get('description'),
-                payment_method=donation_data.get('payment_method'),
-                anonymous=donation_data.get('anonymous', False),
-                message_to_home=donation_data.get('message_to_home'),
-                status='pending'
-            )
+                    errors.append({'index': index, 'error': 'Amount must be greater than 0'})
+                    continue
+            except (TypeError, ValueError):
+                errors.append({'index': index, 'error': 'Invalid amount format'})
+                continue
             
-            db.session.add(donation)
-            created_donations.append(donation)
+            rows.append((index, {
+                'user_id': user_id,
+                'home_id': home_id,
+                'amount': amount,
+                'donation_type': donation_data.get('donation_type', 'monetary'),
+                'description': donation_data.get('description'),
+                'payment_method': donation_data.get('payment_method'),
+                'anonymous': donation_data.get('anonymous', False),
+                'message_to_home': donation_data.get('message_to_home'),
+                'status': 'pending'
+            }))
+        
+        active_ids = registry.active_ids(row['home_id'] for _, row in rows)
+        for index, row in rows:
+            if row['home_id'] not in active_ids:
+                errors.append({'index': index, 'error': f'Children\'s home with id {row["home_id"]} not found'})
+        
+        if errors:
+            return jsonify({
+                'error': f'{len(errors)} of {len(data["donations"])} donations are invalid',
+                'errors': sorted(errors, key=lambda error: error['index'])
+            }), 400
+        
+        # Insert in chunks; each chunk is one multi-row INSERT ... RETURNING.
+        created_donations = []
+        for start in range(0, len(rows), chunk_size):
+            chunk = [row for _, row in rows[start:start + chunk_size]]
+            donations = sorted(db.session.scalars(
+                insert(Donation).returning(Donation),
+                chunk
+            ).all(), key=lambda donation: donation.id)
+            created_donations.extend(donation.to_dict() for donation in donations)
+            for donation in donations:
+                db.session.expunge(donation)
         
         db.session.commit()
+        invalidate_overview()
+        record_donations([row['amount'] for _, row in rows])
         
         return jsonify({
             'message': f'{len(created_donations)} donations created successfully',
-            'donations': [donation.to_dict() for donation in created_donations]
+            'donations': created_donations
         }), 201
         
     except Exception as e:
@@ -121,35 +156,28 @@ def create_multiple_donations():
 def get_my_donations():
     try:
         user_id = get_jwt_identity()
-        page = request.args.get('page', 1, type=int)
-        per_page = request.args.get('per_page', 10, type=int)
         status = request.args.get('status', '')
         
-        query = Donation.query.filter_by(user_id=user_id)
+        query = load_for_serialization(
+            Donation.query.filter_by(user_id=user_id),
+            Donation.donor
+        )
         
         if status:
             query = query.filter_by(status=status)
         
-        donations_pagination = query.order_by(Donation.created_at.desc()).paginate(
-            page=page,
-            per_page=per_page,
-            error_out=False
-        )
+        items, pagination = paginate(query, [Donation.created_at, Donation.id])
         
-        donations = [donation.to_dict() for donation in donations_pagination.items]
+        donations = [donation.to_dict() for donation in items]
         
         return jsonify({
             'donations': donations,
-            'pagination': {
-                'page': page,
-                'per_page': per_page,
-                'total': donations_pagination.total,
-                'pages': donations_pagination.pages,
-                'has_prev': donations_pagination.has_prev,
-                'has_next': donations_pagination.has_next
-            }
+            'pagination': pagination
         }), 200
         
+    except InvalidCursor as e:
+        return jsonify({'error': str(e)}), 400
+
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
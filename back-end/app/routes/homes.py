@@ -1,115 +1,147 @@
-from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
-from sqlalchemy import or_
+from flask import Blueprint, Response, current_app, request, jsonify, stream_with_context
 from app import db
 from app.models.childrens_home import ChildrensHome
-from app.models.user import User
+from app.models.review import Review
+from app.services.search import apply_search
+from app.services.home_registry import get_active_home
+from app.services.response_cache import cached_response
+from app.services.freshness import homes_version, home_version, home_reviews_version
+from app.utils.pagination import paginate, InvalidCursor
+from app.utils.serialization import load_for_serialization, load_for_fields
+from app.utils.fields import requested_fields, InvalidFields
+from app.utils.conditional import conditional_get
 
 homes_bp = Blueprint('homes', __name__)
 
 @homes_bp.route('/', methods=['GET'])
+@conditional_get(homes_version)
+@cached_response('homes')
 def get_homes():
     try:
-        page = request.args.get('page', 1, type=int)
-        per_page = request.args.get('per_page', 10, type=int)
         search = request.args.get('search', '')
         location = request.args.get('location', '')
+        fields = requested_fields(ChildrensHome.SERIALIZED_FIELDS)
         
-        query = ChildrensHome.query.filter_by(is_active=True)
+        query = load_for_fields(
+            ChildrensHome.query.filter_by(is_active=True),
+            ChildrensHome,
+            fields,
+            ChildrensHome.created_at
+        )
         
         
+        sort_keys = [ChildrensHome.created_at, ChildrensHome.id]
         if search:
-            query = query.filter(
-                or_(
-                    ChildrensHome.name.ilike(f'%{search}%'),
-                    ChildrensHome.description.ilike(f'%{search}%')
-                )
-            )
+            query = apply_search(query, search)
+            sort_keys = None
         
         if location:
             query = query.filter(ChildrensHome.location.ilike(f'%{location}%'))
         
         
-        homes_pagination = query.paginate(
-            page=page, 
-            per_page=per_page, 
-            error_out=False
-        )
+        items, pagination = paginate(query, sort_keys)
         
-        homes = [home.to_dict() for home in homes_pagination.items]
+        homes = [home.to_dict(fields) for home in items]
         
         return jsonify({
             'homes': homes,
-            'pagination': {
-                'page': page,
-                'per_page': per_page,
-                'total': homes_pagination.total,
-                'pages': homes_pagination.pages,
-                'has_prev': homes_pagination.has_prev,
-                'has_next': homes_pagination.has_next
-            }
+            'pagination': pagination
         }), 200
         
+    except (InvalidCursor, InvalidFields) as e:
+        return jsonify({'error': str(e)}), 400
+
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @homes_bp.route('/<int:home_id>', methods=['GET'])
+@conditional_get(home_version)
+@cached_response('home:{home_id}')
 def get_home_details(home_id):
     try:
-        home = ChildrensHome.query.filter_by(id=home_id, is_active=True).first()
+        fields = requested_fields(ChildrensHome.SERIALIZED_FIELDS + ('recent_reviews',))
+        home_fields = [name for name in fields if name != 'recent_reviews'] if fields is not None else None
+        home = load_for_fields(
+            ChildrensHome.query.filter_by(id=home_id, is_active=True),
+            ChildrensHome,
+            home_fields
+        ).first()
         
         if not home:
             return jsonify({'error': 'Children\'s home not found'}), 404
         
-       
-        recent_reviews = []
-        for review in home.reviews[-5:]:
-            if review.is_approved:
-                recent_reviews.append(review.to_dict())
+        home_data = home.to_dict(home_fields)
         
-        home_data = home.to_dict()
-        home_data['recent_reviews'] = recent_reviews
+        if fields is None or 'recent_reviews' in fields:
+            recent_reviews = load_for_serialization(
+                Review.query.filter_by(home_id=home_id, is_approved=True),
+                Review.reviewer
+            ).order_by(Review.created_at.desc(), Review.id.desc()).limit(5).all()
+            home_data['recent_reviews'] = [review.to_dict() for review in recent_reviews]
         
         return jsonify({'home': home_data}), 200
         
+    except InvalidFields as e:
+        return jsonify({'error': str(e)}), 400
+
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+def _stream_homes(query, fields):
+    # One JSON document per line, written as rows arrive from a server-side cursor.
+    for home in query.yield_per(current_app.config['STREAM_BATCH_SIZE']):
+        yield current_app.json.dumps(home.to_dict(fields)) + '\n'
+
 @homes_bp.route('/search', methods=['GET'])
 def search_homes():
     try:
         query_param = request.args.get('q', '')
         location_param = request.args.get('location', '')
-        
         if not query_param and not location_param:
             return jsonify({'error': 'Search query or location is required'}), 400
+        fields = requested_fields(ChildrensHome.SERIALIZED_FIELDS)
         
-        query = ChildrensHome.query.filter_by(is_active=True)
+        query = load_for_fields(
+            ChildrensHome.query.filter_by(is_active=True),
+            ChildrensHome,
+            fields
+        )
         
         if query_param:
-            query = query.filter(
-                or_(
-                    ChildrensHome.name.ilike(f'%{query_param}%'),
-                    ChildrensHome.description.ilike(f'%{query_param}%'),
-                    ChildrensHome.needs_description.ilike(f'%{query_param}%')
-                )
-            )
+            query = apply_search(query, query_param)
         
         if location_param:
             query = query.filter(ChildrensHome.location.ilike(f'%{location_param}%'))
         
-        homes = query.all()
-        homes_data = [home.to_dict() for home in homes]
+        max_results = current_app.config['SEARCH_MAX_RESULTS']
+        
+        if request.accept_mimetypes.best_match(['application/json', 'application/x-ndjson']) == 'application/x-ndjson':
+            if not query_param:
+                query = query.order_by(ChildrensHome.id)
+            return Response(
+                stream_with_context(_stream_homes(query.limit(max_results), fields)),
+                mimetype='application/x-ndjson'
+            )
+        
+        items, pagination = paginate(query, default_per_page=20, max_results=max_results)
+        
+        homes_data = [home.to_dict(fields) for home in items]
         
         return jsonify({
             'homes': homes_data,
-            'count': len(homes_data)
+            'count': pagination['total'],
+            'pagination': pagination
         }), 200
         
+    except (InvalidCursor, InvalidFields) as e:
+        return jsonify({'error': str(e)}), 400
+
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @homes_bp.route('/locations', methods=['GET'])
+@conditional_get(homes_version)
+@cached_response('homes')
 def get_locations():
     try:
        
@@ -122,37 +154,32 @@ def get_locations():
         return jsonify({'error': str(e)}), 500
 
 @homes_bp.route('/<int:home_id>/reviews', methods=['GET'])
+@conditional_get(home_reviews_version)
+@cached_response('home:{home_id}')
 def get_home_reviews(home_id):
     try:
-        home = ChildrensHome.query.filter_by(id=home_id, is_active=True).first()
+        home = get_active_home(home_id)
         
         if not home:
             return jsonify({'error': 'Children\'s home not found'}), 404
         
-        page = request.args.get('page', 1, type=int)
-        per_page = request.args.get('per_page', 10, type=int)
-        
-        
-        reviews_query = db.session.query(home.reviews).filter_by(is_approved=True)
-        reviews_pagination = reviews_query.paginate(
-            page=page,
-            per_page=per_page,
-            error_out=False
+        items, pagination = paginate(
+            load_for_serialization(
+                Review.query.filter_by(home_id=home_id, is_approved=True),
+                Review.reviewer
+            ),
+            [Review.created_at, Review.id]
         )
         
-        reviews = [review.to_dict() for review in reviews_pagination.items]
+        reviews = [review.to_dict() for review in items]
         
         return jsonify({
             'reviews': reviews,
-            'pagination': {
-                'page': page,
-                'per_page': per_page,
-                'total': reviews_pagination.total,
-                'pages': reviews_pagination.pages,
-                'has_prev': reviews_pagination.has_prev,
-                'has_next': reviews_pagination.has_next
-            }
+            'pagination': pagination
         }), 200
         
+    except (InvalidCursor, InvalidFields) as e:
+        return jsonify({'error': str(e)}), 400
+
     except Exception as e:
         return jsonify({'error': str(e)}), 500
\ No newline at end of file
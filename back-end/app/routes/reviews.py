@@ -3,8 +3,14 @@ from flask_jwt_extended import jwt_required, get_jwt_identity
 from datetime import datetime
 from app import db
 from app.models.review import Review
-from app.models.childrens_home import ChildrensHome
-from app.models.user import User
+from app.models.rating_summary import HomeRatingSummary
+from app.services.home_registry import get_active_home
+from app.services.metrics import record_review
+from app.services.response_cache import cached_response
+from app.services.freshness import home_reviews_version
+from app.utils.pagination import paginate, InvalidCursor
+from app.utils.serialization import load_for_serialization
+from app.utils.conditional import conditional_get
 
 reviews_bp = Blueprint('reviews', __name__)
 
@@ -22,7 +28,7 @@ def create_review():
                 return jsonify({'error': f'{field} is required'}), 400
         
         
-        home = ChildrensHome.query.filter_by(id=data['home_id'], is_active=True).first()
+        home = get_active_home(data['home_id'])
         if not home:
             return jsonify({'error': 'Children\'s home not found'}), 404
         
@@ -60,6 +66,7 @@ def create_review():
         
         db.session.add(review)
         db.session.commit()
+        record_review()
         
         return jsonify({
             'message': 'Review created successfully',
@@ -75,31 +82,25 @@ def create_review():
 def get_my_reviews():
     try:
         user_id = get_jwt_identity()
-        page = request.args.get('page', 1, type=int)
-        per_page = request.args.get('per_page', 10, type=int)
-        
-        reviews_pagination = Review.query.filter_by(user_id=user_id).order_by(
-            Review.created_at.desc()
-        ).paginate(
-            page=page,
-            per_page=per_page,
-            error_out=False
+        
+        items, pagination = paginate(
+            load_for_serialization(
+                Review.query.filter_by(user_id=user_id),
+                Review.reviewer
+            ),
+            [Review.created_at, Review.id]
         )
         
-        reviews = [review.to_dict() for review in reviews_pagination.items]
+        reviews = [review.to_dict() for review in items]
         
         return jsonify({
             'reviews': reviews,
-            'pagination': {
-                'page': page,
-                'per_page': per_page,
-                'total': reviews_pagination.total,
-                'pages': reviews_pagination.pages,
-                'has_prev': reviews_pagination.has_prev,
-                'has_next': reviews_pagination.has_next
-            }
+            'pagination': pagination
         }), 200
         
+    except InvalidCursor as e:
+        return jsonify({'error': str(e)}), 400
+
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -190,53 +191,45 @@ def delete_review(review_id):
         return jsonify({'error': str(e)}), 500
 
 @reviews_bp.route('/home/<int:home_id>', methods=['GET'])
+@conditional_get(home_reviews_version)
+@cached_response('home:{home_id}')
 def get_home_reviews(home_id):
     try:
-        home = ChildrensHome.query.filter_by(id=home_id, is_active=True).first()
+        home = get_active_home(home_id)
         
         if not home:
             return jsonify({'error': 'Children\'s home not found'}), 404
         
-        page = request.args.get('page', 1, type=int)
-        per_page = request.args.get('per_page', 10, type=int)
         
         # Get approved reviews only for public view
-        reviews_pagination = Review.query.filter_by(
-            home_id=home_id, 
-            is_approved=True
-        ).order_by(Review.created_at.desc()).paginate(
-            page=page,
-            per_page=per_page,
-            error_out=False
+        items, pagination = paginate(
+            load_for_serialization(
+                Review.query.filter_by(home_id=home_id, is_approved=True),
+                Review.reviewer
+            ),
+            [Review.created_at, Review.id]
         )
         
-        reviews = [review.to_dict() for review in reviews_pagination.items]
+        reviews = [review.to_dict() for review in items]
         
         
-        rating_counts = {1: 0, 2: 0, 3: 0, 4: 0, 5: 0}
-        all_reviews = Review.query.filter_by(home_id=home_id, is_approved=True).all()
-        
-        for review in all_reviews:
-            rating_counts[review.rating] += 1
-        
-        average_rating = sum(r.rating for r in all_reviews) / len(all_reviews) if all_reviews else 0
+        summary = db.session.get(HomeRatingSummary, home_id)
+        average_rating = (summary.average_rating or 0) if summary else 0
+        total_reviews = summary.approved_count if summary else 0
+        rating_counts = summary.rating_distribution if summary else HomeRatingSummary.empty_distribution()
         
         return jsonify({
             'reviews': reviews,
-            'pagination': {
-                'page': page,
-                'per_page': per_page,
-                'total': reviews_pagination.total,
-                'pages': reviews_pagination.pages,
-                'has_prev': reviews_pagination.has_prev,
-                'has_next': reviews_pagination.has_next
-            },
+            'pagination': pagination,
             'rating_summary': {
                 'average_rating': round(average_rating, 2),
-                'total_reviews': len(all_reviews),
+                'total_reviews': total_reviews,
                 'rating_distribution': rating_counts
             }
         }), 200
         
+    except InvalidCursor as e:
+        return jsonify({'error': str(e)}), 400
+
     except Exception as e:
         return jsonify({'error': str(e)}), 500
\ No newline at end of file
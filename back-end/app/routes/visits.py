@@ -1,10 +1,13 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from datetime import datetime, date, time
+from datetime import datetime, date
 from app import db
 from app.models.visit import Visit
-from app.models.childrens_home import ChildrensHome
-from app.models.user import User
+from app.services.home_registry import get_active_home
+from app.services.metrics import record_visit
+from app.services.visit_capacity import reserve_slot, move_reservation, available_dates
+from app.utils.pagination import paginate, InvalidCursor
+from app.utils.serialization import load_for_serialization
 
 visits_bp = Blueprint('visits', __name__)
 
@@ -22,7 +25,7 @@ def schedule_visit():
                 return jsonify({'error': f'{field} is required'}), 400
         
         
-        home = ChildrensHome.query.filter_by(id=data['home_id'], is_active=True).first()
+        home = get_active_home(data['home_id'])
         if not home:
             return jsonify({'error': 'Children\'s home not found'}), 404
         
@@ -51,6 +54,10 @@ def schedule_visit():
         except ValueError:
             return jsonify({'error': 'Invalid number_of_visitors format'}), 400
         
+        
+        if not reserve_slot(data['home_id'], visit_date):
+            return jsonify({'error': 'No visit slots available on this date'}), 409
+        
        
         visit = Visit(
             user_id=user_id,
@@ -67,6 +74,7 @@ def schedule_visit():
         
         db.session.add(visit)
         db.session.commit()
+        record_visit()
         
         return jsonify({
             'message': 'Visit scheduled successfully',
@@ -82,35 +90,28 @@ def schedule_visit():
 def get_my_visits():
     try:
         user_id = get_jwt_identity()
-        page = request.args.get('page', 1, type=int)
-        per_page = request.args.get('per_page', 10, type=int)
         status = request.args.get('status', '')
         
-        query = Visit.query.filter_by(user_id=user_id)
+        query = load_for_serialization(
+            Visit.query.filter_by(user_id=user_id),
+            Visit.visitor
+        )
         
         if status:
             query = query.filter_by(status=status)
         
-        visits_pagination = query.order_by(Visit.visit_date.desc()).paginate(
-            page=page,
-            per_page=per_page,
-            error_out=False
-        )
+        items, pagination = paginate(query, [Visit.visit_date, Visit.id])
         
-        visits = [visit.to_dict() for visit in visits_pagination.items]
+        visits = [visit.to_dict() for visit in items]
         
         return jsonify({
             'visits': visits,
-            'pagination': {
-                'page': page,
-                'per_page': per_page,
-                'total': visits_pagination.total,
-                'pages': visits_pagination.pages,
-                'has_prev': visits_pagination.has_prev,
-                'has_next': visits_pagination.has_next
-            }
+            'pagination': pagination
         }), 200
         
+    except InvalidCursor as e:
+        return jsonify({'error': str(e)}), 400
+
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -144,6 +145,7 @@ def update_visit(visit_id):
             return jsonify({'error': 'Only pending visits can be updated'}), 400
         
         data = request.get_json()
+        original_date = visit.visit_date
         
        
         if 'visit_date' in data:
@@ -185,6 +187,10 @@ def update_visit(visit_id):
         if 'notes' in data:
             visit.notes = data['notes']
         
+        if not move_reservation(visit.home_id, original_date, visit.status, visit.visit_date, visit.status):
+            db.session.rollback()
+            return jsonify({'error': 'No visit slots available on this date'}), 409
+        
         visit.updated_at = datetime.utcnow()
         db.session.commit()
         
@@ -213,6 +219,7 @@ def cancel_visit(visit_id):
         if visit.status == 'completed':
             return jsonify({'error': 'Cannot cancel a completed visit'}), 400
         
+        move_reservation(visit.home_id, visit.visit_date, visit.status, visit.visit_date, 'cancelled')
         visit.status = 'cancelled'
         visit.updated_at = datetime.utcnow()
         db.session.commit()
@@ -229,7 +236,7 @@ def cancel_visit(visit_id):
 @visits_bp.route('/available-dates/<int:home_id>', methods=['GET'])
 def get_available_dates(home_id):
     try:
-        home = ChildrensHome.query.filter_by(id=home_id, is_active=True).first()
+        home = get_active_home(home_id)
         
         if not home:
             return jsonify({'error': 'Children\'s home not found'}), 404
@@ -240,36 +247,12 @@ def get_available_dates(home_id):
         end_date = start_date + timedelta(days=30)
         
         
-        existing_visits = Visit.query.filter(
-            Visit.home_id == home_id,
-            Visit.visit_date >= start_date,
-            Visit.visit_date <= end_date,
-            Visit.status.in_(['pending', 'confirmed'])
-        ).all()
-        
-        
-        available_dates = []
-        current_date = start_date
-        
-        while current_date <= end_date:
-           
-            if current_date.weekday() != 6:
-                
-                visits_on_date = len([v for v in existing_visits if v.visit_date == current_date])
-                
-                
-                if visits_on_date < 3:
-                    available_dates.append({
-                        'date': current_date.isoformat(),
-                        'available_slots': 3 - visits_on_date
-                    })
-            
-            current_date += timedelta(days=1)
+        available = available_dates(home_id, start_date, end_date)
         
         return jsonify({
             'home_id': home_id,
             'home_name': home.name,
-            'available_dates': available_dates
+            'available_dates': available
         }), 200
         
     except Exception as e:
@@ -0,0 +1,108 @@
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import event, case, func, select
+from sqlalchemy.orm import Session
+from app import db
+from app.models.user import User
+from app.models.childrens_home import ChildrensHome
+from app.models.donation import Donation
+from app.models.review import Review
+from app.models.visit import Visit
+from app.utils.cache import TTLCache
+
+# Admin overview analytics: every figure comes from one statement (one
+# conditional-aggregate subquery per table, joined ON TRUE into a single row),
+# cached per process for ANALYTICS_CACHE_TTL seconds and dropped as soon as
+# this process commits a write to any of the counted tables.
+
+OVERVIEW_KEY = 'overview'
+_TRACKED_MODELS = (User, ChildrensHome, Donation, Review, Visit)
+
+_cache = TTLCache()
+
+
+def _count_if(condition):
+    return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
+
+
+def _overview_statement(since):
+    users = select(
+        func.count(User.id).label('total_users'),
+        _count_if(User.date_joined >= since).label('new_users_30_days')
+    ).subquery()
+
+    homes = select(
+        _count_if(ChildrensHome.is_active == True).label('total_homes')
+    ).subquery()
+
+    donations = select(
+        func.count(Donation.id).label('total_donations'),
+        func.coalesce(func.sum(case((Donation.status == 'completed', Donation.amount))), 0).label('total_donation_amount'),
+        _count_if(Donation.status == 'pending').label('pending_donations'),
+        _count_if(Donation.created_at >= since).label('new_donations_30_days')
+    ).subquery()
+
+    visits = select(
+        func.count(Visit.id).label('total_visits'),
+        _count_if(Visit.created_at >= since).label('new_visits_30_days')
+    ).subquery()
+
+    reviews = select(
+        func.count(Review.id).label('total_reviews')
+    ).subquery()
+
+    return (
+        select(users, homes, donations, visits, reviews)
+        .select_from(users)
+        .join(homes, db.true())
+        .join(donations, db.true())
+        .join(visits, db.true())
+        .join(reviews, db.true())
+    )
+
+
+def compute_overview():
+    generated_at = datetime.utcnow()
+    row = db.session.execute(_overview_statement(generated_at - timedelta(days=30))).one()
+
+    return {
+        'overview': {
+            'total_users': row.total_users,
+            'total_homes': row.total_homes,
+            'total_donations': row.total_donations,
+            'total_visits': row.total_visits,
+            'total_reviews': row.total_reviews,
+            'total_donation_amount': float(row.total_donation_amount),
+            'pending_donations': row.pending_donations,
+            'new_users_30_days': row.new_users_30_days,
+            'new_donations_30_days': row.new_donations_30_days,
+            'new_visits_30_days': row.new_visits_30_days
+        },
+        'generated_at': generated_at.isoformat()
+    }
+
+
+def get_overview():
+    return _cache.get_or_set(OVERVIEW_KEY, compute_overview, ttl=current_app.config['ANALYTICS_CACHE_TTL'])
+
+
+def invalidate_overview():
+    _cache.invalidate(OVERVIEW_KEY)
+
+
+@event.listens_for(Session, 'after_flush')
+def _note_tracked_writes(session, flush_context):
+    changed = session.new | session.dirty | session.deleted
+    if any(isinstance(instance, _TRACKED_MODELS) for instance in changed):
+        session.info['analytics_stale'] = True
+
+
+@event.listens_for(Session, 'after_commit')
+def _invalidate_after_commit(session):
+    if session.info.pop('analytics_stale', False):
+        invalidate_overview()
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_after_rollback(session):
+    session.info.pop('analytics_stale', None)
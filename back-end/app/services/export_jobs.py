@@ -0,0 +1,283 @@
+import os
+import socket
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import Integer, cast, extract, func, select
+from app import db
+from app.models.childrens_home import ChildrensHome
+from app.models.donation import Donation
+from app.models.export_job import ExportJob
+from app.models.user import User
+from app.models.visit import Visit
+from app.services.exports import InvalidExport, apply_export_filters, encode_rows, export_format
+
+# Background exports for reports too heavy to stream inline. An admin submits
+# a report and gets a job id back; the job runs on a small thread pool
+# (EXPORT_JOB_WORKERS) with its own app context and database session, writes
+# its file under EXPORT_JOB_DIR and records its status in export_jobs. At most
+# EXPORT_JOB_MAX_PENDING jobs may be queued or running per process; beyond
+# that submissions are refused with ExportQueueFull.
+#
+# Status changes are committed to the export_jobs table. Row counts while a
+# job runs are kept in memory by the process running it (a progress UPDATE
+# would have to wait on the export's own open cursor on SQLite), so pollers
+# served by that process see live progress and others see it on completion.
+#
+# Each job records the host and pid of the process running it. A job whose
+# process on this host has gone, e.g. after a restart or a crashed worker, is
+# marked failed: every gunicorn worker sweeps for them as it starts, and a
+# status poll checks the job it reads. Finished files are deleted, and their
+# jobs marked expired, EXPORT_JOB_RETENTION_HOURS after completion.
+
+
+class ExportQueueFull(Exception):
+    pass
+
+
+_executor = None
+_slots = None
+_lock = threading.Lock()
+_progress = {}
+_active = set()
+UNFINISHED = ('queued', 'running')
+
+
+def _donor_name():
+    return (User.first_name + ' ' + User.last_name).label('donor_name')
+
+
+def donation_history(filters):
+    statement = (
+        select(*Donation.__table__.c, User.username.label('donor_username'), _donor_name(), ChildrensHome.name.label('home_name'))
+        .join(User, User.id == Donation.user_id)
+        .join(ChildrensHome, ChildrensHome.id == Donation.home_id)
+        .order_by(Donation.id)
+    )
+    return apply_export_filters(statement, 'donations', filters)
+
+
+def visit_history(filters):
+    statement = (
+        select(*Visit.__table__.c, User.username.label('visitor_username'), ChildrensHome.name.label('home_name'))
+        .join(User, User.id == Visit.user_id)
+        .join(ChildrensHome, ChildrensHome.id == Visit.home_id)
+        .order_by(Visit.id)
+    )
+    return apply_export_filters(statement, 'visits', filters)
+
+
+def home_statements(filters):
+    """Completed donations per home and calendar year."""
+    year = cast(extract('year', Donation.created_at), Integer)
+    statement = (
+        select(
+            ChildrensHome.id.label('home_id'),
+            ChildrensHome.name.label('home_name'),
+            year.label('year'),
+            func.count(Donation.id).label('donation_count'),
+            func.count(func.distinct(Donation.user_id)).label('donor_count'),
+            func.coalesce(func.sum(Donation.amount), 0).label('donation_total')
+        )
+        .join(Donation, Donation.home_id == ChildrensHome.id)
+        .where(Donation.status == 'completed')
+        .group_by(ChildrensHome.id, ChildrensHome.name, year)
+        .order_by(ChildrensHome.id, year)
+    )
+    if filters.get('year'):
+        try:
+            statement = statement.where(year == int(filters['year']))
+        except (TypeError, ValueError):
+            raise InvalidExport('Invalid year')
+    return apply_export_filters(statement, 'donations', {
+        'home_id': filters.get('home_id'),
+        'start_date': filters.get('start_date'),
+        'end_date': filters.get('end_date')
+    })
+
+
+REPORTS = {
+    'donations': donation_history,
+    'visits': visit_history,
+    'home-statements': home_statements
+}
+
+
+def _get_pool(config):
+    global _executor, _slots
+    if _executor is None:
+        with _lock:
+            if _executor is None:
+                _slots = threading.BoundedSemaphore(config['EXPORT_JOB_MAX_PENDING'])
+                _executor = ThreadPoolExecutor(
+                    max_workers=config['EXPORT_JOB_WORKERS'],
+                    thread_name_prefix='export-job'
+                )
+    return _executor, _slots
+
+
+def export_dir(app):
+    return app.config['EXPORT_JOB_DIR'] or os.path.join(app.instance_path, 'exports')
+
+
+def _statement(job):
+    return REPORTS[job.report](job.parameters or {})
+
+
+def submit_job(report, fmt, parameters, user_id):
+    if report not in REPORTS:
+        raise InvalidExport(f'Invalid report, use one of: {", ".join(REPORTS)}')
+    fmt = export_format(fmt)
+    parameters = {key: value for key, value in (parameters or {}).items() if value not in (None, '')}
+    REPORTS[report](parameters)
+
+    prune_expired()
+
+    app = current_app._get_current_object()
+    executor, slots = _get_pool(app.config)
+    if not slots.acquire(blocking=False):
+        raise ExportQueueFull('Too many export jobs in progress, please retry later')
+
+    job = ExportJob(
+        id=uuid.uuid4().hex, report=report, format=fmt, parameters=parameters,
+        requested_by=user_id, worker=_worker_id()
+    )
+    _active.add(job.id)
+    try:
+        db.session.add(job)
+        db.session.commit()
+        executor.submit(_run_job, app, job.id, slots)
+    except Exception:
+        _active.discard(job.id)
+        slots.release()
+        raise
+    return job
+
+
+def _export(app, job_id):
+    job = db.session.get(ExportJob, job_id)
+    statement = _statement(job)
+    job.status = 'running'
+    job.started_at = datetime.utcnow()
+    job.total_rows = db.session.execute(
+        select(func.count()).select_from(statement.order_by(None).subquery())
+    ).scalar()
+    db.session.commit()
+
+    directory = export_dir(app)
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f'{job.report}-{job.id}.{job.format}')
+    _progress[job_id] = 0
+
+    def progress(rows):
+        _progress[job_id] += rows
+
+    try:
+        with open(path + '.part', 'w', encoding='utf-8', newline='') as output:
+            for chunk in encode_rows(statement, job.format, progress):
+                output.write(chunk)
+        os.replace(path + '.part', path)
+    finally:
+        if os.path.exists(path + '.part'):
+            os.unlink(path + '.part')
+
+    job.status = 'completed'
+    job.file_path = path
+    job.rows_written = _progress[job_id]
+    job.finished_at = datetime.utcnow()
+    db.session.commit()
+
+
+def _run_job(app, job_id, slots):
+    try:
+        with app.app_context():
+            try:
+                _export(app, job_id)
+            except Exception as e:
+                app.logger.exception('Export job %s failed', job_id)
+                db.session.rollback()
+                job = db.session.get(ExportJob, job_id)
+                job.status = 'failed'
+                job.error = str(e)
+                job.rows_written = _progress.get(job_id, 0)
+                job.finished_at = datetime.utcnow()
+                db.session.commit()
+    finally:
+        _progress.pop(job_id, None)
+        _active.discard(job_id)
+        slots.release()
+
+
+def _worker_id():
+    return f'{socket.gethostname()}:{os.getpid()}'
+
+
+def _interrupted(job):
+    """Whether `job` is unfinished but the process on this host that ran it has gone."""
+    host, _, pid = (job.worker or '').rpartition(':')
+    if job.status not in UNFINISHED or host != socket.gethostname() or not pid.isdigit():
+        return False
+    pid = int(pid)
+    if pid == os.getpid():
+        return job.id not in _active
+    if os.name != 'posix':
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return True
+    except PermissionError:
+        pass
+    return False
+
+
+def _fail_interrupted(job):
+    job.status = 'failed'
+    job.error = 'Interrupted: the process running the export stopped'
+    job.finished_at = datetime.utcnow()
+
+
+def fail_interrupted_jobs():
+    """Mark failed the unfinished jobs whose process on this host has gone; returns how many."""
+    jobs = [job for job in ExportJob.query.filter(ExportJob.status.in_(UNFINISHED)) if _interrupted(job)]
+    for job in jobs:
+        _fail_interrupted(job)
+    db.session.commit()
+    return len(jobs)
+
+
+def prune_expired():
+    """Delete this host's export files older than EXPORT_JOB_RETENTION_HOURS; returns how many."""
+    cutoff = datetime.utcnow() - timedelta(hours=current_app.config['EXPORT_JOB_RETENTION_HOURS'])
+    jobs = ExportJob.query.filter(
+        ExportJob.status == 'completed',
+        ExportJob.finished_at < cutoff,
+        ExportJob.worker.like(f'{socket.gethostname()}:%')
+    ).all()
+    for job in jobs:
+        try:
+            os.unlink(job.file_path)
+        except FileNotFoundError:
+            pass
+        job.status = 'expired'
+        job.file_path = None
+    db.session.commit()
+    return len(jobs)
+
+
+def job_status(job):
+    if _interrupted(job):
+        _fail_interrupted(job)
+        db.session.commit()
+    return job.to_dict(rows_written=_progress.get(job.id))
+
+
+def shutdown_pool():
+    global _executor, _slots
+    with _lock:
+        if _executor is not None:
+            _executor.shutdown(wait=True)
+        _executor = None
+        _slots = None
@@ -0,0 +1,57 @@
+from sqlalchemy import select, func
+from app import db
+from app.models.childrens_home import ChildrensHome
+from app.models.review import Review
+from app.models.rating_summary import HomeRatingSummary
+from app.models.home_stats import HomeStats
+from app.models.user import User
+from app.services.home_registry import get_active_home
+
+# Validators for conditional GETs (see app.utils.conditional). Each one reads
+# the newest updated_at and a row count of everything a response is built
+# from, in a single aggregate statement, so a client holding a current copy
+# gets 304 without the response being serialized. The count catches deletes,
+# which leave no newer updated_at behind.
+
+
+def _reviews_version(home_id):
+    # Reviews embed the reviewer's name, so their users' updated_at counts too
+    return select(func.max(Review.updated_at), func.count(Review.id), func.max(User.updated_at)).join(
+        User, User.id == Review.user_id
+    ).where(
+        Review.home_id == home_id,
+        Review.is_approved == True
+    )
+
+
+def homes_version():
+    homes = select(func.max(ChildrensHome.updated_at), func.count(ChildrensHome.id)).subquery()
+    ratings = select(func.max(HomeRatingSummary.updated_at).label('updated_at')).subquery()
+    stats = select(func.max(HomeStats.updated_at).label('updated_at')).subquery()
+    return tuple(db.session.execute(
+        select(homes, ratings.c.updated_at, stats.c.updated_at).select_from(homes).join(ratings, db.true()).join(stats, db.true())
+    ).one())
+
+
+def home_version(home_id):
+    reviews = _reviews_version(home_id).subquery()
+    row = db.session.execute(
+        select(
+            ChildrensHome.updated_at,
+            HomeRatingSummary.updated_at,
+            HomeStats.updated_at,
+            *reviews.c
+        )
+        .select_from(ChildrensHome)
+        .outerjoin(HomeRatingSummary, HomeRatingSummary.home_id == ChildrensHome.id)
+        .outerjoin(HomeStats, HomeStats.home_id == ChildrensHome.id)
+        .join(reviews, db.true())
+        .where(ChildrensHome.id == home_id, ChildrensHome.is_active == True)
+    ).first()
+    return tuple(row) if row is not None else None
+
+
+def home_reviews_version(home_id):
+    if not get_active_home(home_id):
+        return None
+    return tuple(db.session.execute(_reviews_version(home_id)).one())
@@ -0,0 +1,204 @@
+import csv
+import io
+import json
+from datetime import datetime
+from flask import current_app
+from sqlalchemy import insert
+from app import db
+from app.models.childrens_home import ChildrensHome
+from app.models.home_stats import HomeStats
+from app.services.analytics import invalidate_overview
+from app.services.home_registry import registry
+from app.services.response_cache import response_cache
+from app.services.search import index_homes
+
+# Bulk import of children's homes from CSV (with a header row) or JSON Lines.
+# Records are read from the stream as they are parsed and validated one by
+# one; every HOME_IMPORT_CHUNK_SIZE valid rows are written in their own
+# transaction with a multi-row INSERT, together with their stats rows and
+# search documents. Bulk inserts skip the ORM events that maintain those for
+# single homes, and the per-worker home registry, analytics overview and
+# response cache are refreshed once at the end. A file that cannot be read
+# to the end raises ImportAborted, which carries the result so far: batches
+# committed before the bad bytes stay imported.
+
+IMPORT_FORMATS = ('csv', 'jsonl')
+
+TEXT_FIELDS = (
+    'name', 'description', 'location', 'address', 'phone_number', 'email',
+    'contact_person', 'website', 'image_url', 'needs_description'
+)
+REQUIRED_FIELDS = ('name', 'location')
+TRUE_VALUES = ('true', '1', 'yes', 'y')
+FALSE_VALUES = ('false', '0', 'no', 'n')
+
+
+class InvalidHome(ValueError):
+    pass
+
+
+class ImportAborted(InvalidHome):
+    """The file stopped being readable partway; `result` counts what was already imported."""
+
+    def __init__(self, message, result):
+        super().__init__(message)
+        self.result = result
+
+
+def _blank(value):
+    return value is None or (isinstance(value, str) and not value.strip())
+
+
+def _integer(data, field, default=None):
+    value = data.get(field)
+    if _blank(value):
+        return default
+    try:
+        number = int(value)
+    except (TypeError, ValueError):
+        raise InvalidHome(f'Invalid {field}, must be a whole number')
+    if number < 0:
+        raise InvalidHome(f'Invalid {field}, must not be negative')
+    return number
+
+
+def _boolean(data, field, default):
+    value = data.get(field)
+    if _blank(value):
+        return default
+    if isinstance(value, bool):
+        return value
+    if str(value).strip().lower() in TRUE_VALUES:
+        return True
+    if str(value).strip().lower() in FALSE_VALUES:
+        return False
+    raise InvalidHome(f'Invalid {field}, use true or false')
+
+
+def home_values(data):
+    """Validate a home payload and return its column values, or raise InvalidHome."""
+    for field in REQUIRED_FIELDS:
+        if _blank(data.get(field)):
+            raise InvalidHome(f'{field} is required')
+
+    values = {}
+    for field in TEXT_FIELDS:
+        value = data.get(field)
+        if _blank(value):
+            value = None
+        elif not isinstance(value, str):
+            value = str(value)
+        length = ChildrensHome.__table__.c[field].type.length
+        if value is not None and length and len(value) > length:
+            raise InvalidHome(f'{field} must be at most {length} characters')
+        values[field] = value
+
+    established_date = None
+    if not _blank(data.get('established_date')):
+        try:
+            established_date = datetime.strptime(str(data['established_date']).strip(), '%Y-%m-%d').date()
+        except ValueError:
+            raise InvalidHome('Invalid established_date format. Use YYYY-MM-DD')
+
+    values.update(
+        capacity=_integer(data, 'capacity'),
+        current_children_count=_integer(data, 'current_children_count', 0),
+        established_date=established_date,
+        is_active=_boolean(data, 'is_active', True)
+    )
+    return values
+
+
+def read_records(stream, fmt):
+    """Yield (line_number, record) from a text stream; record is a dict or an InvalidHome."""
+    if fmt == 'csv':
+        reader = csv.DictReader(stream)
+        for record in reader:
+            if None in record:
+                yield reader.line_num, InvalidHome('Row has more columns than the header')
+            else:
+                yield reader.line_num, record
+        return
+
+    for line_number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            yield line_number, InvalidHome('Invalid JSON')
+            continue
+        if not isinstance(record, dict):
+            record = InvalidHome('Each line must be a JSON object')
+        yield line_number, record
+
+
+def _insert_chunk(chunk):
+    home_ids = db.session.scalars(insert(ChildrensHome).returning(ChildrensHome.id), [values for _, values in chunk]).all()
+    db.session.execute(insert(HomeStats.__table__), [{'home_id': home_id} for home_id in home_ids])
+    index_homes(home_ids)
+    db.session.commit()
+    return len(home_ids)
+
+
+def import_homes(stream, fmt, binary=True):
+    """Import homes from `stream` and return {'imported', 'rejected', 'errors'}.
+
+    Errors are reported as {'line', 'error'}; at most HOME_IMPORT_MAX_ERRORS
+    are listed, but every rejected row is counted.
+    """
+    config = current_app.config
+    chunk_size = config['HOME_IMPORT_CHUNK_SIZE']
+    max_errors = config['HOME_IMPORT_MAX_ERRORS']
+    if binary:
+        stream = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+
+    imported = 0
+    rejected = 0
+    errors = []
+
+    def reject(line_number, error):
+        nonlocal rejected
+        rejected += 1
+        if len(errors) < max_errors:
+            errors.append({'line': line_number, 'error': str(error)})
+
+    def flush(chunk):
+        nonlocal imported
+        try:
+            imported += _insert_chunk(chunk)
+        except Exception as e:
+            db.session.rollback()
+            for line_number, _ in chunk:
+                reject(line_number, f'Not imported, the batch failed: {e}')
+
+    chunk = []
+    line_number = 0
+    try:
+        for line_number, record in read_records(stream, fmt):
+            if isinstance(record, InvalidHome):
+                reject(line_number, record)
+                continue
+            try:
+                chunk.append((line_number, home_values(record)))
+            except InvalidHome as e:
+                reject(line_number, e)
+                continue
+            if len(chunk) >= chunk_size:
+                flush(chunk)
+                chunk = []
+        if chunk:
+            flush(chunk)
+    except (UnicodeDecodeError, csv.Error) as e:
+        where = f' after line {line_number}' if line_number else ''
+        raise ImportAborted(
+            f'Could not read the file{where}, {imported} homes were already imported: {e}',
+            {'imported': imported, 'rejected': rejected, 'errors': errors}
+        )
+    finally:
+        if imported:
+            registry.invalidate()
+            invalidate_overview()
+            response_cache.invalidate('homes')
+
+    return {'imported': imported, 'rejected': rejected, 'errors': errors}
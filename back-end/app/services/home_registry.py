@@ -0,0 +1,128 @@
+import threading
+import time
+from datetime import timedelta
+from collections import namedtuple
+from flask import current_app
+from sqlalchemy import select
+from app import db
+from app.models.childrens_home import ChildrensHome
+
+# Per-worker registry of children's homes: id -> (name, location, is_active).
+# Read and write paths that only need to know a home exists, is active and
+# what it is called look it up here instead of issuing a SELECT. The whole
+# table is loaded on first use; after that, every HOME_REGISTRY_TTL seconds
+# only homes whose updated_at moved since the last load are read again
+# (REFRESH_OVERLAP allows for transactions that commit after their
+# updated_at was set). Admin home writes in this worker update their entry as
+# soon as they commit, so a deactivation applies at once here and within
+# HOME_REGISTRY_TTL on other workers. A home missing from the registry, e.g.
+# one created by another worker, is read from the database on demand.
+#
+# Homes are deactivated, never deleted, so the registry holds one small
+# tuple per row ever created; a full load costs one pass over the table.
+
+HomeSnapshot = namedtuple('HomeSnapshot', ['id', 'name', 'location', 'is_active'])
+
+REFRESH_OVERLAP = timedelta(seconds=60)
+
+
+def _select_snapshots():
+    return select(
+        ChildrensHome.id,
+        ChildrensHome.name,
+        ChildrensHome.location,
+        ChildrensHome.is_active,
+        ChildrensHome.updated_at
+    )
+
+
+class HomeRegistry:
+
+    def __init__(self):
+        self._homes = None
+        self._expires_at = 0
+        self._changed_since = None
+        self._lock = threading.Lock()
+
+    def _snapshots(self):
+        homes = self._homes
+        if homes is None or self._expires_at < time.monotonic():
+            with self._lock:
+                if self._homes is None:
+                    self._homes = {}
+                    self._changed_since = None
+                    self._read(_select_snapshots())
+                elif self._expires_at < time.monotonic():
+                    statement = _select_snapshots()
+                    if self._changed_since is not None:
+                        statement = statement.where(ChildrensHome.updated_at >= self._changed_since - REFRESH_OVERLAP)
+                    self._read(statement)
+                self._expires_at = time.monotonic() + current_app.config['HOME_REGISTRY_TTL']
+                homes = self._homes
+        return homes
+
+    def _read(self, statement):
+        """Apply the rows of `statement` to the registry; call with the lock held."""
+        for row in db.session.execute(statement):
+            self._homes[row.id] = HomeSnapshot(row.id, row.name, row.location, bool(row.is_active))
+            if row.updated_at and (self._changed_since is None or row.updated_at > self._changed_since):
+                self._changed_since = row.updated_at
+
+    def _load(self, home_ids):
+        """Read `home_ids` from the database into the registry and return the snapshots found."""
+        rows = db.session.execute(_select_snapshots().where(ChildrensHome.id.in_(home_ids))).all()
+        found = {row.id: HomeSnapshot(row.id, row.name, row.location, bool(row.is_active)) for row in rows}
+        with self._lock:
+            if self._homes is not None:
+                self._homes.update(found)
+        return found
+
+    def get(self, home_id):
+        try:
+            home_id = int(home_id)
+        except (TypeError, ValueError):
+            return None
+        home = self._snapshots().get(home_id)
+        if home is not None:
+            return home
+        return self._load([home_id]).get(home_id)
+
+    def get_active(self, home_id):
+        home = self.get(home_id)
+        return home if home and home.is_active else None
+
+    def active_ids(self, home_ids):
+        """The ids among `home_ids` of active homes; ids not in the registry are read in one query."""
+        homes = self._snapshots()
+        found = {}
+        missing = set()
+        for home_id in home_ids:
+            home = homes.get(home_id)
+            if home is None:
+                missing.add(home_id)
+            else:
+                found[home_id] = home
+        if missing:
+            found.update(self._load(missing))
+        return {home_id for home_id, home in found.items() if home.is_active}
+
+    def update(self, home):
+        """Record a committed write to `home` in this worker's registry."""
+        with self._lock:
+            if self._homes is not None:
+                self._homes[home.id] = HomeSnapshot(home.id, home.name, home.location, bool(home.is_active))
+
+    def invalidate(self):
+        with self._lock:
+            self._homes = None
+
+
+registry = HomeRegistry()
+
+
+def get_home(home_id):
+    return registry.get(home_id)
+
+
+def get_active_home(home_id):
+    return registry.get_active(home_id)
@@ -0,0 +1,153 @@
+import hmac
+import os
+import time
+from flask import Response, current_app, g, jsonify, request
+from sqlalchemy.pool import QueuePool
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, generate_latest, multiprocess
+)
+
+# Prometheus metrics served at /metrics when METRICS_ENABLED is set. When
+# METRICS_TOKEN is also set, a scrape must send it as a bearer token
+# (`Authorization: Bearer <token>`); without it the path is open to anyone who
+# can reach the app, so keep it behind the proxy.
+#
+# Under gunicorn, set PROMETHEUS_MULTIPROC_DIR (gunicorn.conf.py does) so
+# every worker writes its samples to its own memory-mapped file and a scrape
+# of any worker reports the sum over all of them. Without it the numbers
+# cover the process that answers the scrape.
+#
+# Recording stays off the request's critical path as far as possible: the
+# labelled children are looked up once and kept in plain dicts, so a request
+# costs a few uncontended lock acquisitions inside prometheus_client and no
+# registry lookups.
+
+HTTP_REQUESTS = Counter(
+    'http_requests_total', 'HTTP requests by route and status.', ['method', 'endpoint', 'status']
+)
+HTTP_REQUEST_DURATION = Histogram(
+    'http_request_duration_seconds', 'Time to build the response, by route.', ['method', 'endpoint'],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+)
+HTTP_REQUESTS_IN_PROGRESS = Gauge(
+    'http_requests_in_progress', 'Requests being handled, by route.', ['method', 'endpoint'],
+    multiprocess_mode='livesum'
+)
+
+DB_POOL_SIZE = Gauge('db_pool_size', 'Connections the pool keeps open.', multiprocess_mode='livesum')
+DB_POOL_CHECKED_OUT = Gauge('db_pool_checked_out', 'Connections currently in use.', multiprocess_mode='livesum')
+DB_POOL_OVERFLOW = Gauge('db_pool_overflow', 'Connections open beyond the pool size.', multiprocess_mode='livesum')
+DB_POOL_WAIT = Histogram(
+    'db_pool_wait_seconds', 'Time to get a connection from the pool, including opening one.',
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 30)
+)
+
+LOGINS = Counter('logins_total', 'Login attempts by outcome.', ['outcome'])
+USER_REGISTRATIONS = Counter('user_registrations_total', 'Accounts registered.')
+DONATIONS_CREATED = Counter('donations_created_total', 'Donations created.')
+DONATION_AMOUNT = Counter('donation_amount_total', 'Sum of the amounts of created donations.')
+REVIEWS_CREATED = Counter('reviews_created_total', 'Reviews written.')
+VISITS_SCHEDULED = Counter('visits_scheduled_total', 'Visits scheduled.')
+
+_children = {}
+
+
+def _child(metric, *labels):
+    key = (metric, labels)
+    child = _children.get(key)
+    if child is None:
+        child = _children[key] = metric.labels(*labels)
+    return child
+
+
+def record_login(outcome):
+    _child(LOGINS, outcome).inc()
+
+
+def record_registration():
+    USER_REGISTRATIONS.inc()
+
+
+def record_donations(amounts):
+    DONATIONS_CREATED.inc(len(amounts))
+    DONATION_AMOUNT.inc(sum(amounts))
+
+
+def record_review():
+    REVIEWS_CREATED.inc()
+
+
+def record_visit():
+    VISITS_SCHEDULED.inc()
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that reports its occupancy and checkout wait time."""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            DB_POOL_WAIT.observe(time.perf_counter() - started)
+            self._report()
+
+    def _do_return_conn(self, record):
+        super()._do_return_conn(record)
+        self._report()
+
+    def _report(self):
+        DB_POOL_SIZE.set(self.size())
+        DB_POOL_CHECKED_OUT.set(self.checkedout())
+        DB_POOL_OVERFLOW.set(max(self.overflow(), 0))
+
+
+class Metrics:
+
+    def init_app(self, app):
+        # Must run before db.init_app creates the engines. SQLite in-memory
+        # databases keep the StaticPool Flask-SQLAlchemy gives them.
+        engine_options = app.config.setdefault('SQLALCHEMY_ENGINE_OPTIONS', {})
+        engine_options.setdefault('poolclass', InstrumentedQueuePool)
+
+        app.before_request(self.before_request)
+        app.after_request(self.after_request)
+        app.teardown_request(self.teardown_request)
+        app.add_url_rule('/metrics', 'metrics', self.export)
+
+    def before_request(self):
+        if request.endpoint == 'metrics':
+            return
+        labels = (request.method, request.endpoint or 'unmatched')
+        _child(HTTP_REQUESTS_IN_PROGRESS, *labels).inc()
+        g.metrics_request = (labels, time.perf_counter())
+
+    def after_request(self, response):
+        started = g.get('metrics_request')
+        if started is not None:
+            labels, started_at = started
+            _child(HTTP_REQUEST_DURATION, *labels).observe(time.perf_counter() - started_at)
+            _child(HTTP_REQUESTS, *labels, response.status_code).inc()
+        return response
+
+    def teardown_request(self, exc):
+        started = g.pop('metrics_request', None)
+        if started is not None:
+            _child(HTTP_REQUESTS_IN_PROGRESS, *started[0]).dec()
+
+    def export(self):
+        token = current_app.config['METRICS_TOKEN']
+        if token:
+            supplied = request.headers.get('Authorization', '')
+            if not hmac.compare_digest(supplied.encode(), f'Bearer {token}'.encode()):
+                return jsonify({'error': 'Metrics token required'}), 401
+
+        if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+            registry = CollectorRegistry()
+            multiprocess.MultiProcessCollector(registry)
+        else:
+            registry = REGISTRY
+        return Response(generate_latest(registry), content_type=CONTENT_TYPE_LATEST)
+
+
+metrics = Metrics()
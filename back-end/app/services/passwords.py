@@ -0,0 +1,117 @@
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError
+from concurrent.futures.process import BrokenProcessPool
+import bcrypt
+from flask import current_app
+
+# bcrypt hashing and verification run in a small process pool so a burst of
+# logins cannot pin every request thread on CPU. At most
+# PASSWORD_HASH_MAX_PENDING operations may be queued or running per process;
+# beyond that callers get PasswordHasherBusy straight away instead of waiting.
+# An operation keeps its slot until the worker finishes it, even after the
+# caller timed out. If a worker dies the pool is replaced, and the calls it
+# failed raise PasswordHasherBusy rather than reporting a wrong password.
+# Set PASSWORD_HASH_WORKERS to 0 to hash inline (e.g. for local development).
+
+# bcrypt only uses the first 72 bytes of a password; older bcrypt releases
+# truncated silently and newer ones raise, so truncate explicitly to keep
+# existing hashes verifiable.
+BCRYPT_MAX_BYTES = 72
+
+
+class PasswordHasherBusy(Exception):
+    pass
+
+
+_executor = None
+_slots = None
+_lock = threading.Lock()
+
+
+def _encode(password):
+    return password.encode('utf-8')[:BCRYPT_MAX_BYTES]
+
+
+def _hash(password, rounds):
+    return bcrypt.hashpw(_encode(password), bcrypt.gensalt(rounds)).decode('utf-8')
+
+
+def _check(password_hash, password):
+    return bcrypt.checkpw(_encode(password), password_hash.encode('utf-8'))
+
+
+def _get_pool(config):
+    global _executor, _slots
+    if _executor is None:
+        with _lock:
+            if _executor is None:
+                _slots = threading.BoundedSemaphore(config['PASSWORD_HASH_MAX_PENDING'])
+                _executor = ProcessPoolExecutor(
+                    max_workers=config['PASSWORD_HASH_WORKERS'],
+                    mp_context=multiprocessing.get_context('spawn')
+                )
+    return _executor, _slots
+
+
+def _run(function, *args):
+    config = current_app.config
+    if not config['PASSWORD_HASH_WORKERS']:
+        return function(*args)
+
+    executor, slots = _get_pool(config)
+    if not slots.acquire(blocking=False):
+        raise PasswordHasherBusy('Too many password operations in progress, please retry shortly')
+    try:
+        future = executor.submit(function, *args)
+    except BrokenProcessPool:
+        slots.release()
+        _discard_pool(executor)
+        raise PasswordHasherBusy('Password worker stopped, please retry shortly')
+    future.add_done_callback(lambda future: slots.release())
+    try:
+        return future.result(timeout=config['PASSWORD_HASH_TIMEOUT'])
+    except TimeoutError:
+        raise PasswordHasherBusy('Password operation timed out, please retry shortly')
+    except BrokenProcessPool:
+        _discard_pool(executor)
+        raise PasswordHasherBusy('Password worker stopped, please retry shortly')
+
+
+def _discard_pool(executor):
+    """Forget a broken `executor` so the next operation starts a new pool."""
+    global _executor, _slots
+    with _lock:
+        if _executor is executor:
+            _executor = None
+            _slots = None
+    executor.shutdown(wait=False)
+
+
+def current_cost():
+    return current_app.config['BCRYPT_LOG_ROUNDS']
+
+
+def hash_cost(password_hash):
+    """The cost factor encoded in a bcrypt hash ($2b$<cost>$...), or None."""
+    try:
+        return int(password_hash.split('$')[2])
+    except (AttributeError, IndexError, ValueError):
+        return None
+
+
+def hash_password(password, rounds=None):
+    return _run(_hash, password, rounds or current_cost())
+
+
+def verify_password(password_hash, password):
+    return _run(_check, password_hash, password)
+
+
+def shutdown_pool():
+    global _executor, _slots
+    with _lock:
+        if _executor is not None:
+            _executor.shutdown(wait=True)
+        _executor = None
+        _slots = None
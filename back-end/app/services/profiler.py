@@ -0,0 +1,269 @@
+import json
+import os
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime
+from flask import current_app, g, request
+from flask_jwt_extended.exceptions import JWTExtendedException
+from jwt.exceptions import PyJWTError
+
+# On-demand sampling profiler for production requests.
+#
+# A request is profiled when an admin sends it with `X-Profile: true`, or
+# when an admin has armed capture for its endpoint (every request to that
+# endpoint is profiled until the capture expires). While a request runs, a
+# sampler thread records its stack every PROFILER_INTERVAL_MS. The samples
+# are written to PROFILER_DIR in the folded format read by flamegraph.pl,
+# speedscope and inferno ("outer;inner;leaf <count>" per line), next to a
+# JSON file describing the request. Only the newest PROFILER_MAX_PROFILES are
+# kept. Armed captures live in the same directory, so every worker on the
+# host sees them.
+#
+# PROFILER_ENABLED is off by default, and then no hooks are installed.
+# Otherwise a request that is not profiled costs a header lookup and a dict
+# lookup.
+
+PROFILE_ID = re.compile(r'^\d{8}T\d{12}-[0-9a-f]{8}$')
+CAPTURES_FILE = 'captures.json'
+CAPTURES_CHECK_INTERVAL = 1
+
+
+class InvalidCapture(ValueError):
+    pass
+
+
+def profile_dir(app):
+    return app.config['PROFILER_DIR'] or os.path.join(app.instance_path, 'profiles')
+
+
+_labels = {}
+
+
+def _frame_label(code):
+    """'function (module/path.py:line)', with the path relative to its sys.path entry."""
+    label = _labels.get(code)
+    if label is None:
+        filename = code.co_filename
+        for prefix in sorted((path for path in sys.path if path), key=len, reverse=True):
+            if filename.startswith(prefix + os.sep):
+                filename = filename[len(prefix) + 1:]
+                break
+        label = _labels[code] = f'{code.co_name} ({filename}:{code.co_firstlineno})'.replace(';', ':')
+    return label
+
+
+class Sampler:
+    """Samples the stack of one thread from a background thread."""
+
+    def __init__(self, thread_id, interval):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='profiler-sampler', daemon=True)
+
+    def start(self):
+        self.started = time.perf_counter()
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        self.duration = time.perf_counter() - self.started
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                stack.append(_frame_label(frame.f_code))
+                frame = frame.f_back
+            if stack:
+                self.stacks[';'.join(reversed(stack))] += 1
+
+    def folded(self):
+        return ''.join(f'{stack} {count}\n' for stack, count in self.stacks.most_common())
+
+
+class Profiler:
+
+    def __init__(self):
+        self._captures = {}
+        self._captures_mtime = None
+        self._captures_checked = 0
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        app.before_request(self.before_request)
+        app.after_request(self.after_request)
+        app.teardown_request(self.teardown_request)
+
+    def _captures_path(self):
+        return os.path.join(profile_dir(current_app), CAPTURES_FILE)
+
+    def captures(self):
+        """Armed endpoints mapped to when their capture expires (epoch seconds)."""
+        now = time.monotonic()
+        if now - self._captures_checked >= CAPTURES_CHECK_INTERVAL:
+            self._captures_checked = now
+            try:
+                mtime = os.stat(self._captures_path()).st_mtime
+            except FileNotFoundError:
+                mtime = None
+            if mtime != self._captures_mtime:
+                self._captures = self._read_captures()
+                self._captures_mtime = mtime
+        return self._captures
+
+    def _read_captures(self):
+        try:
+            with open(self._captures_path()) as captures:
+                return json.load(captures)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def _write_captures(self, captures):
+        path = self._captures_path()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path + '.part', 'w') as output:
+            json.dump(captures, output)
+        os.replace(path + '.part', path)
+        self._captures_checked = 0
+
+    def arm(self, endpoint, seconds):
+        if endpoint not in current_app.view_functions:
+            raise InvalidCapture(f'Unknown endpoint: {endpoint}')
+        try:
+            seconds = int(seconds)
+        except (TypeError, ValueError):
+            raise InvalidCapture('seconds must be an integer')
+        limit = current_app.config['PROFILER_MAX_CAPTURE_SECONDS']
+        if not 0 < seconds <= limit:
+            raise InvalidCapture(f'seconds must be between 1 and {limit}')
+        with self._lock:
+            captures = self._read_captures()
+            captures[endpoint] = time.time() + seconds
+            self._write_captures(captures)
+        return captures[endpoint]
+
+    def disarm(self, endpoint):
+        with self._lock:
+            captures = self._read_captures()
+            found = captures.pop(endpoint, None) is not None
+            self._write_captures(captures)
+        return found
+
+    def armed(self):
+        now = time.time()
+        return {
+            endpoint: datetime.utcfromtimestamp(expires_at).isoformat()
+            for endpoint, expires_at in self._read_captures().items() if expires_at > now
+        }
+
+    def _trigger(self):
+        if request.headers.get('X-Profile', '').lower() in ('1', 'true'):
+            from flask_jwt_extended import verify_jwt_in_request
+            from app.routes.admin import is_admin
+
+            try:
+                verify_jwt_in_request(optional=True)
+                if is_admin():
+                    return 'header'
+            except (JWTExtendedException, PyJWTError):
+                # A bad token only means the request is not profiled
+                pass
+        expires_at = self.captures().get(request.endpoint)
+        if expires_at is not None and expires_at > time.time():
+            return 'capture'
+        return None
+
+    def before_request(self):
+        trigger = self._trigger()
+        if trigger is None:
+            return
+        sampler = Sampler(threading.get_ident(), current_app.config['PROFILER_INTERVAL_MS'] / 1000)
+        g.profile = {
+            'id': f'{datetime.utcnow():%Y%m%dT%H%M%S%f}-{uuid.uuid4().hex[:8]}',
+            'trigger': trigger,
+            'sampler': sampler,
+            'started_at': datetime.utcnow()
+        }
+        sampler.start()
+
+    def after_request(self, response):
+        profile = g.get('profile')
+        if profile is not None:
+            profile['status'] = response.status_code
+            response.headers['X-Profile-Id'] = profile['id']
+        return response
+
+    def teardown_request(self, exc):
+        profile = g.pop('profile', None)
+        if profile is None:
+            return
+        sampler = profile['sampler']
+        sampler.stop()
+        try:
+            self._save(profile, sampler)
+        except OSError:
+            current_app.logger.exception('Could not save profile %s', profile['id'])
+
+    def _save(self, profile, sampler):
+        directory = profile_dir(current_app)
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, f'{profile["id"]}.folded'), 'w') as output:
+            output.write(sampler.folded())
+        with open(os.path.join(directory, f'{profile["id"]}.json'), 'w') as output:
+            json.dump({
+                'id': profile['id'],
+                'trigger': profile['trigger'],
+                'method': request.method,
+                'path': request.full_path.rstrip('?'),
+                'endpoint': request.endpoint,
+                'status': profile.get('status'),
+                'started_at': profile['started_at'].isoformat(),
+                'duration_ms': round(sampler.duration * 1000, 2),
+                'interval_ms': current_app.config['PROFILER_INTERVAL_MS'],
+                'samples': sum(sampler.stacks.values())
+            }, output)
+        self._prune(directory)
+
+    def _prune(self, directory):
+        ids = sorted(
+            name[:-len('.json')] for name in os.listdir(directory)
+            if name.endswith('.json') and PROFILE_ID.match(name[:-len('.json')])
+        )
+        for profile_id in ids[:-current_app.config['PROFILER_MAX_PROFILES']]:
+            for suffix in ('.json', '.folded'):
+                try:
+                    os.unlink(os.path.join(directory, profile_id + suffix))
+                except FileNotFoundError:
+                    pass
+
+    def profiles(self):
+        directory = profile_dir(current_app)
+        if not os.path.isdir(directory):
+            return []
+        found = []
+        for name in sorted(os.listdir(directory), reverse=True):
+            if name.endswith('.json') and PROFILE_ID.match(name[:-len('.json')]):
+                try:
+                    with open(os.path.join(directory, name)) as metadata:
+                        found.append(json.load(metadata))
+                except (FileNotFoundError, ValueError):
+                    continue
+        return found
+
+    def folded_path(self, profile_id):
+        """Path of a stored profile's folded stacks, or None for an unknown id."""
+        if not PROFILE_ID.match(profile_id):
+            return None
+        path = os.path.join(profile_dir(current_app), f'{profile_id}.folded')
+        return path if os.path.exists(path) else None
+
+
+profiler = Profiler()
@@ -0,0 +1,92 @@
+from datetime import date, timedelta
+from sqlalchemy import func, select, text
+from app import db
+from app.models.childrens_home import ChildrensHome
+from app.models.donation import Donation
+from app.models.review import Review
+from app.models.user import User
+from app.models.visit import Visit
+from app.models.visit_capacity import VisitCapacity
+
+# EXPLAIN checks for the hot queries and the index each one should use (see
+# the 0002_hot_path_indexes migration). The statements mirror what the
+# routes run. On PostgreSQL sequential scans are disabled for the check, so a
+# small development table still shows whether the index is usable at all.
+# Other databases are reported as skipped.
+
+# Names the databases give the index behind a primary key.
+PRIMARY_KEY_INDEXES = {
+    'postgresql': '{table}_pkey',
+    'sqlite': 'sqlite_autoindex_{table}_1'
+}
+
+
+def _primary_key_index(table):
+    pattern = PRIMARY_KEY_INDEXES.get(db.session.connection().dialect.name, '{table} primary key')
+    return pattern.format(table=table)
+
+
+def _hot_queries():
+    today = date.today()
+    return [
+        ('my donations by status', 'ix_donations_user_status_created_at', select(Donation).where(
+            Donation.user_id == 1, Donation.status == 'completed'
+        ).order_by(Donation.created_at.desc(), Donation.id.desc()).limit(10)),
+        ('donor stats', 'ix_donations_user_status_created_at', select(func.count(Donation.id)).where(
+            Donation.user_id == 1, Donation.status == 'completed'
+        )),
+        ('home donation totals', 'ix_donations_home_status', select(func.sum(Donation.amount)).where(
+            Donation.home_id == 1, Donation.status == 'completed'
+        )),
+        ('home available dates', _primary_key_index('visit_capacities'), select(
+            VisitCapacity.visit_date, VisitCapacity.capacity, VisitCapacity.reserved
+        ).where(
+            VisitCapacity.home_id == 1,
+            VisitCapacity.visit_date >= today,
+            VisitCapacity.visit_date <= today + timedelta(days=30)
+        )),
+        ('my visits', 'ix_visits_user_date', select(Visit).where(
+            Visit.user_id == 1
+        ).order_by(Visit.visit_date.desc(), Visit.id.desc()).limit(10)),
+        ('home reviews', 'ix_reviews_home_approved_created_at', select(Review).where(
+            Review.home_id == 1, Review.is_approved == True
+        ).order_by(Review.created_at.desc(), Review.id.desc()).limit(10)),
+        ('active homes', 'ix_childrens_homes_active_created_at', select(ChildrensHome).where(
+            ChildrensHome.is_active == True
+        ).order_by(ChildrensHome.created_at.desc(), ChildrensHome.id.desc()).limit(10)),
+        ('users by join date', 'ix_users_date_joined', select(User).order_by(
+            User.date_joined.desc(), User.id.desc()
+        ).limit(10)),
+    ]
+
+
+def explain(statement):
+    """The database's plan for `statement`, one line per plan row, or None if EXPLAIN is not supported."""
+    connection = db.session.connection()
+    sql = str(statement.compile(connection, compile_kwargs={'literal_binds': True}))
+    if connection.dialect.name == 'postgresql':
+        connection.execute(text('SET LOCAL enable_seqscan = off'))
+        return [row[0] for row in connection.execute(text(f'EXPLAIN {sql}'))]
+    if connection.dialect.name == 'sqlite':
+        return [row[-1] for row in connection.execute(text(f'EXPLAIN QUERY PLAN {sql}'))]
+    return None
+
+
+def check_query_plans():
+    """[{'query', 'index', 'uses_index', 'plan'}] for every hot query.
+
+    `uses_index` is None, and `plan` empty, when the database cannot be checked.
+    """
+    results = []
+    try:
+        for name, index, statement in _hot_queries():
+            plan = explain(statement)
+            results.append({
+                'query': name,
+                'index': index,
+                'uses_index': None if plan is None else any(index in line for line in plan),
+                'plan': plan or []
+            })
+    finally:
+        db.session.rollback()
+    return results
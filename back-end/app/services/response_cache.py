@@ -0,0 +1,267 @@
+import base64
+import json
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from urllib.parse import urlencode
+from flask import current_app, request, make_response, has_app_context
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+# Response cache for public GET endpoints.
+#
+# Views opt in with @cached_response(*tags). Entries are keyed on the path
+# plus the sorted query string and carry tags such as 'homes' (anything that
+# lists homes) or 'home:<id>' (one home's details and reviews). When a
+# session commits a write to a home or a review, or a donation or visit that
+# changes a home's totals (see HomeStats), the matching tags are invalidated.
+# RESPONSE_CACHE_BACKEND picks the storage: 'memory' for a per-process LRU
+# bounded by RESPONSE_CACHE_MAX_BYTES, 'redis' to share entries and
+# invalidations between workers, or 'none' to disable caching.
+
+
+class MemoryBackend:
+    """In-process LRU cache evicting least recently used entries by total body size."""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries = OrderedDict()
+        self._tags = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry['expires_at'] < time.monotonic():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key, entry, tags, ttl):
+        entry = dict(entry, expires_at=time.monotonic() + ttl, tags=tags)
+        size = len(entry['body'])
+        if size > self.max_bytes:
+            return 0
+        evicted = 0
+        with self._lock:
+            self._remove(key)
+            while self._entries and self.size + size > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                evicted += 1
+            self._entries[key] = entry
+            self.size += size
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+        return evicted
+
+    def invalidate_tags(self, tags):
+        with self._lock:
+            for tag in tags:
+                for key in self._tags.pop(tag, ()):
+                    self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._tags.clear()
+            self.size = 0
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self.size -= len(entry['body'])
+        for tag in entry['tags']:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+
+class RedisBackend:
+    """Shared backend; any client with the redis-py API can be passed in."""
+
+    def __init__(self, url=None, client=None, prefix='response-cache:'):
+        if client is None:
+            try:
+                import redis
+            except ImportError:
+                raise RuntimeError(
+                    "RESPONSE_CACHE_BACKEND is 'redis' but the redis package is not installed; "
+                    "pip install redis or choose another backend"
+                )
+            client = redis.Redis.from_url(url)
+        self.client = client
+        self.prefix = prefix
+
+    def get(self, key):
+        payload = self.client.get(self.prefix + key)
+        if payload is None:
+            return None
+        entry = json.loads(payload)
+        entry['body'] = base64.b64decode(entry['body'])
+        return entry
+
+    def set(self, key, entry, tags, ttl):
+        payload = json.dumps(dict(entry, body=base64.b64encode(entry['body']).decode('ascii')))
+        pipeline = self.client.pipeline()
+        pipeline.setex(self.prefix + key, ttl, payload)
+        for tag in tags:
+            pipeline.sadd(self._tag_key(tag), key)
+            pipeline.expire(self._tag_key(tag), ttl)
+        pipeline.execute()
+        return 0
+
+    def invalidate_tags(self, tags):
+        for tag in tags:
+            keys = [self.prefix + key.decode('utf-8') if isinstance(key, bytes) else self.prefix + key
+                    for key in self.client.smembers(self._tag_key(tag))]
+            self.client.delete(self._tag_key(tag), *keys)
+
+    def clear(self):
+        keys = list(self.client.scan_iter(match=self.prefix + '*'))
+        if keys:
+            self.client.delete(*keys)
+
+    def _tag_key(self, tag):
+        return f'{self.prefix}tag:{tag}'
+
+
+class ResponseCache:
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counters = {'hits': 0, 'misses': 0, 'stores': 0, 'evictions': 0, 'invalidations': 0}
+
+    def init_app(self, app):
+        name = app.config['RESPONSE_CACHE_BACKEND']
+        if name == 'memory':
+            backend = MemoryBackend(app.config['RESPONSE_CACHE_MAX_BYTES'])
+        elif name == 'redis':
+            backend = RedisBackend(app.config['RESPONSE_CACHE_REDIS_URL'])
+        else:
+            backend = None
+        app.extensions['response_cache'] = backend
+
+    @property
+    def backend(self):
+        return current_app.extensions.get('response_cache')
+
+    def count(self, counter, amount=1):
+        with self._lock:
+            self.counters[counter] += amount
+
+    def invalidate(self, *tags):
+        backend = self.backend if has_app_context() else None
+        if backend and tags:
+            backend.invalidate_tags(tags)
+            self.count('invalidations', len(tags))
+
+    def stats(self):
+        backend = self.backend
+        with self._lock:
+            stats = dict(self.counters)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_ratio'] = round(stats['hits'] / lookups, 4) if lookups else 0
+        stats['backend'] = current_app.config['RESPONSE_CACHE_BACKEND']
+        if isinstance(backend, MemoryBackend):
+            stats['entries'] = len(backend._entries)
+            stats['size_bytes'] = backend.size
+            stats['max_bytes'] = backend.max_bytes
+        return stats
+
+
+response_cache = ResponseCache()
+
+
+def cache_key():
+    query = urlencode(sorted(request.args.items(multi=True)))
+    return f'{request.path}?{query}'
+
+
+def cached_response(*tags):
+    """Cache successful GET responses of a view, tagged for invalidation.
+
+    Tags may reference view arguments, e.g. 'home:{home_id}'.
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            backend = response_cache.backend
+            if backend is None or request.method != 'GET':
+                return f(*args, **kwargs)
+
+            key = cache_key()
+            entry = backend.get(key)
+            if entry is not None:
+                response_cache.count('hits')
+                response = make_response(entry['body'], entry['status'])
+                response.content_type = entry['content_type']
+                response.headers['X-Cache'] = 'HIT'
+                return response
+
+            response_cache.count('misses')
+            response = make_response(f(*args, **kwargs))
+            if response.status_code == 200 and not response.is_streamed:
+                evicted = backend.set(key, {
+                    'status': response.status_code,
+                    'content_type': response.content_type,
+                    'body': response.get_data()
+                }, [tag.format(**kwargs) for tag in tags], current_app.config['RESPONSE_CACHE_TTL'])
+                response_cache.count('stores')
+                if evicted:
+                    response_cache.count('evictions', evicted)
+            response.headers['X-Cache'] = 'MISS'
+            return response
+        return decorated_function
+    return decorator
+
+
+def _tags_for(instance):
+    from app.models.childrens_home import ChildrensHome
+    from app.models.review import Review
+
+    if isinstance(instance, ChildrensHome):
+        return {'homes', f'home:{instance.id}'}
+    if isinstance(instance, Review):
+        return {'homes', f'home:{instance.home_id}'}
+    return set()
+
+
+def invalidate_homes_on_commit(session, home_ids):
+    """Invalidate cached responses showing `home_ids` once `session` commits."""
+    tags = session.info.setdefault('response_cache_tags', set())
+    tags.add('homes')
+    tags.update(f'home:{home_id}' for home_id in home_ids)
+
+
+def invalidate_reviewer_on_commit(session, user):
+    """Invalidate cached reviews showing `user`'s name once `session` commits."""
+    invalidate_homes_on_commit(session, {review.home_id for review in user.reviews})
+
+
+@event.listens_for(Session, 'after_flush')
+def _collect_tags(session, flush_context):
+    tags = set()
+    for instance in session.new | session.dirty | session.deleted:
+        tags |= _tags_for(instance)
+    if tags:
+        session.info.setdefault('response_cache_tags', set()).update(tags)
+
+
+@event.listens_for(Session, 'after_commit')
+def _invalidate_after_commit(session):
+    tags = session.info.pop('response_cache_tags', None)
+    if tags:
+        response_cache.invalidate(*tags)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_after_rollback(session):
+    session.info.pop('response_cache_tags', None)
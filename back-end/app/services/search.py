@@ -0,0 +1,153 @@
+import re
+from sqlalchemy import bindparam, text, and_, or_, false
+from app import db
+from app.models.childrens_home import ChildrensHome
+
+# Full-text search over children's homes.
+#
+# Every home has one search document in `home_search_documents`, rebuilt from
+# its name, location, needs and description whenever an admin writes the home.
+# PostgreSQL stores the document as a weighted tsvector behind a GIN index;
+# SQLite (local/dev) uses an FTS5 virtual table keyed on the home id.
+
+SEARCH_TABLE = 'home_search_documents'
+MAX_SEARCH_TERMS = 10
+
+
+def _terms(search):
+    return re.findall(r'\w+', (search or '').lower())[:MAX_SEARCH_TERMS]
+
+
+class PostgresSearchBackend:
+    ddl = [
+        f'CREATE TABLE IF NOT EXISTS {SEARCH_TABLE} ('
+        ' home_id INTEGER PRIMARY KEY REFERENCES childrens_homes (id) ON DELETE CASCADE,'
+        ' document TSVECTOR NOT NULL)',
+        f'CREATE INDEX IF NOT EXISTS ix_{SEARCH_TABLE}_document ON {SEARCH_TABLE} USING GIN (document)'
+    ]
+
+    document_sql = (
+        "setweight(to_tsvector('english', coalesce(name, '')), 'A') || "
+        "setweight(to_tsvector('english', coalesce(location, '')), 'B') || "
+        "setweight(to_tsvector('english', coalesce(needs_description, '')), 'C') || "
+        "setweight(to_tsvector('english', coalesce(description, '')), 'D')"
+    )
+
+    def index_homes(self, home_ids):
+        db.session.execute(text(
+            f'INSERT INTO {SEARCH_TABLE} (home_id, document) '
+            f'SELECT id, {self.document_sql} FROM childrens_homes WHERE id IN :home_ids '
+            'ON CONFLICT (home_id) DO UPDATE SET document = EXCLUDED.document'
+        ).bindparams(bindparam('home_ids', expanding=True)), {'home_ids': home_ids})
+
+    def rebuild(self):
+        db.session.execute(text(f'TRUNCATE {SEARCH_TABLE}'))
+        db.session.execute(text(
+            f'INSERT INTO {SEARCH_TABLE} (home_id, document) '
+            f'SELECT id, {self.document_sql} FROM childrens_homes'
+        ))
+
+    def hits(self, terms):
+        tsquery = ' & '.join(f'{term}:*' for term in terms)
+        return text(
+            f"SELECT home_id, ts_rank_cd(document, to_tsquery('english', :tsquery)) AS rank "
+            f"FROM {SEARCH_TABLE} WHERE document @@ to_tsquery('english', :tsquery)"
+        ).bindparams(tsquery=tsquery).columns(home_id=db.Integer, rank=db.Float)
+
+
+class SQLiteSearchBackend:
+    ddl = [
+        f'CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5('
+        "name, location, needs_description, description, tokenize = 'porter unicode61')"
+    ]
+
+    columns_sql = (
+        "coalesce(name, ''), coalesce(location, ''), "
+        "coalesce(needs_description, ''), coalesce(description, '')"
+    )
+
+    def index_homes(self, home_ids):
+        db.session.execute(text(
+            f'DELETE FROM {SEARCH_TABLE} WHERE rowid IN :home_ids'
+        ).bindparams(bindparam('home_ids', expanding=True)), {'home_ids': home_ids})
+        db.session.execute(text(
+            f'INSERT INTO {SEARCH_TABLE} (rowid, name, location, needs_description, description) '
+            f'SELECT id, {self.columns_sql} FROM childrens_homes WHERE id IN :home_ids'
+        ).bindparams(bindparam('home_ids', expanding=True)), {'home_ids': home_ids})
+
+    def rebuild(self):
+        db.session.execute(text(f'DELETE FROM {SEARCH_TABLE}'))
+        db.session.execute(text(
+            f'INSERT INTO {SEARCH_TABLE} (rowid, name, location, needs_description, description) '
+            f'SELECT id, {self.columns_sql} FROM childrens_homes'
+        ))
+
+    def hits(self, terms):
+        match = ' '.join(f'"{term}"*' for term in terms)
+        # bm25() is lower-is-better, so negate it to share "higher rank wins" with Postgres.
+        return text(
+            f'SELECT rowid AS home_id, -bm25({SEARCH_TABLE}, 10.0, 5.0, 2.0, 1.0) AS rank '
+            f'FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH :match'
+        ).bindparams(match=match).columns(home_id=db.Integer, rank=db.Float)
+
+
+_backends = {
+    'postgresql': PostgresSearchBackend(),
+    'sqlite': SQLiteSearchBackend()
+}
+
+
+def get_backend():
+    return _backends.get(db.engine.dialect.name)
+
+
+def create_search_index():
+    backend = get_backend()
+    if backend:
+        for statement in backend.ddl:
+            db.session.execute(text(statement))
+        db.session.commit()
+
+
+def index_home(home):
+    """Refresh the search document for a home. Call after the home is flushed."""
+    index_homes([home.id])
+
+
+def index_homes(home_ids):
+    """Refresh the search documents for the given (flushed or inserted) home ids."""
+    backend = get_backend()
+    if backend and home_ids:
+        backend.index_homes(list(home_ids))
+
+
+def rebuild_search_index():
+    backend = get_backend()
+    if backend:
+        backend.rebuild()
+        db.session.commit()
+
+
+def apply_search(query, search):
+    """Restrict a ChildrensHome query to matches for `search`, best matches first."""
+    terms = _terms(search)
+    if not terms:
+        return query.filter(false())
+
+    backend = get_backend()
+    if not backend:
+        # Dialects without a full-text backend keep the old substring match.
+        return query.filter(and_(*[
+            or_(
+                ChildrensHome.name.ilike(f'%{term}%'),
+                ChildrensHome.location.ilike(f'%{term}%'),
+                ChildrensHome.description.ilike(f'%{term}%'),
+                ChildrensHome.needs_description.ilike(f'%{term}%')
+            ) for term in terms
+        ])).order_by(ChildrensHome.id)
+
+    hits = backend.hits(terms).subquery('search_hits')
+    return query.join(hits, hits.c.home_id == ChildrensHome.id).order_by(
+        hits.c.rank.desc(),
+        ChildrensHome.id
+    )
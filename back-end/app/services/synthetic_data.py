@@ -0,0 +1,284 @@
+import math
+import random
+from datetime import date, datetime, time, timedelta
+from itertools import accumulate
+from sqlalchemy import insert, func, select
+from app import db
+from app.models.childrens_home import ChildrensHome
+from app.models.donation import Donation
+from app.models.review import Review
+from app.models.user import User
+from app.models.visit import Visit
+from app.models.visit_capacity import VisitCapacity
+from app.services.passwords import hash_password
+from app.services.visit_capacity import HOLDING_STATUSES, default_capacity
+
+# Synthetic data at production-like scale for benchmarking (`flask seed-db
+# --homes 50000 --users 1e6 --donations 1e7`). Everything is drawn from one
+# random.Random(seed), so the same seed, scale and as-of date produce the same
+# rows. Popularity follows a Zipf-like curve, so a few hot homes and heavy
+# donors account for most activity. Donation amounts are log-normal, December
+# giving peaks, and visits cluster in school holidays and never fall on a
+# Sunday. Pending and confirmed visits never exceed a day's visit capacity;
+# a request for a full day is generated as cancelled. Reviews keep to one per
+# user and home, including reviews already in the database. Rows go in with
+# multi-row INSERTs, CHUNK_SIZE per transaction. The ORM events that maintain
+# derived tables do not fire for them, so callers rebuild those afterwards.
+
+CHUNK_SIZE = 10000
+HISTORY_DAYS = 3 * 365
+FUTURE_DAYS = 60
+SYNTHETIC_PASSWORD = 'password123'
+
+CITIES = [
+    ('Nairobi, Kenya', 12), ('Kampala, Uganda', 8), ('Lagos, Nigeria', 10), ('Accra, Ghana', 6),
+    ('Dar es Salaam, Tanzania', 6), ('Kigali, Rwanda', 4), ('Mombasa, Kenya', 4), ('Kisumu, Kenya', 3),
+    ('Abuja, Nigeria', 4), ('Addis Ababa, Ethiopia', 5), ('Lusaka, Zambia', 3), ('Harare, Zimbabwe', 3),
+    ('Johannesburg, South Africa', 5), ('Cape Town, South Africa', 3), ('Kumasi, Ghana', 2), ('Arusha, Tanzania', 2)
+]
+HOME_WORDS = ['Hope', 'Sunshine', 'Little Angels', 'Grace', 'New Dawn', 'Rainbow', 'Shepherd', 'Mercy', 'Haven', 'Bright Future']
+HOME_KINDS = ["Children's Home", 'Orphanage', 'Children Centre', 'Rescue Home']
+NEEDS = [
+    'educational materials', 'food supplies', 'clothing', 'medical supplies', 'school uniforms',
+    'school fees', 'bedding', 'books', 'computers', 'clean water', 'recreational equipment'
+]
+FIRST_NAMES = ['John', 'Mary', 'David', 'Grace', 'Peter', 'Faith', 'James', 'Esther', 'Samuel', 'Ruth', 'Daniel', 'Joy', 'Paul', 'Mercy']
+LAST_NAMES = ['Smith', 'Mwangi', 'Okafor', 'Mensah', 'Mukasa', 'Otieno', 'Adebayo', 'Banda', 'Kamau', 'Nkosi', 'Achieng', 'Osei']
+REVIEW_TITLES = ['Wonderful place', 'Caring staff', 'Needs support', 'Great visit', 'Inspiring', 'Well run home']
+
+DONATION_MONTHS = [0.8, 0.7, 0.8, 0.9, 0.9, 0.9, 1.0, 1.0, 1.0, 1.1, 1.3, 2.0]
+VISIT_MONTHS = [0.8, 0.7, 0.9, 1.4, 0.9, 0.8, 1.0, 1.5, 0.9, 0.8, 1.0, 1.6]
+
+
+def _zipf_cum_weights(count, exponent):
+    return list(accumulate(1 / (rank ** exponent) for rank in range(1, count + 1)))
+
+
+def _day_cum_weights(days, month_weights, skip_sundays=False):
+    return list(accumulate(
+        0 if skip_sundays and day.weekday() == 6 else month_weights[day.month - 1]
+        for day in days
+    ))
+
+
+def _timestamp(rng, day):
+    return datetime.combine(day, time(rng.randrange(7, 22), rng.randrange(60), rng.randrange(60)))
+
+
+def _insert_chunks(table, rows, total, log, returning=None):
+    """Insert rows from the `rows` generator, CHUNK_SIZE per transaction."""
+    ids = []
+    chunk = []
+    inserted = 0
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == CHUNK_SIZE:
+            inserted += _insert(table, chunk, ids, returning)
+            log(f'  {table.name}: {inserted}/{total}')
+            chunk = []
+    if chunk:
+        inserted += _insert(table, chunk, ids, returning)
+        log(f'  {table.name}: {inserted}/{total}')
+    return ids
+
+
+def _insert(table, chunk, ids, returning):
+    if returning is not None:
+        ids.extend(db.session.execute(insert(table).returning(returning), chunk).scalars())
+    else:
+        db.session.execute(insert(table), chunk)
+    db.session.commit()
+    return len(chunk)
+
+
+def _homes(rng, count, start_day):
+    cities = [city for city, _ in CITIES]
+    city_weights = list(accumulate(weight for _, weight in CITIES))
+    for index in range(count):
+        capacity = rng.randrange(20, 151)
+        needs = ', '.join(rng.sample(NEEDS, 3))
+        created = start_day + timedelta(days=rng.randrange(HISTORY_DAYS))
+        yield {
+            'name': f'{rng.choice(HOME_WORDS)} {rng.choice(HOME_KINDS)} {index + 1}',
+            'description': f'Care, shelter and education for up to {capacity} children.',
+            'location': rng.choices(cities, cum_weights=city_weights)[0],
+            'address': f'{rng.randrange(1, 999)} {rng.choice(HOME_WORDS)} Road',
+            'phone_number': f'+254{rng.randrange(700000000, 799999999)}',
+            'email': f'home{index + 1}@example.org',
+            'capacity': capacity,
+            'current_children_count': rng.randrange(capacity // 2, capacity + 1),
+            'established_date': date(rng.randrange(1980, 2024), rng.randrange(1, 13), rng.randrange(1, 29)),
+            'contact_person': f'{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}',
+            'needs_description': f'We need {needs}.',
+            'is_active': rng.random() < 0.95,
+            'created_at': _timestamp(rng, created),
+            'updated_at': _timestamp(rng, created)
+        }
+
+
+def _users(rng, count, offset, password_hash, start_day):
+    for index in range(offset, offset + count):
+        joined = start_day + timedelta(days=rng.randrange(HISTORY_DAYS))
+        yield {
+            'username': f'user{index}',
+            'email': f'user{index}@example.com',
+            'password_hash': password_hash,
+            'first_name': rng.choice(FIRST_NAMES),
+            'last_name': rng.choice(LAST_NAMES),
+            'role': 'user',
+            'is_active': rng.random() < 0.98,
+            'date_joined': _timestamp(rng, joined)
+        }
+
+
+def _donations(rng, count, home_ids, home_weights, user_ids, user_weights, days, day_weights):
+    for _ in range(count):
+        created = _timestamp(rng, rng.choices(days, cum_weights=day_weights)[0])
+        yield {
+            'user_id': rng.choices(user_ids, cum_weights=user_weights)[0],
+            'home_id': rng.choices(home_ids, cum_weights=home_weights)[0],
+            'amount': round(min(max(rng.lognormvariate(math.log(40), 1.3), 1), 100000), 2),
+            'donation_type': rng.choices(['monetary', 'goods', 'services'], [85, 10, 5])[0],
+            'status': rng.choices(['completed', 'pending', 'cancelled'], [85, 10, 5])[0],
+            'payment_method': rng.choice(['card', 'bank_transfer', 'mobile_money']),
+            'anonymous': rng.random() < 0.1,
+            'created_at': created,
+            'updated_at': created
+        }
+
+
+def _open_slots(start_date, end_date):
+    """Slots left per (home_id, visit_date) that already has a capacity row or holding visits."""
+    capacity = default_capacity()
+    slots = {
+        (row.home_id, row.visit_date): row.capacity
+        for row in db.session.execute(
+            select(VisitCapacity.home_id, VisitCapacity.visit_date, VisitCapacity.capacity).where(
+                VisitCapacity.visit_date.between(start_date, end_date)
+            )
+        )
+    }
+    held = db.session.execute(
+        select(Visit.home_id, Visit.visit_date, func.count(Visit.id)).where(
+            Visit.visit_date.between(start_date, end_date),
+            Visit.status.in_(HOLDING_STATUSES)
+        ).group_by(Visit.home_id, Visit.visit_date)
+    )
+    for home_id, visit_date, count in held:
+        key = (home_id, visit_date)
+        slots[key] = slots.get(key, capacity) - count
+    return slots
+
+
+def _visits(rng, count, home_ids, home_weights, user_ids, user_weights, days, day_weights, today, slots):
+    capacity = default_capacity()
+    for _ in range(count):
+        visit_date = rng.choices(days, cum_weights=day_weights)[0]
+        if visit_date < today:
+            status = rng.choices(['completed', 'cancelled', 'pending'], [80, 15, 5])[0]
+        else:
+            status = rng.choices(['pending', 'confirmed', 'cancelled'], [60, 35, 5])[0]
+        home_id = rng.choices(home_ids, cum_weights=home_weights)[0]
+        if status in HOLDING_STATUSES:
+            key = (home_id, visit_date)
+            left = slots.get(key, capacity)
+            if left > 0:
+                slots[key] = left - 1
+            else:
+                status = 'cancelled'
+        created = _timestamp(rng, visit_date - timedelta(days=rng.randrange(1, 30)))
+        yield {
+            'user_id': rng.choices(user_ids, cum_weights=user_weights)[0],
+            'home_id': home_id,
+            'visit_date': visit_date,
+            'visit_time': time(rng.randrange(9, 17)),
+            'number_of_visitors': rng.choices([1, 2, 3, 4, 5], [40, 30, 15, 10, 5])[0],
+            'purpose': rng.choice(['Volunteering', 'Donation drop-off', 'Birthday celebration', 'Mentoring']),
+            'status': status,
+            'created_at': created,
+            'updated_at': created
+        }
+
+
+def _reviews(rng, count, home_ids, home_weights, user_ids, days, seen):
+    """Yield `count` reviews for (user_id, home_id) pairs not in `seen`, adding them to it."""
+    target = len(seen) + count
+    while len(seen) < target:
+        pair = (rng.choice(user_ids), rng.choices(home_ids, cum_weights=home_weights)[0])
+        if pair in seen:
+            continue
+        seen.add(pair)
+        created = _timestamp(rng, rng.choice(days))
+        yield {
+            'user_id': pair[0],
+            'home_id': pair[1],
+            'rating': rng.choices([1, 2, 3, 4, 5], [5, 7, 15, 33, 40])[0],
+            'title': rng.choice(REVIEW_TITLES),
+            'comment': 'Synthetic review.',
+            'visit_date': created.date(),
+            'anonymous': rng.random() < 0.1,
+            'is_approved': rng.random() < 0.9,
+            'created_at': created,
+            'updated_at': created
+        }
+
+
+def generate(homes, users, donations, reviews=None, visits=None, seed=42, as_of=None, log=print):
+    """Insert synthetic homes, users, donations, reviews and visits.
+
+    `reviews` defaults to 4 per generated home and `visits` to one per 10
+    donations. With no homes or users generated, activity is spread over the
+    existing ones.
+    Derived tables (stats, summaries, search, visit capacity) are not rebuilt.
+    """
+    rng = random.Random(seed)
+    today = as_of or date.today()
+    start_day = today - timedelta(days=HISTORY_DAYS)
+    history = [start_day + timedelta(days=offset) for offset in range(HISTORY_DAYS)]
+    reviews = homes * 4 if reviews is None else reviews
+    visits = donations // 10 if visits is None else visits
+
+    if homes:
+        log(f'Generating {homes} homes')
+    home_ids = _insert_chunks(ChildrensHome.__table__, _homes(rng, homes, start_day), homes, log, ChildrensHome.__table__.c.id)
+
+    if users:
+        log(f'Generating {users} users')
+    offset = (db.session.execute(select(func.max(User.id))).scalar() or 0) + 1
+    user_ids = _insert_chunks(
+        User.__table__, _users(rng, users, offset, hash_password(SYNTHETIC_PASSWORD), start_day), users, log, User.__table__.c.id
+    )
+
+    # Activity can also be generated for homes and users that already exist.
+    home_ids = sorted(home_ids or db.session.execute(select(ChildrensHome.id)).scalars())
+    user_ids = sorted(user_ids or db.session.execute(select(User.id)).scalars())
+    if not home_ids or not user_ids:
+        return
+    # Shuffle which ids are popular so hot homes and heavy donors are spread across the id range.
+    rng.shuffle(home_ids)
+    rng.shuffle(user_ids)
+    home_weights = _zipf_cum_weights(len(home_ids), 1.1)
+    user_weights = _zipf_cum_weights(len(user_ids), 0.8)
+
+    log(f'Generating {donations} donations')
+    _insert_chunks(Donation.__table__, _donations(
+        rng, donations, home_ids, home_weights, user_ids, user_weights,
+        history, _day_cum_weights(history, DONATION_MONTHS)
+    ), donations, log)
+
+    # New homes or users have no reviews yet; otherwise skip the pairs already reviewed.
+    if homes or users:
+        reviewed = set()
+    else:
+        reviewed = set(db.session.execute(select(Review.user_id, Review.home_id)).tuples())
+    reviews = max(min(reviews, len(home_ids) * len(user_ids) // 2 - len(reviewed)), 0)
+    log(f'Generating {reviews} reviews')
+    _insert_chunks(Review.__table__, _reviews(rng, reviews, home_ids, home_weights, user_ids, history, reviewed), reviews, log)
+
+    visit_days = history + [today + timedelta(days=offset) for offset in range(FUTURE_DAYS)]
+    log(f'Generating {visits} visits')
+    _insert_chunks(Visit.__table__, _visits(
+        rng, visits, home_ids, home_weights, user_ids, user_weights,
+        visit_days, _day_cum_weights(visit_days, VISIT_MONTHS, skip_sundays=True), today,
+        _open_slots(visit_days[0], visit_days[-1])
+    ), visits, log)
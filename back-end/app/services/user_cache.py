@@ -0,0 +1,34 @@
+from flask import current_app
+from app import db
+from app.models.user import User
+from app.utils.cache import TTLCache
+
+# Per-process cache of user snapshots (User.to_dict()) for authorization and
+# profile reads. Entries live for USER_CACHE_TTL seconds; writes through this
+# process invalidate them immediately, other workers catch up within the TTL.
+
+_cache = TTLCache(maxsize=10000)
+
+
+def get_user_snapshot(user_id):
+    if user_id is None:
+        return None
+    user_id = int(user_id)
+
+    snapshot = _cache.get(user_id)
+    if snapshot is None:
+        user = db.session.get(User, user_id)
+        if not user:
+            return None
+        snapshot = user.to_dict()
+        _cache.set(user_id, snapshot, ttl=current_app.config['USER_CACHE_TTL'])
+    return snapshot
+
+
+def invalidate_user(user_id):
+    _cache.invalidate(int(user_id))
+
+
+def token_claims(user):
+    """Claims embedded in access tokens for clients; authorization reads the user snapshot."""
+    return {'role': user.role, 'is_active': user.is_active}
@@ -0,0 +1,135 @@
+from datetime import date, timedelta
+from flask import current_app
+from sqlalchemy import func, select, update, insert
+from sqlalchemy.exc import IntegrityError
+from app import db
+from app.models.visit import Visit
+from app.models.visit_capacity import VisitCapacity
+from app.utils.counters import upsert_insert
+
+# Visit slots per home and day. A visit holds a slot while it is pending or
+# confirmed. Reserving is a single conditional UPDATE (reserved < capacity),
+# so two people booking the last slot at once cannot both get it: the second
+# UPDATE waits on the row lock, re-checks the condition and matches nothing.
+
+HOLDING_STATUSES = ('pending', 'confirmed')
+
+
+def default_capacity():
+    return current_app.config['VISIT_DAILY_CAPACITY']
+
+
+def _ensure_row(home_id, visit_date):
+    table = VisitCapacity.__table__
+    values = {'home_id': home_id, 'visit_date': visit_date, 'capacity': default_capacity(), 'reserved': 0}
+    dialect_insert = upsert_insert(db.engine.dialect.name)
+
+    if dialect_insert:
+        db.session.execute(dialect_insert(table).values(values).on_conflict_do_nothing(
+            index_elements=['home_id', 'visit_date']
+        ))
+        return
+
+    if db.session.get(VisitCapacity, (home_id, visit_date)) is None:
+        try:
+            with db.session.begin_nested():
+                db.session.execute(insert(table).values(values))
+        except IntegrityError:
+            pass
+
+
+def reserve_slot(home_id, visit_date):
+    """Take one slot on `visit_date`. Returns False when the day is full."""
+    _ensure_row(home_id, visit_date)
+    result = db.session.execute(
+        update(VisitCapacity.__table__).where(
+            VisitCapacity.home_id == home_id,
+            VisitCapacity.visit_date == visit_date,
+            VisitCapacity.reserved < VisitCapacity.capacity
+        ).values(reserved=VisitCapacity.reserved + 1)
+    )
+    return result.rowcount == 1
+
+
+def release_slot(home_id, visit_date):
+    db.session.execute(
+        update(VisitCapacity.__table__).where(
+            VisitCapacity.home_id == home_id,
+            VisitCapacity.visit_date == visit_date,
+            VisitCapacity.reserved > 0
+        ).values(reserved=VisitCapacity.reserved - 1)
+    )
+
+
+def move_reservation(home_id, old_date, old_status, new_date, new_status):
+    """Keep slots in step with a visit's date/status change. Returns False if the new day is full."""
+    was_holding = old_status in HOLDING_STATUSES
+    is_holding = new_status in HOLDING_STATUSES
+
+    if was_holding and is_holding and old_date == new_date:
+        return True
+    if is_holding and not reserve_slot(home_id, new_date):
+        return False
+    if was_holding:
+        release_slot(home_id, old_date)
+    return True
+
+
+def set_capacity(home_id, visit_date, capacity):
+    """Set a day's capacity. Returns False, changing nothing, if more slots are already reserved."""
+    _ensure_row(home_id, visit_date)
+    result = db.session.execute(
+        update(VisitCapacity.__table__).where(
+            VisitCapacity.home_id == home_id,
+            VisitCapacity.visit_date == visit_date,
+            VisitCapacity.reserved <= capacity
+        ).values(capacity=capacity)
+    )
+    return result.rowcount == 1
+
+
+def available_dates(home_id, start_date, end_date):
+    """Open days between two dates (Sundays excluded), from one range read."""
+    rows = db.session.execute(
+        select(VisitCapacity.visit_date, VisitCapacity.capacity, VisitCapacity.reserved).where(
+            VisitCapacity.home_id == home_id,
+            VisitCapacity.visit_date >= start_date,
+            VisitCapacity.visit_date <= end_date
+        )
+    ).all()
+    booked = {row.visit_date: row.capacity - row.reserved for row in rows}
+    capacity = default_capacity()
+
+    dates = []
+    current_date = start_date
+    while current_date <= end_date:
+        if current_date.weekday() != 6:
+            slots = booked.get(current_date, capacity)
+            if slots > 0:
+                dates.append({'date': current_date.isoformat(), 'available_slots': slots})
+        current_date += timedelta(days=1)
+    return dates
+
+
+def rebuild_reservations():
+    """Recount reserved slots for today onwards from the visits table."""
+    today = date.today()
+    held = db.session.execute(
+        select(Visit.home_id, Visit.visit_date, func.count(Visit.id)).where(
+            Visit.visit_date >= today,
+            Visit.status.in_(HOLDING_STATUSES)
+        ).group_by(Visit.home_id, Visit.visit_date)
+    ).all()
+
+    db.session.execute(
+        update(VisitCapacity.__table__).where(VisitCapacity.visit_date >= today).values(reserved=0)
+    )
+    for home_id, visit_date, count in held:
+        _ensure_row(home_id, visit_date)
+        db.session.execute(
+            update(VisitCapacity.__table__).where(
+                VisitCapacity.home_id == home_id,
+                VisitCapacity.visit_date == visit_date
+            ).values(reserved=count)
+        )
+    db.session.commit()
@@ -0,0 +1,103 @@
+import zlib
+from flask import current_app, request
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Response compression negotiated from Accept-Encoding. Responses whose
+# mimetype is in COMPRESSION_MIMETYPES are compressed with brotli (when the
+# brotli package is installed) or gzip. Buffered bodies smaller than
+# COMPRESSION_MIN_SIZE are sent as they are; streamed bodies are compressed
+# chunk by chunk and flushed after every chunk so clients still receive
+# rows as they are produced.
+
+
+class GzipEncoder:
+
+    def __init__(self, level):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def process(self, data):
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        return self._compressor.flush()
+
+
+class BrotliEncoder:
+
+    def __init__(self, quality):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def process(self, data):
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self):
+        return self._compressor.finish()
+
+
+def available_encodings():
+    return ('br', 'gzip') if brotli is not None else ('gzip',)
+
+
+def compress(data, encoding, level):
+    if encoding == 'br':
+        return brotli.compress(data, quality=level)
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    return compressor.compress(data) + compressor.flush()
+
+
+def _compress_stream(chunks, encoder):
+    try:
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode('utf-8')
+            data = encoder.process(chunk)
+            if data:
+                yield data
+        yield encoder.finish()
+    finally:
+        if hasattr(chunks, 'close'):
+            chunks.close()
+
+
+class Compression:
+
+    def init_app(self, app):
+        app.after_request(self.after_request)
+
+    def _level(self, config, encoding):
+        return config['COMPRESSION_BROTLI_QUALITY'] if encoding == 'br' else config['COMPRESSION_GZIP_LEVEL']
+
+    def after_request(self, response):
+        config = current_app.config
+
+        if (response.mimetype not in config['COMPRESSION_MIMETYPES']
+                or response.status_code < 200 or response.status_code in (204, 304)
+                or 'Content-Encoding' in response.headers
+                or response.direct_passthrough):
+            return response
+
+        response.vary.add('Accept-Encoding')
+        encoding = request.accept_encodings.best_match(available_encodings())
+        if not encoding:
+            return response
+        level = self._level(config, encoding)
+
+        if response.is_streamed:
+            encoder = BrotliEncoder(level) if encoding == 'br' else GzipEncoder(level)
+            response.response = _compress_stream(response.response, encoder)
+            response.headers.pop('Content-Length', None)
+        else:
+            data = response.get_data()
+            if len(data) < config['COMPRESSION_MIN_SIZE']:
+                return response
+            response.set_data(compress(data, encoding, level))
+
+        response.headers['Content-Encoding'] = encoding
+        return response
+
+
+compression = Compression()
@@ -0,0 +1,67 @@
+from datetime import datetime
+from sqlalchemy import event, insert, literal, update
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+# Atomic "add to a counter row" used by the denormalized summary tables.
+# Mapper events call this from inside a flush with the flush's connection, so
+# the counters commit or roll back together with the row that changed them.
+
+_upserts = {
+    'postgresql': postgresql_insert,
+    'sqlite': sqlite_insert
+}
+
+
+def _old_value_loaded(target, value, oldvalue, initiator):
+    pass
+
+
+def track_previous_values(*attributes):
+    """Load the old value of each attribute before it is changed.
+
+    after_update listeners read the previous value from the attribute history,
+    which is empty when the attribute was expired (e.g. after a commit) and set
+    without being read first.
+    """
+    for attribute in attributes:
+        event.listen(attribute, 'set', _old_value_loaded, active_history=True)
+
+
+def upsert_insert(dialect_name):
+    """The dialect's INSERT ... ON CONFLICT construct, or None if it has none."""
+    return _upserts.get(dialect_name)
+
+
+def apply_counter_deltas(connection, table, key, deltas, derived=None):
+    """Add `deltas` to the row of `table` matching `key`, creating it if missing.
+
+    `derived` maps extra column names to functions that build their value from
+    the post-update counters, e.g. an average from a sum and a count.
+    """
+    derived = derived or {}
+    now = datetime.utcnow()
+    dialect_insert = upsert_insert(connection.dialect.name)
+
+    if dialect_insert:
+        statement = dialect_insert(table)
+        updated = lambda column: table.c[column] + statement.excluded[column]
+        inserted = lambda column: literal(deltas.get(column, 0))
+        values = dict(key, updated_at=now, **deltas)
+        values.update({column: build(inserted) for column, build in derived.items()})
+        set_ = {column: updated(column) for column in deltas}
+        set_.update({column: build(updated) for column, build in derived.items()})
+        set_['updated_at'] = now
+        connection.execute(statement.values(values).on_conflict_do_update(index_elements=list(key), set_=set_))
+        return
+
+    updated = lambda column: table.c[column] + deltas.get(column, 0)
+    set_ = {column: updated(column) for column in deltas}
+    set_.update({column: build(updated) for column, build in derived.items()})
+    condition = [table.c[column] == value for column, value in key.items()]
+    result = connection.execute(update(table).where(*condition).values(updated_at=now, **set_))
+    if result.rowcount == 0:
+        inserted = lambda column: literal(deltas.get(column, 0))
+        values = dict(key, updated_at=now, **deltas)
+        values.update({column: build(inserted) for column, build in derived.items()})
+        connection.execute(insert(table).values(values))
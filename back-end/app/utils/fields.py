@@ -0,0 +1,23 @@
+from flask import request
+
+# Sparse fieldsets: `?fields=id,name,location` limits a serialized resource to
+# the listed fields. Endpoints that support it also select only the columns
+# behind those fields (see load_for_fields in app.utils.serialization).
+
+
+class InvalidFields(ValueError):
+    pass
+
+
+def requested_fields(allowed):
+    """The `fields` requested for this request in `allowed` order, or None for all."""
+    raw = request.args.get('fields')
+    if not raw:
+        return None
+    names = {name.strip() for name in raw.split(',') if name.strip()}
+    if not names:
+        return None
+    unknown = names.difference(allowed)
+    if unknown:
+        raise InvalidFields(f'Unknown fields: {", ".join(sorted(unknown))}')
+    return [name for name in allowed if name in names]
@@ -0,0 +1,126 @@
+import base64
+import json
+from datetime import date, datetime
+from flask import request, current_app
+from sqlalchemy import tuple_
+
+# Shared pagination for list endpoints.
+#
+# By default lists use page/per_page (OFFSET + COUNT) and keep the existing
+# `pagination` envelope. Sending `cursor=` (empty for the first page) switches
+# to keyset pagination: the query seeks past the last row seen on its sort
+# keys, so deep pages cost the same as the first and no COUNT is issued.
+# Every list is ordered newest first, so sort keys are applied descending and
+# must end with a unique column (normally the primary key).
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def get_per_page(default=10):
+    per_page = request.args.get('per_page', default, type=int)
+    return max(1, min(per_page, current_app.config['MAX_PER_PAGE']))
+
+
+def _encode_value(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def _decode_value(column, value):
+    python_type = column.type.python_type
+    if python_type in (datetime, date):
+        return python_type.fromisoformat(value)
+    return python_type(value)
+
+
+def encode_cursor(item, sort_keys, direction):
+    payload = {'d': direction, 'k': [_encode_value(getattr(item, column.key)) for column in sort_keys]}
+    raw = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor, sort_keys):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        if payload['d'] not in ('next', 'prev') or len(payload['k']) != len(sort_keys):
+            raise ValueError
+        values = [_decode_value(column, value) for column, value in zip(sort_keys, payload['k'])]
+    except (ValueError, TypeError, KeyError):
+        raise InvalidCursor('Invalid cursor')
+    return payload['d'], values
+
+
+def _capped_page(query, page, per_page, max_results):
+    # Neither the page nor the count reads past the first `max_results` rows.
+    offset = (page - 1) * per_page
+    limit = min(per_page, max_results - offset)
+    items = query.limit(limit).offset(offset).all() if limit > 0 else []
+    total = query.order_by(None).limit(max_results).count()
+    pages = -(-total // per_page)
+    return items, {
+        'page': page,
+        'per_page': per_page,
+        'total': total,
+        'pages': pages,
+        'has_prev': page > 1,
+        'has_next': page < pages
+    }
+
+
+def paginate(query, sort_keys=None, default_per_page=10, max_results=None):
+    """Return (items, pagination) for the current request.
+
+    `sort_keys` are the columns the list is ordered by. Pass None for queries
+    that are already ordered (e.g. by search rank); those only support pages.
+    `max_results` caps how many rows the list can reach in page mode.
+    """
+    per_page = get_per_page(default_per_page)
+    cursor = request.args.get('cursor')
+
+    if cursor is None:
+        page = request.args.get('page', 1, type=int)
+        if sort_keys:
+            query = query.order_by(*[column.desc() for column in sort_keys])
+        if max_results is not None:
+            return _capped_page(query, max(page, 1), per_page, max_results)
+        pagination = query.paginate(page=page, per_page=per_page, error_out=False)
+        return pagination.items, {
+            'page': page,
+            'per_page': per_page,
+            'total': pagination.total,
+            'pages': pagination.pages,
+            'has_prev': pagination.has_prev,
+            'has_next': pagination.has_next
+        }
+
+    if not sort_keys:
+        raise InvalidCursor('Cursor pagination is not supported for this list')
+
+    direction, values = decode_cursor(cursor, sort_keys) if cursor else ('next', None)
+    forward = direction == 'next'
+
+    if values is not None:
+        keys, bound = tuple_(*sort_keys), tuple_(*values)
+        query = query.filter(keys < bound if forward else keys > bound)
+
+    ordering = [column.desc() if forward else column.asc() for column in sort_keys]
+    items = query.order_by(*ordering).limit(per_page + 1).all()
+    has_more = len(items) > per_page
+    items = items[:per_page]
+    if not forward:
+        items.reverse()
+
+    has_next = has_more if forward else True
+    has_prev = values is not None if forward else has_more
+
+    return items, {
+        'per_page': per_page,
+        'next_cursor': encode_cursor(items[-1], sort_keys, 'next') if items and has_next else None,
+        'prev_cursor': encode_cursor(items[0], sort_keys, 'prev') if items and has_prev else None,
+        'has_prev': has_prev,
+        'has_next': has_next
+    }
@@ -0,0 +1,36 @@
+from sqlalchemy.orm import joinedload, selectinload, load_only
+
+# Model to_dict() methods read relationships (donor, reviewer, visitor, home,
+# and the review/donation/visit collections on a home). Left lazy, each row on
+# a page costs extra SELECTs. List endpoints declare the relationships their
+# serializer reads and load them for the whole page up front: many-to-one
+# relationships are joined into the main query, collections are fetched with
+# one extra IN query each.
+
+
+def load_for_serialization(query, *relationships):
+    options = []
+    for relationship in relationships:
+        if relationship.property.uselist:
+            options.append(selectinload(relationship))
+        else:
+            options.append(joinedload(relationship))
+    return query.options(*options)
+
+
+
+def load_for_fields(query, model, fields, *always):
+    """Load what `model.to_dict(fields)` reads and, for sparse fieldsets, nothing else.
+
+    `fields` of None means every serialized field. Otherwise only the
+    requested columns (plus `always`, e.g. pagination sort keys) are selected
+    and only the summary relationships behind requested derived fields are
+    joined.
+    """
+    names = model.SERIALIZED_FIELDS if fields is None else fields
+    relationships = sorted({model.DERIVED_FIELDS[name][0] for name in names if name in model.DERIVED_FIELDS})
+    query = load_for_serialization(query, *[getattr(model, relationship) for relationship in relationships])
+    if fields is not None:
+        columns = [getattr(model, name) for name in fields if name not in model.DERIVED_FIELDS]
+        query = query.options(load_only(*[getattr(model, column.key) for column in model.__mapper__.primary_key], *columns, *always))
+    return query
@@ -0,0 +1,127 @@
+import json
+import logging
+import re
+import time
+from collections import Counter
+from flask import current_app, g, has_request_context, request
+from sqlalchemy import event
+
+# Per-request SQL instrumentation, enabled with SQL_INSTRUMENTATION=true.
+# Cursor events on every engine count the statements a request runs, their
+# total time and the slowest one. The totals go into one JSON log line per
+# request at SQL_LOG_LEVEL (INFO by default), and into a Server-Timing header
+# (db, db-slowest and app, the time spent outside the database) only when
+# SQL_SERVER_TIMING=true, since timings tell any client how hard an endpoint
+# is on the database. A request that runs the same statement shape more than
+# SQL_N_PLUS_ONE_THRESHOLD times, as a lazy load inside to_dict() does, is
+# logged as a likely N+1 at WARNING. Statements run after the response has
+# been handed over, by streamed bodies or background jobs, are not counted.
+
+_PLACEHOLDER_LIST = re.compile(r'\((?:\s*(?:\?|%s|%\(\w+\)s|:\w+)\s*,)+\s*(?:\?|%s|%\(\w+\)s|:\w+)\s*\)')
+_WHITESPACE = re.compile(r'\s+')
+MAX_STATEMENT_CHARS = 500
+
+
+def statement_shape(statement):
+    """`statement` with whitespace collapsed and placeholder lists, e.g. expanded IN, folded to one."""
+    return _PLACEHOLDER_LIST.sub('(?)', _WHITESPACE.sub(' ', statement).strip())
+
+
+class RequestStats:
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db_time = 0
+        self.slowest_time = 0
+        self.slowest_statement = None
+        self.shapes = Counter()
+
+    def record(self, statement, elapsed):
+        shape = statement_shape(statement)
+        self.queries += 1
+        self.db_time += elapsed
+        self.shapes[shape] += 1
+        if elapsed > self.slowest_time:
+            self.slowest_time = elapsed
+            self.slowest_statement = shape
+
+    def repeated(self, threshold):
+        return [(shape, count) for shape, count in self.shapes.most_common() if count > threshold]
+
+
+def _current_stats():
+    return g.get('sql_stats') if has_request_context() else None
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._sql_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current_stats()
+    started = getattr(context, '_sql_started', None)
+    if stats is not None and started is not None:
+        stats.record(statement, time.perf_counter() - started)
+
+
+class SQLInstrumentation:
+
+    def init_app(self, app):
+        from app import db
+
+        if not isinstance(logging.getLevelName(app.config['SQL_LOG_LEVEL']), int):
+            raise ValueError(f'Invalid SQL_LOG_LEVEL {app.config["SQL_LOG_LEVEL"]!r}, use a logging level name')
+        with app.app_context():
+            for engine in db.engines.values():
+                event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+                event.listen(engine, 'after_cursor_execute', _after_cursor_execute)
+        app.before_request(self.before_request)
+        app.after_request(self.after_request)
+
+    def before_request(self):
+        g.sql_stats = RequestStats()
+
+    def after_request(self, response):
+        stats = g.pop('sql_stats', None)
+        if stats is None:
+            return response
+
+        total_ms = (time.perf_counter() - stats.started) * 1000
+        db_ms = stats.db_time * 1000
+        slowest_ms = stats.slowest_time * 1000
+        if current_app.config['SQL_SERVER_TIMING']:
+            response.headers['Server-Timing'] = ', '.join([
+                f'db;dur={db_ms:.2f};desc="{stats.queries} queries"',
+                f'db-slowest;dur={slowest_ms:.2f}',
+                f'app;dur={max(total_ms - db_ms, 0):.2f}'
+            ])
+
+        entry = {
+            'event': 'request_sql',
+            'method': request.method,
+            'path': request.path,
+            'endpoint': request.endpoint,
+            'status': response.status_code,
+            'queries': stats.queries,
+            'db_ms': round(db_ms, 2),
+            'total_ms': round(total_ms, 2),
+            'slowest_ms': round(slowest_ms, 2),
+            'slowest_statement': stats.slowest_statement[:MAX_STATEMENT_CHARS] if stats.slowest_statement else None
+        }
+        current_app.logger.log(logging.getLevelName(current_app.config['SQL_LOG_LEVEL']), json.dumps(entry))
+
+        for shape, count in stats.repeated(current_app.config['SQL_N_PLUS_ONE_THRESHOLD']):
+            current_app.logger.warning(json.dumps({
+                'event': 'sql_n_plus_one',
+                'method': entry['method'],
+                'path': entry['path'],
+                'endpoint': entry['endpoint'],
+                'count': count,
+                'statement': shape[:MAX_STATEMENT_CHARS]
+            }))
+        return response
+
+
+sql_instrumentation = SQLInstrumentation()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+CPU cost of response compression against bytes saved.
+
+Builds real response bodies from a throwaway SQLite database (a page of
+homes as one JSON document, and the same homes as NDJSON compressed row by
+row the way streamed responses are) and compresses them with each encoding
+and level, printing CPU milliseconds per response, compressed size and
+compression ratio. brotli rows are skipped when the package is missing.
+
+    python benchmarks/compression.py --homes 500 --rounds 20
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from json_throughput import seed_homes
+
+
+def cpu_ms(function, rounds):
+    started = time.process_time()
+    for _ in range(rounds):
+        result = function()
+    return (time.process_time() - started) * 1000 / rounds, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--homes', type=int, default=500)
+    parser.add_argument('--rounds', type=int, default=20)
+    parser.add_argument('--gzip-levels', type=int, nargs='+', default=[1, 6, 9])
+    parser.add_argument('--brotli-qualities', type=int, nargs='+', default=[1, 4, 8, 11])
+    args = parser.parse_args()
+
+    database = tempfile.NamedTemporaryFile(suffix='.db', delete=False)
+    database.close()
+    os.environ['DATABASE_URL'] = f'sqlite:///{database.name}'
+    os.environ['RESPONSE_CACHE_BACKEND'] = 'none'
+    os.environ['COMPRESSION_ENABLED'] = 'false'
+    os.environ['MAX_PER_PAGE'] = str(args.homes)
+
+    from app import create_app, db
+    from app.models.childrens_home import ChildrensHome
+    from app.utils.compression import BrotliEncoder, GzipEncoder, available_encodings, compress
+
+    app = create_app('production')
+    try:
+        with app.app_context():
+            db.create_all()
+            seed_homes(db, args.homes)
+            rows = [app.json.dumps(home.to_dict()).encode('utf-8') + b'\n' for home in ChildrensHome.query.all()]
+        document = app.test_client().get(f'/api/homes/?per_page={args.homes}').data
+
+        levels = [('gzip', level) for level in args.gzip_levels]
+        if 'br' in available_encodings():
+            levels += [('br', quality) for quality in args.brotli_qualities]
+
+        print(f'{"body":<10} {"encoding":<6} {"level":>5} {"CPU ms":>8} {"bytes":>9} {"ratio":>6}')
+        print(f'{"json":<10} {"none":<6} {"-":>5} {0:>8.2f} {len(document):>9} {1:>6.2f}')
+        for encoding, level in levels:
+            elapsed, body = cpu_ms(lambda: compress(document, encoding, level), args.rounds)
+            print(f'{"json":<10} {encoding:<6} {level:>5} {elapsed:>8.2f} {len(body):>9} {len(document) / len(body):>6.2f}')
+
+        stream_size = sum(len(row) for row in rows)
+        print(f'{"ndjson":<10} {"none":<6} {"-":>5} {0:>8.2f} {stream_size:>9} {1:>6.2f}')
+        for encoding, level in levels:
+            def stream():
+                encoder = BrotliEncoder(level) if encoding == 'br' else GzipEncoder(level)
+                return sum(len(encoder.process(row)) for row in rows) + len(encoder.finish())
+            elapsed, size = cpu_ms(stream, args.rounds)
+            print(f'{"ndjson":<10} {encoding:<6} {level:>5} {elapsed:>8.2f} {size:>9} {stream_size / size:>6.2f}')
+    finally:
+        os.unlink(database.name)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,353 @@
+#!/usr/bin/env python3
+"""
+Endpoint benchmark suite with regression tracking.
+
+Seeds a throwaway SQLite database with synthetic data at each requested
+scale (see app/services/synthetic_data.py) and drives every blueprint -
+auth, homes, donations, reviews, visits and admin - through the Flask test
+client. For each endpoint it records latency percentiles, SQL statements per
+request and peak Python allocations per request (tracemalloc).
+
+Results are compared with the baselines for the scale and the script exits
+with status 1 when an endpoint regressed: more SQL statements than the
+baseline, or p50 latency or peak allocations above the baseline by more than
+--threshold (plus a small absolute allowance for noise). SQL statement counts
+do not depend on the machine and are committed in benchmarks/query_counts/;
+latency and allocation baselines are machine specific and kept locally in
+benchmarks/baselines/, so record them on the machine that compares against
+them. Use --save to write both.
+
+    python benchmarks/endpoints.py --scales small medium
+    python benchmarks/endpoints.py --scales small --save
+"""
+
+import argparse
+import itertools
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+BASELINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines')
+QUERY_COUNT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'query_counts')
+
+SCALES = {
+    'small': {'homes': 100, 'users': 1000, 'donations': 10000},
+    'medium': {'homes': 1000, 'users': 10000, 'donations': 100000},
+    'large': {'homes': 10000, 'users': 100000, 'donations': 1000000}
+}
+
+# Absolute allowances so that sub-millisecond endpoints do not flap.
+MIN_LATENCY_SLACK_MS = 2.0
+MIN_ALLOCATION_SLACK_KIB = 64
+
+
+def _visit_slots(home_ids):
+    """(date, home_id) pairs past the synthetic visits, skipping Sundays."""
+    day = date.today() + timedelta(days=90)
+    while True:
+        if day.weekday() != 6:
+            for home_id in home_ids:
+                yield day, home_id
+        day += timedelta(days=1)
+
+
+def endpoints(fixture):
+    """(name, method, path, auth, body) per endpoint; auth is None, 'user' or 'admin'.
+
+    `body` may be a callable returning a fresh payload for every request.
+    """
+    home_id = fixture['home_id']
+    counter = itertools.count()
+    visit_slots = _visit_slots(fixture['home_ids'])
+
+    def visit_body():
+        visit_date, visit_home_id = next(visit_slots)
+        return {'home_id': visit_home_id, 'visit_date': visit_date.isoformat(), 'visit_time': '10:00'}
+
+    return [
+        ('auth.register', 'POST', '/api/auth/register', None, lambda: {
+            'username': f'bench{next(counter)}', 'email': f'bench{next(counter)}@example.com',
+            'password': 'password123', 'first_name': 'Bench', 'last_name': 'User'
+        }),
+        ('auth.login', 'POST', '/api/auth/login', None, {'username': fixture['username'], 'password': 'password123'}),
+        ('auth.profile', 'GET', '/api/auth/profile', 'user', None),
+        ('auth.update_profile', 'PUT', '/api/auth/profile', 'user', {'first_name': 'Bench'}),
+
+        ('homes.list', 'GET', '/api/homes/', None, None),
+        ('homes.list_cursor', 'GET', '/api/homes/?cursor=&per_page=50', None, None),
+        ('homes.list_fields', 'GET', '/api/homes/?per_page=100&fields=id,name,location', None, None),
+        ('homes.detail', 'GET', f'/api/homes/{home_id}', None, None),
+        ('homes.search', 'GET', '/api/homes/search?q=hope', None, None),
+        ('homes.search_location', 'GET', '/api/homes/search?location=Nairobi', None, None),
+        ('homes.locations', 'GET', '/api/homes/locations', None, None),
+        ('homes.reviews', 'GET', f'/api/homes/{home_id}/reviews', None, None),
+
+        ('donations.create', 'POST', '/api/donations/', 'user', {'home_id': home_id, 'amount': 25}),
+        ('donations.create_multiple', 'POST', '/api/donations/multiple', 'user', {
+            'donations': [{'home_id': other, 'amount': 10} for other in fixture['home_ids'][:20]]
+        }),
+        ('donations.mine', 'GET', '/api/donations/my-donations', 'user', None),
+        ('donations.detail', 'GET', f'/api/donations/{fixture["donation_id"]}', 'user', None),
+        ('donations.update_status', 'PUT', f'/api/donations/{fixture["donation_id"]}/status', 'user', {'status': 'completed'}),
+        ('donations.stats', 'GET', '/api/donations/stats', 'user', None),
+
+        ('reviews.mine', 'GET', '/api/reviews/my-reviews', 'user', None),
+        ('reviews.home', 'GET', f'/api/reviews/home/{home_id}', None, None),
+        ('reviews.detail', 'GET', f'/api/reviews/{fixture["review_id"]}', 'user', None),
+        ('reviews.update', 'PUT', f'/api/reviews/{fixture["review_id"]}', 'user', {'rating': 4}),
+
+        ('visits.schedule', 'POST', '/api/visits/', 'user', visit_body),
+        ('visits.mine', 'GET', '/api/visits/my-visits', 'user', None),
+        ('visits.detail', 'GET', f'/api/visits/{fixture["visit_id"]}', 'user', None),
+        ('visits.available_dates', 'GET', f'/api/visits/available-dates/{home_id}', None, None),
+
+        ('admin.users', 'GET', '/api/admin/users', 'admin', None),
+        ('admin.homes', 'GET', '/api/admin/homes', 'admin', None),
+        ('admin.homes_search', 'GET', '/api/admin/homes?search=grace', 'admin', None),
+        ('admin.update_home', 'PUT', f'/api/admin/homes/{home_id}', 'admin', {'needs_description': 'Books and food.'}),
+        ('admin.visit_capacity', 'PUT', f'/api/admin/homes/{home_id}/visit-capacity', 'admin', {
+            'visit_date': (date.today() + timedelta(days=400)).isoformat(), 'capacity': 5
+        }),
+        ('admin.analytics_overview', 'GET', '/api/admin/analytics/overview', 'admin', None),
+        ('admin.analytics_homes', 'GET', '/api/admin/analytics/homes', 'admin', None),
+        ('admin.visits', 'GET', '/api/admin/visits', 'admin', None),
+        ('admin.export_donations', 'GET', f'/api/admin/exports/donations?home_id={home_id}', 'admin', None),
+        ('admin.cache_stats', 'GET', '/api/admin/cache/stats', 'admin', None)
+    ]
+
+
+def seed(app, scale):
+    from sqlalchemy import func, select
+    from app import db
+    from app.models.childrens_home import ChildrensHome
+    from app.models.donation import Donation
+    from app.models.home_stats import HomeStats
+    from app.models.rating_summary import HomeRatingSummary
+    from app.models.review import Review
+    from app.models.user import User
+    from app.models.visit import Visit
+    from app.services.analytics import invalidate_overview
+    from app.services.home_registry import registry
+    from app.services.search import create_search_index, rebuild_search_index
+    from app.services.synthetic_data import generate
+    from app.services.user_cache import _cache as user_cache
+    from app.services.visit_capacity import rebuild_reservations
+
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        create_search_index()
+
+        admin = User(username='admin', email='admin@example.com', first_name='Admin', last_name='User', role='admin')
+        admin.set_password('adminpass')
+        db.session.add(admin)
+        db.session.commit()
+
+        generate(log=lambda message: None, **SCALES[scale])
+        HomeStats.rebuild()
+        HomeRatingSummary.rebuild()
+        rebuild_reservations()
+        rebuild_search_index()
+        registry.invalidate()
+        user_cache.invalidate()
+        invalidate_overview()
+
+        # Benchmark as the heaviest donor with a review, against the most donated-to homes.
+        user_id = db.session.execute(
+            select(Donation.user_id).where(Donation.user_id.in_(select(Review.user_id)))
+            .group_by(Donation.user_id).order_by(func.count().desc(), Donation.user_id).limit(1)
+        ).scalar()
+        home_ids = db.session.execute(
+            select(HomeStats.home_id).join(ChildrensHome, ChildrensHome.id == HomeStats.home_id)
+            .where(ChildrensHome.is_active == True)
+            .order_by(HomeStats.donation_total.desc(), HomeStats.home_id).limit(50)
+        ).scalars().all()
+        return {
+            'username': db.session.get(User, user_id).username,
+            'home_id': home_ids[0],
+            'home_ids': home_ids,
+            'donation_id': db.session.execute(select(func.min(Donation.id)).where(Donation.user_id == user_id)).scalar(),
+            'review_id': db.session.execute(select(func.min(Review.id)).where(Review.user_id == user_id)).scalar(),
+            'visit_id': db.session.execute(select(func.min(Visit.id)).where(Visit.user_id == user_id)).scalar()
+        }
+
+
+def login(client, username, password):
+    response = client.post('/api/auth/login', json={'username': username, 'password': password})
+    assert response.status_code == 200, response.data
+    return {'Authorization': f'Bearer {response.get_json()["access_token"]}'}
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def measure(client, headers, statements, endpoint, requests, allocation_requests):
+    name, method, path, auth, body = endpoint
+
+    def call():
+        payload = body() if callable(body) else body
+        response = client.open(path, method=method, json=payload, headers=headers.get(auth, {}))
+        assert response.status_code < 400, f'{name}: {response.status_code} {response.data[:200]}'
+        return response
+
+    call()
+
+    latencies = []
+    queries = []
+    for _ in range(requests):
+        statements[0] = 0
+        started = time.perf_counter()
+        call()
+        latencies.append((time.perf_counter() - started) * 1000)
+        queries.append(statements[0])
+
+    peaks = []
+    tracemalloc.start()
+    try:
+        for _ in range(allocation_requests):
+            tracemalloc.reset_peak()
+            baseline, _ = tracemalloc.get_traced_memory()
+            call()
+            peaks.append((tracemalloc.get_traced_memory()[1] - baseline) / 1024)
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'p50_ms': round(statistics.median(latencies), 3),
+        'p95_ms': round(percentile(latencies, 0.95), 3),
+        'p99_ms': round(percentile(latencies, 0.99), 3),
+        'queries': int(statistics.median(queries)),
+        'peak_kib': round(statistics.median(peaks), 1)
+    }
+
+
+def _load(path):
+    if not os.path.exists(path):
+        return None
+    with open(path) as baseline:
+        return json.load(baseline)
+
+
+def _write(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as output:
+        json.dump(data, output, indent=2, sort_keys=True)
+        output.write('\n')
+    print(f'Baseline written to {path}')
+
+
+def query_regressions(results, query_counts):
+    found = []
+    for name, current in results.items():
+        previous = query_counts.get(name)
+        if previous is not None and current['queries'] > previous:
+            found.append(f'{name}: {current["queries"]} SQL statements, baseline {previous}')
+    return found
+
+
+def regressions(results, baseline, threshold):
+    found = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if not previous:
+            continue
+        latency_limit = max(previous['p50_ms'] * (1 + threshold), previous['p50_ms'] + MIN_LATENCY_SLACK_MS)
+        if current['p50_ms'] > latency_limit:
+            found.append(f'{name}: p50 {current["p50_ms"]:.2f} ms, baseline {previous["p50_ms"]:.2f} ms')
+        allocation_limit = max(previous['peak_kib'] * (1 + threshold), previous['peak_kib'] + MIN_ALLOCATION_SLACK_KIB)
+        if current['peak_kib'] > allocation_limit:
+            found.append(f'{name}: peak {current["peak_kib"]:.0f} KiB, baseline {previous["peak_kib"]:.0f} KiB')
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scales', nargs='+', choices=list(SCALES), default=['small'])
+    parser.add_argument('--requests', type=int, default=30)
+    parser.add_argument('--allocation-requests', type=int, default=5)
+    parser.add_argument('--threshold', type=float, default=0.5, help='Allowed relative slowdown (0.5 = 50%%).')
+    parser.add_argument('--only', nargs='+', help='Only endpoints whose name starts with one of these prefixes.')
+    parser.add_argument('--save', action='store_true', help='Write results as the new baselines.')
+    args = parser.parse_args()
+
+    database = tempfile.NamedTemporaryFile(suffix='.db', delete=False)
+    database.close()
+    os.environ.update({
+        'DATABASE_URL': f'sqlite:///{database.name}',
+        'PASSWORD_HASH_WORKERS': '0',
+        'BCRYPT_LOG_ROUNDS': '4',
+        'RESPONSE_CACHE_BACKEND': 'none',
+        'COMPRESSION_ENABLED': 'false'
+    })
+
+    from sqlalchemy import event
+    from app import create_app, db
+
+    app = create_app('production')
+    statements = [0]
+
+    with app.app_context():
+        @event.listens_for(db.engine, 'before_cursor_execute')
+        def count_statement(*args):
+            statements[0] += 1
+
+    failed = []
+    try:
+        for scale in args.scales:
+            print(f'Seeding {scale}: {SCALES[scale]}')
+            fixture = seed(app, scale)
+            client = app.test_client()
+            headers = {
+                'user': login(client, fixture['username'], 'password123'),
+                'admin': login(client, 'admin', 'adminpass')
+            }
+
+            results = {}
+            print(f'{"endpoint":<28} {"p50 ms":>8} {"p95 ms":>8} {"p99 ms":>8} {"SQL":>5} {"peak KiB":>9}')
+            for endpoint in endpoints(fixture):
+                if args.only and not endpoint[0].startswith(tuple(args.only)):
+                    continue
+                result = results[endpoint[0]] = measure(
+                    client, headers, statements, endpoint, args.requests, args.allocation_requests
+                )
+                print(f'{endpoint[0]:<28} {result["p50_ms"]:>8.2f} {result["p95_ms"]:>8.2f} '
+                      f'{result["p99_ms"]:>8.2f} {result["queries"]:>5} {result["peak_kib"]:>9.1f}')
+
+            query_path = os.path.join(QUERY_COUNT_DIR, f'{scale}.json')
+            path = os.path.join(BASELINE_DIR, f'{scale}.json')
+            if args.save:
+                query_counts = (_load(query_path) or {}).get('endpoints', {})
+                query_counts.update((name, result['queries']) for name, result in results.items())
+                _write(query_path, {'scale': SCALES[scale], 'endpoints': query_counts})
+                _write(path, {'scale': SCALES[scale], 'endpoints': results})
+                continue
+
+            query_counts = _load(query_path)
+            baseline = _load(path)
+            found = []
+            if query_counts:
+                found += query_regressions(results, query_counts['endpoints'])
+            if baseline:
+                found += regressions(results, baseline['endpoints'], args.threshold)
+            else:
+                print(f'No local latency baseline for {scale}; run with --save to record one.')
+            for message in found:
+                print(f'REGRESSION [{scale}] {message}')
+            failed += found
+    finally:
+        os.unlink(database.name)
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+JSON response throughput for a page of homes.
+
+Serves GET /api/homes/?per_page=500 through the Flask test client against a
+throwaway SQLite database with the stdlib encoder (the plain jsonify path),
+with the orjson provider, and with orjson plus a sparse fieldset, and prints
+response bytes/second and latency. The response cache is disabled so every
+request builds its body.
+
+    python benchmarks/json_throughput.py --homes 500 --requests 50
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def seed_homes(db, count):
+    from app.models.childrens_home import ChildrensHome
+
+    db.session.add_all([
+        ChildrensHome(
+            name=f'Benchmark Home {index}',
+            description='A home used to benchmark JSON encoding. ' * 4,
+            location=f'City {index % 25}',
+            address=f'{index} Benchmark Road',
+            phone_number='+254700000000',
+            email=f'home{index}@example.com',
+            capacity=50 + index % 50,
+            current_children_count=index % 50,
+            established_date=date(1990 + index % 30, 1 + index % 12, 1 + index % 28),
+            contact_person='Jane Doe',
+            website='https://example.com',
+            needs_description='Books, food, clothing and school fees.'
+        )
+        for index in range(count)
+    ])
+    db.session.commit()
+
+
+def measure(client, url, requests):
+    latencies = []
+    size = 0
+    for _ in range(requests):
+        started = time.perf_counter()
+        response = client.get(url)
+        latencies.append(time.perf_counter() - started)
+        assert response.status_code == 200, response.data
+        size += len(response.data)
+    return size, latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--homes', type=int, default=500)
+    parser.add_argument('--requests', type=int, default=50)
+    parser.add_argument('--fields', default='id,name,location')
+    args = parser.parse_args()
+
+    database = tempfile.NamedTemporaryFile(suffix='.db', delete=False)
+    database.close()
+    os.environ['DATABASE_URL'] = f'sqlite:///{database.name}'
+    os.environ['RESPONSE_CACHE_BACKEND'] = 'none'
+    os.environ['MAX_PER_PAGE'] = str(args.homes)
+
+    from flask.json.provider import DefaultJSONProvider
+    from app import create_app, db
+    from app.utils import json_provider
+
+    class StdlibJSONProvider(DefaultJSONProvider):
+        default = staticmethod(json_provider._default)
+        sort_keys = False
+
+    app = create_app('production')
+    with app.app_context():
+        db.create_all()
+        seed_homes(db, args.homes)
+
+    url = f'/api/homes/?per_page={args.homes}'
+    cases = (
+        ('jsonify (stdlib)', StdlibJSONProvider(app), url),
+        ('orjson', json_provider.JSONProvider(app), url),
+        (f'orjson fields={args.fields}', json_provider.JSONProvider(app), f'{url}&fields={args.fields}')
+    )
+
+    print(f'{"path":<40} {"bytes/req":>10} {"MB/s":>8} {"p50 ms":>8} {"p95 ms":>8}')
+    try:
+        for name, provider, case_url in cases:
+            app.json = provider
+            client = app.test_client()
+            measure(client, case_url, 3)
+            size, latencies = measure(client, case_url, args.requests)
+            ordered = sorted(latencies)
+            print(f'{name:<40} {size // args.requests:>10} {size / sum(latencies) / 1e6:>8.2f} '
+                  f'{statistics.median(latencies) * 1000:>8.1f} {ordered[int(len(ordered) * 0.95)] * 1000:>8.1f}')
+    finally:
+        os.unlink(database.name)
+
+
+if __name__ == '__main__':
+    main()
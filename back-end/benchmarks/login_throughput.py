@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Login throughput at different bcrypt cost factors.
+
+Drives POST /api/auth/login through the Flask test client from several
+threads against a throwaway SQLite database, once with hashing inline and
+once through the password hashing pool, and prints logins/second, latency
+percentiles and how many requests were shed with 503.
+
+    python benchmarks/login_throughput.py --costs 4 8 10 12 --logins 200 --threads 8
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def run_logins(client, username, password, logins, threads):
+    latencies = []
+    statuses = []
+    lock = threading.Lock()
+    per_thread = logins // threads
+
+    def worker():
+        for _ in range(per_thread):
+            started = time.perf_counter()
+            response = client.post('/api/auth/login', json={'username': username, 'password': password})
+            elapsed = time.perf_counter() - started
+            with lock:
+                latencies.append(elapsed)
+                statuses.append(response.status_code)
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    started = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    return time.perf_counter() - started, latencies, statuses
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--costs', type=int, nargs='+', default=[4, 8, 10, 12])
+    parser.add_argument('--logins', type=int, default=200)
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 2)
+    args = parser.parse_args()
+
+    database = tempfile.NamedTemporaryFile(suffix='.db', delete=False)
+    database.close()
+    os.environ['DATABASE_URL'] = f'sqlite:///{database.name}'
+
+    from app import create_app, db
+    from app.models.user import User
+    from app.services.passwords import shutdown_pool
+
+    app = create_app('development')
+    app.config['PASSWORD_HASH_MAX_PENDING'] = args.threads * 2
+
+    with app.app_context():
+        db.create_all()
+
+    print(f'{"mode":<8} {"cost":>4} {"logins/s":>10} {"p50 ms":>9} {"p95 ms":>9} {"503s":>6}')
+    try:
+        for mode, workers in (('inline', 0), ('pool', args.workers)):
+            app.config['PASSWORD_HASH_WORKERS'] = workers
+            for cost in args.costs:
+                app.config['BCRYPT_LOG_ROUNDS'] = cost
+                username = f'bench_{mode}_{cost}'
+                with app.app_context():
+                    user = User(username=username, email=f'{username}@example.com', first_name='Bench', last_name='User')
+                    user.set_password('benchmark-password')
+                    db.session.add(user)
+                    db.session.commit()
+
+                client = app.test_client()
+                elapsed, latencies, statuses = run_logins(client, username, 'benchmark-password', args.logins, args.threads)
+                ok = statuses.count(200)
+                print(f'{mode:<8} {cost:>4} {ok / elapsed:>10.1f} '
+                      f'{statistics.median(latencies) * 1000:>9.1f} {percentile(latencies, 0.95) * 1000:>9.1f} '
+                      f'{statuses.count(503):>6}')
+            shutdown_pool()
+    finally:
+        os.unlink(database.name)
+
+
+if __name__ == '__main__':
+    main()
@@ -9,6 +9,48 @@ class Config:
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     JWT_SECRET_KEY = os.environ.get('JWT_SECRET_KEY') or 'dev-secret-key'
     JWT_ACCESS_TOKEN_EXPIRES = False  
+    MAX_PER_PAGE = int(os.environ.get('MAX_PER_PAGE', 100))
+    ANALYTICS_CACHE_TTL = int(os.environ.get('ANALYTICS_CACHE_TTL', 30))
+    VISIT_DAILY_CAPACITY = int(os.environ.get('VISIT_DAILY_CAPACITY', 3))
+    MAX_DONATIONS_PER_BATCH = int(os.environ.get('MAX_DONATIONS_PER_BATCH', 5000))
+    DONATION_BATCH_CHUNK_SIZE = int(os.environ.get('DONATION_BATCH_CHUNK_SIZE', 500))
+    USER_CACHE_TTL = int(os.environ.get('USER_CACHE_TTL', 60))
+    HOME_REGISTRY_TTL = int(os.environ.get('HOME_REGISTRY_TTL', 30))
+    BCRYPT_LOG_ROUNDS = int(os.environ.get('BCRYPT_LOG_ROUNDS', 12))
+    PASSWORD_HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS', 2))
+    PASSWORD_HASH_MAX_PENDING = int(os.environ.get('PASSWORD_HASH_MAX_PENDING', 16))
+    PASSWORD_HASH_TIMEOUT = float(os.environ.get('PASSWORD_HASH_TIMEOUT', 5))
+    RESPONSE_CACHE_BACKEND = os.environ.get('RESPONSE_CACHE_BACKEND', 'memory')
+    RESPONSE_CACHE_REDIS_URL = os.environ.get('RESPONSE_CACHE_REDIS_URL', 'redis://localhost:6379/0')
+    RESPONSE_CACHE_MAX_BYTES = int(os.environ.get('RESPONSE_CACHE_MAX_BYTES', 32 * 1024 * 1024))
+    RESPONSE_CACHE_TTL = int(os.environ.get('RESPONSE_CACHE_TTL', 60))
+    SEARCH_MAX_RESULTS = int(os.environ.get('SEARCH_MAX_RESULTS', 1000))
+    STREAM_BATCH_SIZE = int(os.environ.get('STREAM_BATCH_SIZE', 500))
+    EXPORT_JOB_WORKERS = int(os.environ.get('EXPORT_JOB_WORKERS', 2))
+    EXPORT_JOB_MAX_PENDING = int(os.environ.get('EXPORT_JOB_MAX_PENDING', 8))
+    EXPORT_JOB_DIR = os.environ.get('EXPORT_JOB_DIR')
+    EXPORT_JOB_RETENTION_HOURS = float(os.environ.get('EXPORT_JOB_RETENTION_HOURS', 24))
+    HOME_IMPORT_CHUNK_SIZE = int(os.environ.get('HOME_IMPORT_CHUNK_SIZE', 1000))
+    HOME_IMPORT_MAX_ERRORS = int(os.environ.get('HOME_IMPORT_MAX_ERRORS', 1000))
+    COMPRESSION_ENABLED = os.environ.get('COMPRESSION_ENABLED', 'true').lower() == 'true'
+    COMPRESSION_MIN_SIZE = int(os.environ.get('COMPRESSION_MIN_SIZE', 1024))
+    COMPRESSION_GZIP_LEVEL = int(os.environ.get('COMPRESSION_GZIP_LEVEL', 6))
+    COMPRESSION_BROTLI_QUALITY = int(os.environ.get('COMPRESSION_BROTLI_QUALITY', 4))
+    COMPRESSION_MIMETYPES = os.environ.get(
+        'COMPRESSION_MIMETYPES',
+        'application/json,application/x-ndjson,text/csv,text/plain,text/html'
+    ).split(',')
+    SQL_INSTRUMENTATION = os.environ.get('SQL_INSTRUMENTATION', 'false').lower() == 'true'
+    SQL_N_PLUS_ONE_THRESHOLD = int(os.environ.get('SQL_N_PLUS_ONE_THRESHOLD', 10))
+    SQL_LOG_LEVEL = os.environ.get('SQL_LOG_LEVEL', 'INFO').upper()
+    SQL_SERVER_TIMING = os.environ.get('SQL_SERVER_TIMING', 'false').lower() == 'true'
+    METRICS_ENABLED = os.environ.get('METRICS_ENABLED', 'false').lower() == 'true'
+    METRICS_TOKEN = os.environ.get('METRICS_TOKEN')
+    PROFILER_ENABLED = os.environ.get('PROFILER_ENABLED', 'false').lower() == 'true'
+    PROFILER_DIR = os.environ.get('PROFILER_DIR')
+    PROFILER_INTERVAL_MS = float(os.environ.get('PROFILER_INTERVAL_MS', 5))
+    PROFILER_MAX_PROFILES = int(os.environ.get('PROFILER_MAX_PROFILES', 100))
+    PROFILER_MAX_CAPTURE_SECONDS = int(os.environ.get('PROFILER_MAX_CAPTURE_SECONDS', 3600))
 
 class DevelopmentConfig(Config):
     DEBUG = True
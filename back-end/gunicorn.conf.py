@@ -0,0 +1,40 @@
+import os
+import shutil
+
+# gunicorn -c gunicorn.conf.py main:app
+#
+# Workers share Prometheus metrics through memory-mapped files in
+# PROMETHEUS_MULTIPROC_DIR, which is emptied when the server starts. Each
+# worker marks failed the export jobs left unfinished by a process that is
+# gone, and deletes expired export files, as it starts.
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:5000')
+workers = int(os.environ.get('GUNICORN_WORKERS', 4))
+threads = int(os.environ.get('GUNICORN_THREADS', 1))
+
+os.environ.setdefault('PROMETHEUS_MULTIPROC_DIR', '/tmp/childrens-home-metrics')
+
+
+def on_starting(server):
+    directory = os.environ['PROMETHEUS_MULTIPROC_DIR']
+    shutil.rmtree(directory, ignore_errors=True)
+    os.makedirs(directory)
+
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+    multiprocess.mark_process_dead(worker.pid)
+
+
+def post_worker_init(worker):
+    from app.services.export_jobs import fail_interrupted_jobs, prune_expired
+
+    with worker.wsgi.app_context():
+        try:
+            interrupted = fail_interrupted_jobs()
+            expired = prune_expired()
+        except Exception:
+            worker.log.exception('Could not clean up export jobs')
+            return
+    if interrupted or expired:
+        worker.log.info('Export jobs: %d interrupted marked failed, %d expired files deleted', interrupted, expired)
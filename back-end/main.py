@@ -1,21 +1,138 @@
 from app import create_app, db
+import click
 import os
 app = create_app(os.getenv('FLASK_ENV', 'development'))
 
 @app.cli.command()
 def init_db():
     """Initialize the database."""
+    from flask_migrate import stamp
+    from app.services.search import create_search_index
+    
     db.create_all()
+    create_search_index()
+    # create_all built the current schema, so mark every migration as applied.
+    stamp()
     print('Database initialized.')
 
 @app.cli.command()
-def seed_db():
-    """Seed the database with sample data."""
+def check_query_plans():
+    """EXPLAIN the hot queries and fail unless each uses its index."""
+    from app.services.query_plans import check_query_plans
+    
+    failed = 0
+    for result in check_query_plans():
+        if result['uses_index'] is None:
+            print(f'skipped  {result["query"]} (EXPLAIN is not supported on this database)')
+            continue
+        status = 'ok' if result['uses_index'] else 'MISSING'
+        print(f'{status:<8} {result["query"]} ({result["index"]})')
+        for line in result['plan']:
+            print(f'         {line}')
+        failed += not result['uses_index']
+    if failed:
+        raise click.ClickException(f'{failed} hot queries do not use their index')
+
+@app.cli.command()
+def reindex_search():
+    """Rebuild the full-text search index for children's homes."""
+    from app.services.search import create_search_index, rebuild_search_index
+    
+    create_search_index()
+    rebuild_search_index()
+    print('Search index rebuilt.')
+
+@app.cli.command()
+def rebuild_rating_summaries():
+    """Recompute per-home rating summaries from the reviews table."""
+    from app.models.rating_summary import HomeRatingSummary
+    
+    HomeRatingSummary.rebuild()
+    print('Rating summaries rebuilt.')
+
+@app.cli.command()
+def rebuild_home_stats():
+    """Recompute per-home visit and donation statistics."""
+    from app.models.home_stats import HomeStats
+    
+    HomeStats.rebuild()
+    print('Home statistics rebuilt.')
+
+@app.cli.command()
+def rebuild_visit_capacity():
+    """Recount reserved visit slots from scheduled visits."""
+    from app.services.visit_capacity import rebuild_reservations
+    
+    rebuild_reservations()
+    print('Visit capacity rebuilt.')
+
+@app.cli.command()
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--format', 'fmt', type=click.Choice(['csv', 'jsonl']), help='Defaults to the file extension.')
+def import_homes(path, fmt):
+    """Bulk import children's homes from a CSV or JSON Lines file."""
+    from app.services.home_import import ImportAborted, InvalidHome, import_homes
+    
+    fmt = fmt or ('jsonl' if path.endswith('.jsonl') else 'csv')
+    try:
+        with open(path, 'rb') as stream:
+            result = import_homes(stream, fmt)
+    except ImportAborted as e:
+        for error in e.result['errors']:
+            print(f'line {error["line"]}: {error["error"]}')
+        raise click.ClickException(str(e))
+    except InvalidHome as e:
+        raise click.ClickException(str(e))
+    
+    for error in result['errors']:
+        print(f'line {error["line"]}: {error["error"]}')
+    print(f'{result["imported"]} homes imported, {result["rejected"]} rejected.')
+
+def _count(ctx, param, value):
+    # Accept scientific notation such as 1e6 for row counts.
+    return None if value is None else int(value)
+
+@app.cli.command()
+@click.option('--homes', type=float, default=0, callback=_count, help='Synthetic homes to generate.')
+@click.option('--users', type=float, default=0, callback=_count, help='Synthetic users to generate.')
+@click.option('--donations', type=float, default=0, callback=_count, help='Synthetic donations to generate.')
+@click.option('--reviews', type=float, callback=_count, help='Synthetic reviews (default 4 per home).')
+@click.option('--visits', type=float, callback=_count, help='Synthetic visits (default 1 per 10 donations).')
+@click.option('--seed', type=int, default=42, help='Random seed; the same seed and scale give the same data.')
+@click.option('--as-of', type=click.DateTime(formats=['%Y-%m-%d']), help='Date the generated history ends (default today).')
+def seed_db(homes, users, donations, reviews, visits, seed, as_of):
+    """Seed the database with sample data, plus synthetic data at the given scale."""
+    from app.models.user import User
+    from app.models.home_stats import HomeStats
+    from app.models.rating_summary import HomeRatingSummary
+    from app.services.search import rebuild_search_index
+    from app.services.synthetic_data import generate
+    from app.services.visit_capacity import rebuild_reservations
+    
+    seeded = not User.query.filter_by(username='admin').first()
+    if seeded:
+        _seed_sample_data()
+    else:
+        print('Sample data already present, skipping it.')
+    
+    if homes or users or donations or reviews or visits:
+        generate(homes, users, donations, reviews, visits, seed=seed, as_of=as_of.date() if as_of else None)
+        print('Rebuilding summary tables and the search index...')
+        HomeStats.rebuild()
+        HomeRatingSummary.rebuild()
+        rebuild_reservations()
+    rebuild_search_index()
+    
+    if seeded:
+        print('Database seeded with sample data.')
+    print('Admin credentials: admin / adminpass')
+    print('User credentials: johnsmith / password123')
+
+def _seed_sample_data():
     from app.models.user import User
     from app.models.childrens_home import ChildrensHome
     from datetime import date
     
-    
     admin = User(
         username='admin',
         email='admin@example.com',
@@ -81,10 +198,6 @@ def seed_db():
     
     db.session.add_all([admin, user, home1, home2, home3])
     db.session.commit()
-    
-    print('Database seeded with sample data.')
-    print('Admin credentials: admin / adminpass')
-    print('User credentials: johnsmith / password123')
 
 if __name__ == '__main__':
     app.run(debug=True, host='0.0.0.0', port=5000)
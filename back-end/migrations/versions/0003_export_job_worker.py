@@ -0,0 +1,28 @@
+"""Export job worker
+
+Revision ID: 0003_export_job_worker
+Revises: 0002_hot_path_indexes
+Create Date: 2026-10-18 09:12:40.518204
+
+Records the host and pid of the process running each export job, so jobs
+left unfinished by a process that has gone can be marked failed.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0003_export_job_worker'
+down_revision = '0002_hot_path_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('export_jobs') as batch_op:
+        batch_op.add_column(sa.Column('worker', sa.String(length=100), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('export_jobs') as batch_op:
+        batch_op.drop_column('worker')
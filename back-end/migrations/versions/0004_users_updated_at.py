@@ -0,0 +1,30 @@
+"""Users updated_at
+
+Revision ID: 0004_users_updated_at
+Revises: 0003_export_job_worker
+Create Date: 2026-10-18 14:05:11.204833
+
+Adds users.updated_at, so the ETags of review listings, which embed reviewer
+names, change when a reviewer renames themselves. Existing rows start at
+date_joined.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0004_users_updated_at'
+down_revision = '0003_export_job_worker'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('users') as batch_op:
+        batch_op.add_column(sa.Column('updated_at', sa.DateTime(), nullable=True))
+    op.execute('UPDATE users SET updated_at = date_joined')
+
+
+def downgrade():
+    with op.batch_alter_table('users') as batch_op:
+        batch_op.drop_column('updated_at')
@@ -0,0 +1,74 @@
+import os
+import sys
+from datetime import date, timedelta
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Config reads the environment when it is first imported.
+os.environ.update({
+    'DATABASE_URL': 'sqlite://',
+    'PASSWORD_HASH_WORKERS': '0',
+    'BCRYPT_LOG_ROUNDS': '4',
+    'SQL_INSTRUMENTATION': 'true',
+    'SQL_SERVER_TIMING': 'true',
+    'RESPONSE_CACHE_BACKEND': 'none',
+    'COMPRESSION_ENABLED': 'false'
+})
+
+from app import create_app, db
+
+
+@pytest.fixture
+def app():
+    from app.services.analytics import invalidate_overview
+    from app.services.home_registry import registry
+    from app.services.search import create_search_index
+    from app.services.user_cache import _cache as user_cache
+
+    app = create_app('production')
+    app.config['TESTING'] = True
+    with app.app_context():
+        db.create_all()
+        create_search_index()
+        registry.invalidate()
+        user_cache.invalidate()
+        invalidate_overview()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+def make_user(username, role='user'):
+    from app.models.user import User
+
+    user = User(username=username, email=f'{username}@example.com', first_name='Test', last_name='User', role=role)
+    user.set_password('password123')
+    db.session.add(user)
+    db.session.commit()
+    return user
+
+
+def make_home(name='Hope Home', location='Nairobi', **kwargs):
+    from app.models.childrens_home import ChildrensHome
+
+    home = ChildrensHome(name=name, location=location, **kwargs)
+    db.session.add(home)
+    db.session.commit()
+    return home
+
+
+def login(client, username):
+    response = client.post('/api/auth/login', json={'username': username, 'password': 'password123'})
+    assert response.status_code == 200, response.data
+    return {'Authorization': f'Bearer {response.get_json()["access_token"]}'}
+
+
+def future_date(days):
+    return date.today() + timedelta(days=days)
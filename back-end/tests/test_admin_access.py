@@ -0,0 +1,62 @@
+from app import db
+from app.services.user_cache import _cache as user_cache
+from conftest import login, make_user
+
+
+def queries(response):
+    return int(response.headers['Server-Timing'].split('desc="')[1].split(' ')[0])
+
+
+def expire_snapshots():
+    # Stands in for USER_CACHE_TTL passing.
+    user_cache.invalidate()
+
+
+def test_admin_check_uses_cached_snapshot(app, client):
+    make_user('admin', role='admin')
+    headers = login(client, 'admin')
+    client.get('/api/admin/cache/stats', headers=headers)
+
+    response = client.get('/api/admin/cache/stats', headers=headers)
+
+    assert response.status_code == 200
+    assert queries(response) == 0
+
+
+def test_demotion_through_update_user_applies_at_once(app, client):
+    make_user('admin', role='admin')
+    other = make_user('other', role='admin')
+    headers = login(client, 'admin')
+    other_headers = login(client, 'other')
+    assert client.get('/api/admin/users', headers=other_headers).status_code == 200
+
+    response = client.put(f'/api/admin/users/{other.id}', json={'role': 'user'}, headers=headers)
+
+    assert response.status_code == 200
+    assert client.get('/api/admin/users', headers=other_headers).status_code == 403
+
+
+def test_role_change_elsewhere_applies_when_snapshot_expires(app, client):
+    admin = make_user('admin', role='admin')
+    headers = login(client, 'admin')
+    assert client.get('/api/admin/users', headers=headers).status_code == 200
+
+    # Demoted by another worker: this worker's snapshot still says admin.
+    admin.role = 'user'
+    db.session.commit()
+    assert client.get('/api/admin/users', headers=headers).status_code == 200
+
+    expire_snapshots()
+    assert client.get('/api/admin/users', headers=headers).status_code == 403
+
+
+def test_promoted_user_gains_access_with_old_token(app, client):
+    user = make_user('donor')
+    headers = login(client, 'donor')
+    assert client.get('/api/admin/users', headers=headers).status_code == 403
+
+    user.role = 'admin'
+    db.session.commit()
+    expire_snapshots()
+
+    assert client.get('/api/admin/users', headers=headers).status_code == 200
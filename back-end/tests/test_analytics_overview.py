@@ -0,0 +1,84 @@
+from datetime import datetime
+
+from app import db
+from app.models.donation import Donation
+from app.models.review import Review
+from app.models.visit import Visit
+from conftest import future_date, login, make_home, make_user
+
+
+def overview(client, headers):
+    response = client.get('/api/admin/analytics/overview', headers=headers)
+    assert response.status_code == 200, response.data
+    data = response.get_json()
+    return data['overview'], datetime.fromisoformat(data['generated_at'])
+
+
+def test_committed_writes_show_on_the_next_call(app, client):
+    make_user('admin', role='admin')
+    donor = make_user('donor')
+    headers = login(client, 'admin')
+    home_id = make_home().id
+
+    figures, generated_at = overview(client, headers)
+    assert overview(client, headers) == (figures, generated_at)
+
+    donation = Donation(user_id=donor.id, home_id=home_id, amount=50, status='pending')
+    db.session.add(donation)
+    db.session.commit()
+    after_donation, donation_at = overview(client, headers)
+    assert after_donation['total_donations'] == figures['total_donations'] + 1
+    assert after_donation['pending_donations'] == figures['pending_donations'] + 1
+    assert donation_at > generated_at
+
+    donation.status = 'completed'
+    db.session.commit()
+    after_status, status_at = overview(client, headers)
+    assert after_status['pending_donations'] == figures['pending_donations']
+    assert after_status['total_donation_amount'] == figures['total_donation_amount'] + 50
+    assert status_at > donation_at
+
+    db.session.add(Review(user_id=donor.id, home_id=home_id, rating=4))
+    db.session.commit()
+    after_review, review_at = overview(client, headers)
+    assert after_review['total_reviews'] == figures['total_reviews'] + 1
+    assert review_at > status_at
+
+    db.session.add(Visit(user_id=donor.id, home_id=home_id, visit_date=future_date(5)))
+    db.session.commit()
+    after_visit, visit_at = overview(client, headers)
+    assert after_visit['total_visits'] == figures['total_visits'] + 1
+    assert after_visit['new_visits_30_days'] == figures['new_visits_30_days'] + 1
+    assert visit_at > review_at
+
+
+def test_rolled_back_writes_keep_the_cached_overview(app, client):
+    make_user('admin', role='admin')
+    donor = make_user('donor')
+    headers = login(client, 'admin')
+    home_id = make_home().id
+    cached = overview(client, headers)
+
+    db.session.add(Donation(user_id=donor.id, home_id=home_id, amount=20))
+    db.session.flush()
+    db.session.rollback()
+
+    assert overview(client, headers) == cached
+
+
+def test_bulk_donations_refresh_the_overview(app, client):
+    make_user('admin', role='admin')
+    make_user('donor')
+    admin_headers = login(client, 'admin')
+    headers = login(client, 'donor')
+    home_id = make_home().id
+    figures, generated_at = overview(client, admin_headers)
+
+    response = client.post('/api/donations/multiple', json={'donations': [
+        {'home_id': home_id, 'amount': 10}, {'home_id': home_id, 'amount': 15}
+    ]}, headers=headers)
+    assert response.status_code == 201
+
+    after, after_at = overview(client, admin_headers)
+    assert after['total_donations'] == figures['total_donations'] + 2
+    assert after_at > generated_at
@@ -0,0 +1,91 @@
+import gzip
+import json
+import zlib
+
+import pytest
+
+from config.config import config
+from conftest import make_home
+
+brotli = pytest.importorskip('brotli')
+
+
+@pytest.fixture(autouse=True)
+def enable_compression(monkeypatch):
+    # Must run before the app fixture creates the app
+    monkeypatch.setattr(config['production'], 'COMPRESSION_ENABLED', True)
+
+
+def make_homes(count):
+    for number in range(count):
+        make_home(name=f'Home {number}', description='A home with a long enough description. ' * 3)
+
+
+def test_encoding_is_negotiated(app, client):
+    make_homes(10)
+    plain = client.get('/api/homes/').data
+    assert len(plain) >= app.config['COMPRESSION_MIN_SIZE']
+
+    response = client.get('/api/homes/', headers={'Accept-Encoding': 'gzip'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert gzip.decompress(response.data) == plain
+
+    response = client.get('/api/homes/', headers={'Accept-Encoding': 'gzip, br'})
+    assert response.headers['Content-Encoding'] == 'br'
+    assert brotli.decompress(response.data) == plain
+
+    response = client.get('/api/homes/', headers={'Accept-Encoding': 'br;q=0.5, gzip'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+
+    for accept_encoding in ('identity', 'gzip;q=0', 'deflate'):
+        response = client.get('/api/homes/', headers={'Accept-Encoding': accept_encoding})
+        assert 'Content-Encoding' not in response.headers, accept_encoding
+        assert response.data == plain
+
+
+def test_small_responses_are_not_compressed(app, client):
+    make_homes(10)
+    headers = {'Accept-Encoding': 'gzip'}
+
+    response = client.get('/api/homes/999', headers=headers)
+    assert response.status_code == 404
+    assert 'Content-Encoding' not in response.headers
+
+    app.config['COMPRESSION_MIN_SIZE'] = 1024 * 1024
+    response = client.get('/api/homes/', headers=headers)
+    assert 'Content-Encoding' not in response.headers
+    assert 'Accept-Encoding' in response.headers['Vary']
+
+
+def test_vary_is_sent_whatever_the_client_accepts(app, client):
+    make_homes(10)
+
+    for headers in ({}, {'Accept-Encoding': 'gzip'}, {'Accept-Encoding': 'br'}):
+        response = client.get('/api/homes/', headers=headers)
+        assert 'Accept-Encoding' in response.headers['Vary'], headers
+
+
+@pytest.mark.parametrize('encoding', ['gzip', 'br'])
+def test_streamed_ndjson_chunks_decode_as_they_arrive(app, client, encoding):
+    make_homes(5)
+    app.config['STREAM_BATCH_SIZE'] = 2
+    decompress = zlib.decompressobj(31).decompress if encoding == 'gzip' else brotli.Decompressor().process
+
+    response = client.get('/api/homes/search', query_string={'location': 'Nairobi'},
+                          headers={'Accept': 'application/x-ndjson', 'Accept-Encoding': encoding},
+                          buffered=False)
+
+    assert response.headers['Content-Encoding'] == encoding
+    assert 'Content-Length' not in response.headers
+    text, chunks = '', 0
+    for chunk in response.response:
+        chunks += 1
+        text += decompress(chunk).decode('utf-8')
+        # Every chunk is flushed, so what has arrived so far ends on a whole line
+        assert text == '' or text.endswith('\n')
+    response.close()
+
+    assert chunks > 5
+
+    homes = [json.loads(line) for line in text.splitlines()]
+    assert sorted(home['name'] for home in homes) == [f'Home {number}' for number in range(5)]
@@ -0,0 +1,92 @@
+from app import db
+from app.models.review import Review
+from app.services.response_cache import MemoryBackend
+from conftest import login, make_home, make_user
+
+
+def test_homes_list_answers_matching_etag_with_304(app, client):
+    home = make_home()
+    response = client.get('/api/homes/')
+    assert response.status_code == 200
+    etag = response.headers['ETag']
+    assert etag.startswith('W/')
+    assert 'Last-Modified' not in response.headers
+
+    response = client.get('/api/homes/', headers={'If-None-Match': etag})
+    assert response.status_code == 304
+    assert response.data == b''
+    assert response.headers['ETag'] == etag
+
+    home.needs_description = 'School books'
+    db.session.commit()
+
+    response = client.get('/api/homes/', headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
+
+
+def test_if_modified_since_is_not_answered(app, client):
+    make_home()
+
+    response = client.get('/api/homes/locations', headers={'If-Modified-Since': 'Fri, 01 Jan 2100 00:00:00 GMT'})
+    assert response.status_code == 200
+
+
+def test_new_review_changes_home_etags(app, client):
+    make_user('reviewer')
+    headers = login(client, 'reviewer')
+    home = make_home()
+    paths = [f'/api/homes/{home.id}', f'/api/homes/{home.id}/reviews', f'/api/reviews/home/{home.id}']
+    etags = {path: client.get(path).headers['ETag'] for path in paths}
+
+    response = client.post('/api/reviews/', json={'home_id': home.id, 'rating': 5}, headers=headers)
+    assert response.status_code == 201
+
+    for path, etag in etags.items():
+        response = client.get(path, headers={'If-None-Match': etag})
+        assert response.status_code == 200, path
+
+
+def test_missing_home_has_no_etag(app, client):
+    response = client.get('/api/homes/999', headers={'If-None-Match': '*'})
+    assert response.status_code == 404
+    assert 'ETag' not in response.headers
+
+
+def review_etags(client, home_id):
+    paths = [f'/api/homes/{home_id}', f'/api/homes/{home_id}/reviews', f'/api/reviews/home/{home_id}']
+    return {path: client.get(path).headers['ETag'] for path in paths}
+
+
+def assert_all_changed(client, etags):
+    for path, etag in etags.items():
+        response = client.get(path, headers={'If-None-Match': etag})
+        assert response.status_code == 200, path
+
+
+def test_deleted_review_changes_home_etags(app, client):
+    reviewers = [make_user(f'reviewer{number}') for number in range(2)]
+    home_id = make_home().id
+    db.session.add_all(Review(user_id=user.id, home_id=home_id, rating=4) for user in reviewers)
+    db.session.commit()
+    etags = review_etags(client, home_id)
+
+    db.session.delete(Review.query.filter_by(user_id=reviewers[0].id).one())
+    db.session.commit()
+
+    assert_all_changed(client, etags)
+
+
+def test_reviewer_rename_changes_review_etags(app, client):
+    app.extensions['response_cache'] = MemoryBackend(1024 * 1024)
+    make_user('reviewer')
+    headers = login(client, 'reviewer')
+    home_id = make_home().id
+    assert client.post('/api/reviews/', json={'home_id': home_id, 'rating': 5}, headers=headers).status_code == 201
+    etags = review_etags(client, home_id)
+
+    response = client.put('/api/auth/profile', json={'first_name': 'Renamed'}, headers=headers)
+    assert response.status_code == 200
+
+    assert_all_changed(client, etags)
+    assert client.get(f'/api/homes/{home_id}/reviews').get_json()['reviews'][0]['reviewer_name'].startswith('Renamed')
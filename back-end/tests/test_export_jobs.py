@@ -0,0 +1,77 @@
+import os
+import socket
+import subprocess
+import sys
+from datetime import datetime, timedelta
+
+from app import db
+from app.models.donation import Donation
+from app.models.export_job import ExportJob
+from app.services import export_jobs
+from conftest import make_home, make_user
+
+
+def make_job(user, status, worker, **kwargs):
+    job = ExportJob(id=os.urandom(16).hex(), report='donations', format='csv', requested_by=user.id,
+                    status=status, worker=worker, **kwargs)
+    db.session.add(job)
+    db.session.commit()
+    return job
+
+
+def dead_pid():
+    process = subprocess.Popen([sys.executable, '-c', 'pass'])
+    process.wait()
+    return process.pid
+
+
+def test_home_statements_apply_date_range(app):
+    donor = make_user('donor')
+    home = make_home()
+    for created_at in (datetime(2024, 3, 1), datetime(2024, 6, 1), datetime(2024, 9, 1)):
+        db.session.add(Donation(user_id=donor.id, home_id=home.id, amount=10, status='completed', created_at=created_at))
+    db.session.commit()
+
+    rows = db.session.execute(export_jobs.home_statements({'start_date': '2024-05-01', 'end_date': '2024-06-01'})).all()
+
+    assert [(row.year, row.donation_count) for row in rows] == [(2024, 1)]
+
+
+def test_interrupted_jobs_are_marked_failed(app):
+    admin = make_user('admin', role='admin')
+    host = socket.gethostname()
+    gone = make_job(admin, 'running', f'{host}:{dead_pid()}')
+    restarted = make_job(admin, 'queued', f'{host}:{os.getpid()}')
+    alive = make_job(admin, 'running', f'{host}:{os.getppid()}')
+    elsewhere = make_job(admin, 'running', 'other-host:1')
+
+    assert export_jobs.fail_interrupted_jobs() == 2
+
+    assert gone.status == 'failed' and gone.error
+    assert restarted.status == 'failed'
+    assert alive.status == 'running'
+    assert elsewhere.status == 'running'
+
+
+def test_status_poll_fails_interrupted_job(app):
+    admin = make_user('admin', role='admin')
+    job = make_job(admin, 'running', f'{socket.gethostname()}:{dead_pid()}')
+
+    assert export_jobs.job_status(job)['status'] == 'failed'
+
+
+def test_expired_files_are_deleted(app, tmp_path):
+    admin = make_user('admin', role='admin')
+    worker = f'{socket.gethostname()}:{os.getpid()}'
+    old_file, new_file = tmp_path / 'old.csv', tmp_path / 'new.csv'
+    old_file.write_text('id\n')
+    new_file.write_text('id\n')
+    hours = app.config['EXPORT_JOB_RETENTION_HOURS']
+    old = make_job(admin, 'completed', worker, file_path=str(old_file),
+                   finished_at=datetime.utcnow() - timedelta(hours=hours + 1))
+    new = make_job(admin, 'completed', worker, file_path=str(new_file), finished_at=datetime.utcnow())
+
+    assert export_jobs.prune_expired() == 1
+
+    assert not old_file.exists() and old.status == 'expired' and old.file_path is None
+    assert new_file.exists() and new.status == 'completed'
@@ -0,0 +1,24 @@
+import csv
+import io
+
+from app import db
+from app.models.donation import Donation
+from conftest import login, make_home, make_user
+
+
+def test_csv_export_neutralizes_formulas(app, client):
+    donor = make_user('donor')
+    make_user('admin', role='admin')
+    home = make_home()
+    db.session.add(Donation(
+        user_id=donor.id, home_id=home.id, amount=10, status='completed',
+        description='+1 books', message_to_home='@everyone -- thanks'
+    ))
+    db.session.commit()
+
+    response = client.get('/api/admin/exports/donations', headers=login(client, 'admin'))
+    row = list(csv.DictReader(io.StringIO(response.get_data(as_text=True))))[0]
+
+    assert row['description'] == "'+1 books"
+    assert row['message_to_home'] == "'@everyone -- thanks"
+    assert row['amount'] == '10.00'
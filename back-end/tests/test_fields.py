@@ -0,0 +1,78 @@
+import json
+
+from app import db
+from app.models.review import Review
+from conftest import make_home, make_user
+
+
+def test_list_returns_only_requested_fields(app, client):
+    make_home()
+    make_home(name='Other Home')
+
+    response = client.get('/api/homes/', query_string={'fields': 'location, id,name'})
+
+    assert response.status_code == 200
+    homes = response.get_json()['homes']
+    assert len(homes) == 2
+    assert all(set(home) == {'id', 'name', 'location'} for home in homes)
+
+
+def test_empty_fields_returns_everything(app, client):
+    make_home()
+
+    full = client.get('/api/homes/').get_json()['homes'][0]
+    for fields in ('', ','):
+        assert client.get('/api/homes/', query_string={'fields': fields}).get_json()['homes'][0] == full
+    assert {'average_rating', 'total_donations_received', 'total_visits'} <= set(full)
+
+
+def test_derived_fields_can_be_requested_alone(app, client):
+    reviewer = make_user('reviewer')
+    home_id = make_home().id
+    db.session.add(Review(user_id=reviewer.id, home_id=home_id, rating=4))
+    db.session.commit()
+
+    home = client.get('/api/homes/', query_string={'fields': 'average_rating,reviews_count'}).get_json()['homes'][0]
+
+    assert home == {'average_rating': 4, 'reviews_count': 1}
+
+
+def test_details_can_skip_or_keep_recent_reviews(app, client):
+    reviewer = make_user('reviewer')
+    home_id = make_home().id
+    db.session.add(Review(user_id=reviewer.id, home_id=home_id, rating=5))
+    db.session.commit()
+
+    home = client.get(f'/api/homes/{home_id}', query_string={'fields': 'name'}).get_json()['home']
+    assert home == {'name': 'Hope Home'}
+
+    home = client.get(f'/api/homes/{home_id}', query_string={'fields': 'id,recent_reviews'}).get_json()['home']
+    assert set(home) == {'id', 'recent_reviews'} and len(home['recent_reviews']) == 1
+
+
+def test_unknown_fields_are_rejected(app, client):
+    home_id = make_home().id
+    requests = [
+        ('/api/homes/', {'fields': 'name,password_hash'}),
+        ('/api/homes/', {'fields': 'bogus,name,also_bogus', 'cursor': ''}),
+        (f'/api/homes/{home_id}', {'fields': 'name,bogus'}),
+        ('/api/homes/search', {'q': 'hope', 'fields': 'bogus'}),
+        ('/api/homes/', {'fields': 'recent_reviews'})
+    ]
+
+    for path, params in requests:
+        response = client.get(path, query_string=params)
+        assert response.status_code == 400, (path, params)
+        assert response.get_json()['error'].startswith('Unknown fields: ')
+    error = client.get('/api/homes/', query_string={'fields': 'bogus,name,also_bogus'}).get_json()['error']
+    assert error == 'Unknown fields: also_bogus, bogus'
+
+
+def test_ndjson_search_lines_use_requested_fields(app, client):
+    make_home()
+
+    response = client.get('/api/homes/search', query_string={'location': 'Nairobi', 'fields': 'id,name'},
+                          headers={'Accept': 'application/x-ndjson'})
+
+    lines = response.get_data(as_text=True).splitlines()
+    assert [set(json.loads(line)) for line in lines] == [{'id', 'name'}]
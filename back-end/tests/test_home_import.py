@@ -0,0 +1,25 @@
+import io
+
+from app.models.childrens_home import ChildrensHome
+from conftest import login, make_user
+
+
+def test_unreadable_file_reports_rows_already_imported(app, client):
+    make_user('admin', role='admin')
+    app.config['HOME_IMPORT_CHUNK_SIZE'] = 100
+    # Text is decoded in blocks, so the bad bytes go well past the first one.
+    body = ''.join(f'{{"name": "Home {number}", "location": "Nairobi"}}\n' for number in range(1000)).encode('utf-8')
+    body += b'\xff\xfe not utf-8\n' + b'{"name": "Late Home", "location": "Kisumu"}\n' * 10
+
+    response = client.post(
+        '/api/admin/homes/import?format=jsonl',
+        data={'file': (io.BytesIO(body), 'homes.jsonl')},
+        headers=login(client, 'admin')
+    )
+
+    assert response.status_code == 400
+    data = response.get_json()
+    assert 'Could not read the file' in data['error']
+    assert 0 < data['imported'] < 1000
+    assert data['imported'] == ChildrensHome.query.count()
+    assert f'{data["imported"]} homes were already imported' in data['error']
@@ -0,0 +1,119 @@
+from datetime import datetime
+
+from sqlalchemy import event
+
+from app import db
+from app.services.home_registry import registry
+from conftest import future_date, login, make_home, make_user
+
+# Homes written directly through the session stand in for writes made by
+# another worker, which never reach this worker's registry.
+
+
+def expire_registry():
+    # Stands in for HOME_REGISTRY_TTL passing.
+    registry._expires_at = 0
+
+
+def home_selects(app, call):
+    """Run `call` and return the SELECTs it sent to childrens_homes."""
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        if statement.lstrip().upper().startswith('SELECT') and 'FROM childrens_homes' in statement:
+            statements.append(statement)
+
+    event.listen(db.engine, 'before_cursor_execute', record)
+    try:
+        call()
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', record)
+    return statements
+
+
+def test_home_created_elsewhere_is_found(app, client):
+    make_user('donor')
+    headers = login(client, 'donor')
+    make_home()
+    assert client.get('/api/homes/1/reviews').status_code == 200
+
+    home = make_home(name='New Home')
+
+    assert client.get(f'/api/homes/{home.id}/reviews').status_code == 200
+    response = client.post('/api/donations/', json={'home_id': home.id, 'amount': 10}, headers=headers)
+    assert response.status_code == 201
+
+
+def test_write_paths_do_not_select_the_home(app, client):
+    make_user('donor')
+    headers = login(client, 'donor')
+    home_id = make_home().id
+    other_id = make_home(name='Other Home').id
+    assert client.get(f'/api/homes/{home_id}/reviews').status_code == 200
+
+    def writes():
+        assert client.post('/api/donations/', json={'home_id': home_id, 'amount': 10}, headers=headers).status_code == 201
+        response = client.post('/api/donations/multiple', json={'donations': [
+            {'home_id': home_id, 'amount': 5}, {'home_id': other_id, 'amount': 5}
+        ]}, headers=headers)
+        assert response.status_code == 201
+        visit = {'home_id': home_id, 'visit_date': future_date(7).isoformat()}
+        assert client.post('/api/visits/', json=visit, headers=headers).status_code == 201
+        assert client.post('/api/reviews/', json={'home_id': home_id, 'rating': 5}, headers=headers).status_code == 201
+
+    assert home_selects(app, writes) == []
+
+
+def refused_everywhere(client, headers, home):
+    donation = {'home_id': home.id, 'amount': 10}
+    assert client.post('/api/donations/', json=donation, headers=headers).status_code == 404
+    response = client.post('/api/donations/multiple', json={'donations': [donation]}, headers=headers)
+    assert response.status_code == 400
+    visit = {'home_id': home.id, 'visit_date': future_date(7).isoformat()}
+    assert client.post('/api/visits/', json=visit, headers=headers).status_code == 404
+    review = {'home_id': home.id, 'rating': 5}
+    assert client.post('/api/reviews/', json=review, headers=headers).status_code == 404
+    return True
+
+
+def test_home_deactivated_by_admin_refuses_writes_at_once(app, client):
+    make_user('admin', role='admin')
+    make_user('donor')
+    admin_headers = login(client, 'admin')
+    headers = login(client, 'donor')
+    home = make_home()
+    assert client.get(f'/api/homes/{home.id}/reviews').status_code == 200
+
+    assert client.put(f'/api/admin/homes/{home.id}', json={'is_active': False}, headers=admin_headers).status_code == 200
+
+    assert refused_everywhere(client, headers, home)
+
+
+def test_home_deactivated_elsewhere_refuses_writes_after_refresh(app, client):
+    make_user('donor')
+    headers = login(client, 'donor')
+    home = make_home()
+    assert client.get(f'/api/homes/{home.id}/reviews').status_code == 200
+
+    home.is_active = False
+    db.session.commit()
+    expire_registry()
+
+    assert refused_everywhere(client, headers, home)
+
+
+def test_refresh_reads_only_changed_homes(app, client):
+    homes = [make_home(name=f'Home {number}') for number in range(3)]
+    for home in homes:
+        home.updated_at = datetime(2024, 1, 1)
+    db.session.commit()
+    home_ids = [home.id for home in homes]
+    assert registry.get(home_ids[0]).name == 'Home 0'
+
+    homes[1].name = 'Renamed Home'
+    db.session.commit()
+    expire_registry()
+
+    statements = home_selects(app, lambda: registry.get(home_ids[0]))
+    assert len(statements) == 1 and 'updated_at >=' in statements[0]
+    assert registry.get(home_ids[1]).name == 'Renamed Home'
@@ -0,0 +1,106 @@
+from decimal import Decimal
+
+from sqlalchemy import func, select
+
+from app import db
+from app.models.donation import Donation
+from app.models.home_stats import HomeStats
+from app.models.visit import Visit
+from conftest import future_date, login, make_home, make_user
+
+
+def expected_stats():
+    """home_id -> (visit_count, donation_count, donation_total) aggregated from the source tables."""
+    stats = {home_id: [0, 0, Decimal('0')] for home_id in db.session.scalars(select(HomeStats.home_id))}
+    for home_id, count in db.session.execute(select(Visit.home_id, func.count(Visit.id)).group_by(Visit.home_id)):
+        stats[home_id][0] = count
+    donations = db.session.execute(
+        select(Donation.home_id, func.count(Donation.id), func.sum(Donation.amount))
+        .where(Donation.status == 'completed').group_by(Donation.home_id)
+    )
+    for home_id, count, total in donations:
+        stats[home_id][1:] = [count, Decimal(str(total)).quantize(Decimal('0.01'))]
+    return {home_id: tuple(values) for home_id, values in stats.items()}
+
+
+def stored_stats():
+    db.session.expire_all()
+    return {
+        row.home_id: (row.visit_count, row.donation_count, Decimal(str(row.donation_total)).quantize(Decimal('0.01')))
+        for row in HomeStats.query
+    }
+
+
+def assert_in_step():
+    assert stored_stats() == expected_stats()
+
+
+def test_donation_status_and_home_changes_keep_stats_in_step(app):
+    donor = make_user('donor')
+    first, second = make_home().id, make_home(name='Other Home').id
+    donations = [Donation(user_id=donor.id, home_id=first, amount=amount, status='pending') for amount in (10, 25.5, 40)]
+    db.session.add_all(donations)
+    db.session.commit()
+    assert_in_step()
+    assert stored_stats()[first][1] == 0
+
+    for donation in donations:
+        donation.status = 'completed'
+    db.session.commit()
+    assert_in_step()
+    assert stored_stats()[first][1:] == (3, Decimal('75.50'))
+
+    donations[0].amount = 15
+    donations[1].home_id = second
+    db.session.commit()
+    assert_in_step()
+
+    donations[1].status = 'cancelled'
+    donations[2].home_id = second
+    db.session.commit()
+    assert_in_step()
+
+    db.session.delete(donations[0])
+    db.session.commit()
+    assert_in_step()
+    assert stored_stats()[first] == (0, 0, Decimal('0.00'))
+
+
+def test_visit_changes_keep_stats_in_step(app):
+    visitor = make_user('visitor')
+    first, second = make_home().id, make_home(name='Other Home').id
+    visits = [Visit(user_id=visitor.id, home_id=first, visit_date=future_date(days), status='pending') for days in (3, 4)]
+    db.session.add_all(visits)
+    db.session.commit()
+    assert_in_step()
+
+    visits[0].status = 'completed'
+    visits[1].status = 'cancelled'
+    db.session.commit()
+    assert_in_step()
+
+    visits[1].home_id = second
+    db.session.commit()
+    assert_in_step()
+    assert stored_stats()[second][0] == 1
+
+    db.session.delete(visits[0])
+    db.session.commit()
+    assert_in_step()
+
+
+def test_bulk_donations_cannot_change_stats(app, client):
+    make_user('donor')
+    headers = login(client, 'donor')
+    home_id = make_home().id
+    before = stored_stats()
+
+    response = client.post('/api/donations/multiple', json={'donations': [
+        {'home_id': home_id, 'amount': 10, 'status': 'completed'},
+        {'home_id': home_id, 'amount': 20, 'status': 'completed'}
+    ]}, headers=headers)
+
+    assert response.status_code == 201
+    assert {donation['status'] for donation in response.get_json()['donations']} == {'pending'}
+    assert stored_stats() == before
+    assert_in_step()
@@ -0,0 +1,58 @@
+import json
+from datetime import date, datetime
+from decimal import Decimal
+
+from flask import jsonify
+
+from app import db
+from app.models.donation import Donation
+from app.utils import json_provider
+from conftest import make_home, make_user
+
+SAMPLE = {
+    'name': 'Hope Home',
+    'amount': Decimal('12345678901234567.89'),
+    'small': Decimal('0.10'),
+    'joined': datetime(2024, 5, 1, 12, 30, 15, 250000),
+    'established': date(2001, 2, 3),
+    'count': 3
+}
+
+
+def test_keys_are_sorted_and_decimals_kept_exact(app):
+    encoded = app.json.dumps(SAMPLE)
+
+    assert list(json.loads(encoded)) == sorted(SAMPLE)
+    assert json.loads(encoded) == {
+        'amount': '12345678901234567.89',
+        'count': 3,
+        'established': '2001-02-03',
+        'joined': '2024-05-01T12:30:15.250000',
+        'name': 'Hope Home',
+        'small': '0.10'
+    }
+
+
+def test_responses_match_the_stdlib_fallback(app, monkeypatch):
+    with app.test_request_context():
+        fast = jsonify(SAMPLE).get_data()
+    fast_dumps = app.json.dumps(SAMPLE)
+
+    monkeypatch.setattr(json_provider, 'orjson', None)
+    with app.test_request_context():
+        fallback = jsonify(SAMPLE).get_data()
+
+    assert json.loads(fast) == json.loads(fallback)
+    assert list(json.loads(fast)) == list(json.loads(fallback)) == sorted(SAMPLE)
+    assert json.loads(fast_dumps) == json.loads(app.json.dumps(SAMPLE))
+
+
+def test_donation_totals_stay_numbers(app, client):
+    donor = make_user('donor')
+    home_id = make_home().id
+    db.session.add(Donation(user_id=donor.id, home_id=home_id, amount=Decimal('10.25'), status='completed'))
+    db.session.commit()
+
+    home = client.get(f'/api/homes/{home_id}').get_json()['home']
+
+    assert home['total_donations_received'] == 10.25
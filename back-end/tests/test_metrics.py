@@ -0,0 +1,25 @@
+import pytest
+
+from app import create_app
+from config.config import config
+
+
+@pytest.fixture
+def metrics_app(monkeypatch):
+    monkeypatch.setattr(config['production'], 'METRICS_ENABLED', True)
+    monkeypatch.setattr(config['production'], 'METRICS_TOKEN', 'scrape-secret')
+    return create_app('production')
+
+
+def test_metrics_off_by_default(client):
+    assert client.get('/metrics').status_code == 404
+
+
+def test_metrics_require_token(metrics_app):
+    client = metrics_app.test_client()
+
+    assert client.get('/metrics').status_code == 401
+    assert client.get('/metrics', headers={'Authorization': 'Bearer wrong'}).status_code == 401
+    response = client.get('/metrics', headers={'Authorization': 'Bearer scrape-secret'})
+    assert response.status_code == 200
+    assert b'http_requests_total' in response.data
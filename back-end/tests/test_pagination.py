@@ -0,0 +1,93 @@
+import base64
+import json
+from datetime import datetime
+
+from conftest import make_home
+
+SAME_TIME = datetime(2024, 5, 1, 12, 0, 0)
+
+
+def make_homes(count):
+    # Every home shares one created_at, so only the id breaks ties.
+    return [make_home(name=f'Home {number}', created_at=SAME_TIME).id for number in range(count)]
+
+
+def page(client, **params):
+    response = client.get('/api/homes/', query_string=params)
+    assert response.status_code == 200, response.data
+    data = response.get_json()
+    return [home['id'] for home in data['homes']], data['pagination']
+
+
+def test_cursor_pages_cover_ties_once(app, client):
+    home_ids = make_homes(7)
+
+    seen = []
+    ids, pagination = page(client, cursor='', per_page=3)
+    seen += ids
+    while pagination['next_cursor']:
+        ids, pagination = page(client, cursor=pagination['next_cursor'], per_page=3)
+        seen += ids
+
+    assert seen == sorted(home_ids, reverse=True)
+    assert pagination['has_next'] is False
+
+
+def test_next_and_prev_round_trip(app, client):
+    make_homes(7)
+
+    first, first_page = page(client, cursor='', per_page=3)
+    second, second_page = page(client, cursor=first_page['next_cursor'], per_page=3)
+    back, back_page = page(client, cursor=second_page['prev_cursor'], per_page=3)
+
+    assert first_page['has_prev'] is False and first_page['prev_cursor'] is None
+    assert second_page['has_prev'] is True
+    assert back == first
+    assert back_page['next_cursor'] == first_page['next_cursor']
+    assert back_page['has_prev'] is False
+
+
+def encode(payload):
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip('=')
+
+
+def test_bad_cursors_are_rejected(app, client):
+    make_homes(2)
+    bad_cursors = [
+        'not a cursor',
+        '!!!',
+        encode({'d': 'sideways', 'k': ['2024-05-01T12:00:00', 1]}),
+        encode({'d': 'next', 'k': [1]}),
+        encode({'d': 'next', 'k': ['yesterday', 1]}),
+        encode({'d': 'next', 'k': ['2024-05-01T12:00:00', 'one']}),
+        encode(['next'])
+    ]
+
+    for cursor in bad_cursors:
+        response = client.get('/api/homes/', query_string={'cursor': cursor})
+        assert response.status_code == 400, cursor
+        assert response.get_json()['error'] == 'Invalid cursor'
+
+
+def test_per_page_is_capped(app, client):
+    app.config['MAX_PER_PAGE'] = 4
+    make_homes(6)
+
+    ids, pagination = page(client, per_page=1000)
+    assert len(ids) == 4 and pagination['per_page'] == 4
+    ids, pagination = page(client, cursor='', per_page=1000)
+    assert len(ids) == 4 and pagination['per_page'] == 4
+    ids, pagination = page(client, per_page=0)
+    assert len(ids) == 1
+
+
+def test_offset_pages_still_work(app, client):
+    home_ids = make_homes(5)
+
+    first, pagination = page(client, page=1, per_page=2)
+    assert pagination == {'page': 1, 'per_page': 2, 'total': 5, 'pages': 3, 'has_prev': False, 'has_next': True}
+    last, pagination = page(client, page=3, per_page=2)
+    second, _ = page(client, page=2, per_page=2)
+
+    assert first + second + last == sorted(home_ids, reverse=True)
+    assert pagination['has_next'] is False
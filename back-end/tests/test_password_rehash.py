@@ -0,0 +1,43 @@
+from app import db
+from app.models import user as user_module
+from app.models.user import User
+from app.services.passwords import PasswordHasherBusy, hash_cost, hash_password
+from conftest import make_user
+
+
+def make_stale_user(app, username):
+    user = make_user(username)
+    user.password_hash = hash_password('password123', rounds=app.config['BCRYPT_LOG_ROUNDS'] + 1)
+    db.session.commit()
+    return user.id, user.password_hash
+
+
+def login(client, username):
+    return client.post('/api/auth/login', json={'username': username, 'password': 'password123'})
+
+
+def test_login_upgrades_stale_hash(app, client):
+    user_id, old_hash = make_stale_user(app, 'donor')
+
+    assert login(client, 'donor').status_code == 200
+
+    new_hash = db.session.get(User, user_id).password_hash
+    assert new_hash != old_hash
+    assert hash_cost(new_hash) == app.config['BCRYPT_LOG_ROUNDS']
+    assert login(client, 'donor').status_code == 200
+
+
+def test_login_succeeds_when_pool_is_busy_during_rehash(app, client, monkeypatch):
+    user_id, old_hash = make_stale_user(app, 'donor')
+
+    def busy(password, rounds=None):
+        raise PasswordHasherBusy('Too many password operations in progress, please retry shortly')
+
+    monkeypatch.setattr(user_module, 'hash_password', busy)
+
+    response = login(client, 'donor')
+
+    assert response.status_code == 200
+    assert response.get_json()['access_token']
+    db.session.expire_all()
+    assert db.session.get(User, user_id).password_hash == old_hash
@@ -0,0 +1,101 @@
+import json
+import os
+
+import pytest
+
+from config.config import config
+from conftest import login, make_home, make_user
+
+
+@pytest.fixture(autouse=True)
+def enable_profiler(monkeypatch, tmp_path):
+    # Must run before the app fixture creates the app
+    monkeypatch.setattr(config['production'], 'PROFILER_ENABLED', True)
+    monkeypatch.setattr(config['production'], 'PROFILER_DIR', str(tmp_path))
+
+
+def stored(tmp_path, suffix):
+    return sorted(name[:-len(suffix)] for name in os.listdir(tmp_path) if name.endswith(suffix))
+
+
+def test_x_profile_is_ignored_for_non_admins(app, client, tmp_path):
+    make_user('donor')
+    make_home()
+    requests = [
+        {'X-Profile': 'true'},
+        {'X-Profile': 'true', **login(client, 'donor')},
+        {'X-Profile': 'true', 'Authorization': 'Bearer not-a-token'}
+    ]
+
+    for headers in requests:
+        response = client.get('/api/homes/', headers=headers)
+        assert response.status_code == 200
+        assert 'X-Profile-Id' not in response.headers
+
+    assert os.listdir(tmp_path) == []
+
+
+def test_admin_request_writes_folded_stacks_and_metadata(app, client, tmp_path):
+    make_user('admin', role='admin')
+    headers = login(client, 'admin')
+    make_home()
+
+    response = client.get('/api/homes/?per_page=5', headers={'X-Profile': '1', **headers})
+
+    profile_id = response.headers['X-Profile-Id']
+    assert stored(tmp_path, '.folded') == stored(tmp_path, '.json') == [profile_id]
+    with open(tmp_path / f'{profile_id}.json') as metadata:
+        profile = json.load(metadata)
+    assert profile['trigger'] == 'header'
+    assert profile['endpoint'] == 'homes.get_homes'
+    assert profile['path'] == '/api/homes/?per_page=5'
+    assert profile['status'] == 200
+    for line in (tmp_path / f'{profile_id}.folded').read_text().splitlines():
+        stack, count = line.rsplit(' ', 1)
+        assert stack and int(count) > 0
+
+    listed = client.get('/api/admin/profiles', headers=headers).get_json()['profiles']
+    assert [profile['id'] for profile in listed] == [profile_id]
+    assert client.get(f'/api/admin/profiles/{profile_id}', headers=headers).status_code == 200
+
+
+def test_arming_profiles_every_request_until_disarmed(app, client, tmp_path):
+    make_user('admin', role='admin')
+    headers = login(client, 'admin')
+    make_home()
+
+    response = client.post('/api/admin/profiles/captures', json={'endpoint': 'homes.get_homes', 'seconds': 60},
+                           headers=headers)
+    assert response.status_code == 201
+    assert list(client.get('/api/admin/profiles', headers=headers).get_json()['captures']) == ['homes.get_homes']
+
+    profiled = client.get('/api/homes/')
+    assert 'X-Profile-Id' in profiled.headers
+    assert 'X-Profile-Id' not in client.get('/api/homes/locations').headers
+    with open(tmp_path / f'{profiled.headers["X-Profile-Id"]}.json') as metadata:
+        assert json.load(metadata)['trigger'] == 'capture'
+
+    assert client.delete('/api/admin/profiles/captures/homes.get_homes', headers=headers).status_code == 200
+    assert 'X-Profile-Id' not in client.get('/api/homes/').headers
+    assert client.delete('/api/admin/profiles/captures/homes.get_homes', headers=headers).status_code == 404
+    assert client.get('/api/admin/profiles', headers=headers).get_json()['captures'] == {}
+
+
+def test_arming_rejects_bad_captures(app, client):
+    make_user('admin', role='admin')
+    headers = login(client, 'admin')
+
+    for body in ({'endpoint': 'nope.missing'}, {'endpoint': 'homes.get_homes', 'seconds': 0},
+                 {'endpoint': 'homes.get_homes', 'seconds': 'soon'}):
+        response = client.post('/api/admin/profiles/captures', json=body, headers=headers)
+        assert response.status_code == 400, body
+
+
+def test_only_the_newest_profiles_are_kept(app, client, tmp_path):
+    app.config['PROFILER_MAX_PROFILES'] = 2
+    make_user('admin', role='admin')
+    headers = {'X-Profile': 'true', **login(client, 'admin')}
+
+    profile_ids = [client.get('/api/homes/', headers=headers).headers['X-Profile-Id'] for _ in range(4)]
+
+    assert stored(tmp_path, '.json') == stored(tmp_path, '.folded') == profile_ids[-2:]
@@ -0,0 +1,70 @@
+import re
+
+import pytest
+
+from app import db
+from app.models.donation import Donation
+from app.models.review import Review
+from app.models.visit import Visit
+from conftest import future_date, login, make_home, make_user
+
+# List endpoints must cost the same number of SQL statements however many
+# rows a page holds: relationships read by to_dict() are loaded up front,
+# not lazily per row (see app.utils.serialization).
+
+LIST_ENDPOINTS = [
+    ('/api/homes/?per_page=100', None),
+    ('/api/homes/?per_page=100&cursor=', None),
+    ('/api/homes/{home_id}/reviews?per_page=100', None),
+    ('/api/reviews/home/{home_id}?per_page=100', None),
+    ('/api/reviews/my-reviews?per_page=100', 'user'),
+    ('/api/donations/my-donations?per_page=100', 'user'),
+    ('/api/visits/my-visits?per_page=100', 'user'),
+    ('/api/admin/users?per_page=100', 'admin'),
+    ('/api/admin/homes?per_page=100', 'admin'),
+    ('/api/admin/visits?per_page=100', 'admin')
+]
+
+QUERY_COUNT = re.compile(r'db;dur=[\d.]+;desc="(\d+) queries"')
+
+
+def seed(rows, user, home):
+    """`rows` more homes, reviewers, donations and visits by `user` for `home`."""
+    start = Review.query.count()
+    for number in range(start, start + rows):
+        other = make_home(name=f'Home {number}', location='Mombasa')
+        reviewer = make_user(f'reviewer{number}')
+        db.session.add_all([
+            Review(user_id=reviewer.id, home_id=home.id, rating=4, title='Good', comment='Caring staff.'),
+            Review(user_id=user.id, home_id=other.id, rating=5),
+            Donation(user_id=user.id, home_id=home.id, amount=10, status='completed'),
+            Visit(user_id=user.id, home_id=home.id, visit_date=future_date(number + 1), status='pending')
+        ])
+    db.session.commit()
+
+
+def query_counts(client, headers, home_id):
+    counts = {}
+    for path, auth in LIST_ENDPOINTS:
+        path = path.format(home_id=home_id)
+        # The first request warms the per-process home registry and user cache.
+        client.get(path, headers=headers.get(auth, {}))
+        response = client.get(path, headers=headers.get(auth, {}))
+        assert response.status_code == 200, (path, response.data[:200])
+        counts[path] = int(QUERY_COUNT.search(response.headers['Server-Timing']).group(1))
+    return counts
+
+
+@pytest.mark.parametrize('rows', [5])
+def test_list_endpoints_issue_constant_queries(app, client, rows):
+    admin = make_user('admin', role='admin')
+    user = make_user('donor')
+    home = make_home()
+    headers = {'user': login(client, user.username), 'admin': login(client, admin.username)}
+
+    seed(rows, user, home)
+    small = query_counts(client, headers, home.id)
+    seed(rows, user, home)
+    large = query_counts(client, headers, home.id)
+
+    assert large == small
@@ -0,0 +1,17 @@
+from app.services import query_plans
+
+
+def test_hot_queries_use_their_indexes(app):
+    results = query_plans.check_query_plans()
+
+    assert [result['query'] for result in results if not result['uses_index']] == []
+    [available] = [result for result in results if result['query'] == 'home available dates']
+    assert any('visit_capacities' in line for line in available['plan'])
+
+
+def test_unsupported_database_is_skipped(app, monkeypatch):
+    monkeypatch.setattr(query_plans, 'explain', lambda statement: None)
+
+    results = query_plans.check_query_plans()
+
+    assert results and all(result['uses_index'] is None and result['plan'] == [] for result in results)
@@ -0,0 +1,97 @@
+from sqlalchemy import func, select
+
+import main
+from app import db
+from app.models.rating_summary import RATINGS, HomeRatingSummary
+from app.models.review import Review
+from conftest import make_home, make_user
+
+
+def expected_summaries():
+    """home_id -> summary values aggregated straight from the reviews table."""
+    summaries = {}
+    rows = db.session.execute(
+        select(Review.home_id, Review.rating, func.count(Review.id))
+        .where(Review.is_approved == True)
+        .group_by(Review.home_id, Review.rating)
+    )
+    for home_id, rating, count in rows:
+        summary = summaries.setdefault(home_id, {f'count_{value}': 0 for value in RATINGS})
+        summary[f'count_{rating}'] += count
+    for summary in summaries.values():
+        summary['approved_count'] = sum(summary[f'count_{value}'] for value in RATINGS)
+        summary['rating_sum'] = sum(value * summary[f'count_{value}'] for value in RATINGS)
+        summary['average_rating'] = summary['rating_sum'] / summary['approved_count']
+    return summaries
+
+
+def stored_summaries():
+    db.session.expire_all()
+    return {
+        row.home_id: {
+            **{f'count_{value}': getattr(row, f'count_{value}') for value in RATINGS},
+            'approved_count': row.approved_count,
+            'rating_sum': row.rating_sum,
+            'average_rating': row.average_rating
+        }
+        for row in HomeRatingSummary.query.filter(HomeRatingSummary.approved_count > 0)
+    }
+
+
+def assert_in_step():
+    assert stored_summaries() == expected_summaries()
+
+
+def test_review_writes_keep_summaries_in_step(app):
+    users = [make_user(f'reviewer{number}') for number in range(4)]
+    first, second = make_home().id, make_home(name='Other Home').id
+
+    reviews = [Review(user_id=user.id, home_id=first, rating=rating) for user, rating in zip(users, (5, 4, 2, 5))]
+    db.session.add_all(reviews)
+    db.session.commit()
+    assert_in_step()
+
+    reviews[0].rating = 1
+    db.session.commit()
+    assert_in_step()
+
+    reviews[1].home_id = second
+    db.session.commit()
+    assert_in_step()
+
+    reviews[2].home_id = second
+    reviews[2].rating = 3
+    db.session.commit()
+    assert_in_step()
+
+    reviews[3].is_approved = False
+    db.session.commit()
+    assert_in_step()
+
+    db.session.delete(reviews[0])
+    db.session.commit()
+    assert_in_step()
+
+    db.session.delete(reviews[1])
+    db.session.delete(reviews[2])
+    db.session.commit()
+    assert_in_step()
+    assert stored_summaries() == {}
+
+
+def test_rebuild_command_repairs_drift(app):
+    users = [make_user(f'reviewer{number}') for number in range(3)]
+    home_id = make_home().id
+    db.session.add_all(Review(user_id=user.id, home_id=home_id, rating=rating) for user, rating in zip(users, (5, 3, 4)))
+    db.session.commit()
+    summary = db.session.get(HomeRatingSummary, home_id)
+    summary.count_5 = 40
+    summary.rating_sum = 1000
+    summary.approved_count = 1
+    db.session.commit()
+    assert stored_summaries() != expected_summaries()
+
+    result = app.test_cli_runner().invoke(main.rebuild_rating_summaries)
+
+    assert result.exit_code == 0, result.output
+    assert_in_step()
@@ -0,0 +1,61 @@
+import pytest
+
+from app.services.response_cache import MemoryBackend
+from conftest import future_date, login, make_home, make_user
+
+
+@pytest.fixture
+def cache(app):
+    backend = app.extensions['response_cache'] = MemoryBackend(1024 * 1024)
+    return backend
+
+
+def test_invalidate_tags_drops_only_tagged_entries():
+    backend = MemoryBackend(1024)
+    entry = {'status': 200, 'content_type': 'application/json', 'body': b'{}'}
+    backend.set('/api/homes/?', entry, ['homes'], 60)
+    backend.set('/api/homes/1?', entry, ['home:1'], 60)
+    backend.set('/api/homes/2?', entry, ['home:2'], 60)
+
+    backend.invalidate_tags(['home:1'])
+
+    assert backend.get('/api/homes/1?') is None
+    assert backend.get('/api/homes/?') is not None
+    assert backend.get('/api/homes/2?') is not None
+    assert backend.size == 2 * len(entry['body'])
+
+
+def test_completed_donation_invalidates_home_totals(app, client, cache):
+    make_user('donor')
+    headers = login(client, 'donor')
+    home = make_home()
+    path = f'/api/homes/{home.id}'
+
+    assert client.get(path).headers['X-Cache'] == 'MISS'
+    assert client.get('/api/homes/').headers['X-Cache'] == 'MISS'
+    assert client.get(path).headers['X-Cache'] == 'HIT'
+
+    donation = client.post('/api/donations/', json={'home_id': home.id, 'amount': 25}, headers=headers).get_json()
+    assert client.get(path).headers['X-Cache'] == 'HIT'
+
+    client.put(f'/api/donations/{donation["donation"]["id"]}/status', json={'status': 'completed'}, headers=headers)
+
+    response = client.get(path)
+    assert response.headers['X-Cache'] == 'MISS'
+    assert response.get_json()['home']['total_donations_received'] == 25
+    assert client.get('/api/homes/').headers['X-Cache'] == 'MISS'
+
+
+def test_scheduled_visit_invalidates_home_totals(app, client, cache):
+    make_user('visitor')
+    headers = login(client, 'visitor')
+    home = make_home()
+    path = f'/api/homes/{home.id}'
+    client.get(path)
+
+    visit = {'home_id': home.id, 'visit_date': future_date(3).isoformat()}
+    assert client.post('/api/visits/', json=visit, headers=headers).status_code == 201
+
+    response = client.get(path)
+    assert response.headers['X-Cache'] == 'MISS'
+    assert response.get_json()['home']['total_visits'] == 1
@@ -0,0 +1,122 @@
+import io
+import json
+
+from conftest import login, make_user
+
+
+def create_home(client, headers, **fields):
+    response = client.post('/api/admin/homes', json={'location': 'Nairobi', **fields}, headers=headers)
+    assert response.status_code == 201, response.data
+    return response.get_json()['home']['id']
+
+
+def search(client, q):
+    response = client.get('/api/homes/search', query_string={'q': q})
+    assert response.status_code == 200, (q, response.data)
+    return [home['id'] for home in response.get_json()['homes']]
+
+
+def admin(client):
+    make_user('admin', role='admin')
+    return login(client, 'admin')
+
+
+def test_matches_are_ranked_by_field_weight(app, client):
+    headers = admin(client)
+    in_description = create_home(client, headers, name='Grace Home', description='We teach children to read books.')
+    in_needs = create_home(client, headers, name='Mercy Home', needs_description='books and uniforms')
+    in_name = create_home(client, headers, name='Books for Kids Centre')
+    create_home(client, headers, name='Haven Home', description='Clean water project')
+
+    assert search(client, 'books') == [in_name, in_needs, in_description]
+    assert search(client, 'book') == [in_name, in_needs, in_description]
+    assert search(client, 'books uniforms') == [in_needs]
+    assert search(client, 'nothing-matches-this') == []
+
+
+def test_admin_update_is_searchable(app, client):
+    headers = admin(client)
+    home_id = create_home(client, headers, name='Sunrise Home')
+    assert search(client, 'rainbow') == []
+
+    response = client.put(f'/api/admin/homes/{home_id}', json={'name': 'Rainbow Home'}, headers=headers)
+
+    assert response.status_code == 200
+    assert search(client, 'rainbow') == [home_id]
+    assert search(client, 'sunrise') == []
+
+
+def test_imported_homes_are_searchable(app, client):
+    headers = admin(client)
+    body = b'name,location\nShepherd Home,Kisumu\n'
+
+    response = client.post('/api/admin/homes/import?format=csv',
+                           data={'file': (io.BytesIO(body), 'homes.csv')}, headers=headers)
+
+    assert response.status_code == 200 and response.get_json()['imported'] == 1
+    assert len(search(client, 'shepherd')) == 1
+    assert len(search(client, 'kisumu')) == 1
+
+
+def test_deactivated_homes_are_excluded(app, client):
+    headers = admin(client)
+    kept = create_home(client, headers, name='Hope Home')
+    removed = create_home(client, headers, name='Hope Centre')
+    assert sorted(search(client, 'hope')) == sorted([kept, removed])
+
+    assert client.delete(f'/api/admin/homes/{removed}', headers=headers).status_code == 200
+
+    assert search(client, 'hope') == [kept]
+
+
+def test_fts_syntax_in_queries_is_treated_as_text(app, client):
+    headers = admin(client)
+    home_id = create_home(client, headers, name='Hope Home', description='Near the lake')
+
+    for q in ['"hope', 'hope"', 'ho*', '*', '-hope', 'hope -lake', 'NEAR(hope lake)', 'hope NEAR lake',
+              'hope OR', 'AND', '(hope', 'name:hope', '^hope', "hope' --", '+', '"']:
+        search(client, q)
+
+    assert search(client, 'NEAR(hope lake)') == [home_id]
+    assert search(client, '"hope"') == [home_id]
+
+
+def search_pages(client, per_page, **params):
+    ids, number = [], 1
+    while True:
+        response = client.get('/api/homes/search', query_string={**params, 'page': number, 'per_page': per_page})
+        assert response.status_code == 200, response.data
+        data = response.get_json()
+        ids += [home['id'] for home in data['homes']]
+        if not data['pagination']['has_next']:
+            return ids, data
+        number += 1
+
+
+def search_ndjson(client, **params):
+    response = client.get('/api/homes/search', query_string=params, headers={'Accept': 'application/x-ndjson'})
+    assert response.status_code == 200 and response.mimetype == 'application/x-ndjson'
+    body = response.get_data(as_text=True)
+    assert body.endswith('\n')
+    return [json.loads(line)['id'] for line in body.splitlines()]
+
+
+def test_results_are_capped_in_both_modes(app, client):
+    headers = admin(client)
+    for number in range(8):
+        create_home(client, headers, name=f'Hope Home {number}')
+    app.config['SEARCH_MAX_RESULTS'] = 5
+
+    for params in ({'q': 'hope'}, {'location': 'Nairobi'}):
+        ids, last = search_pages(client, 3, **params)
+        assert len(ids) == len(set(ids)) == 5, params
+        assert last['count'] == last['pagination']['total'] == 5
+        assert last['pagination']['pages'] == 2
+
+        response = client.get('/api/homes/search', query_string={**params, 'page': 3, 'per_page': 3})
+        assert response.get_json()['homes'] == []
+        ids, _ = search_pages(client, 100, **params)
+        assert len(ids) == 5
+
+        streamed = search_ndjson(client, **params)
+        assert len(streamed) == len(set(streamed)) == 5, params
@@ -0,0 +1,40 @@
+import json
+import logging
+
+from conftest import make_home
+
+
+def sql_entries(caplog, event):
+    return [(record.levelno, json.loads(record.getMessage())) for record in caplog.records
+            if record.getMessage().startswith('{') and f'"event": "{event}"' in record.getMessage()]
+
+
+def test_request_summary_logged_at_info(app, client, caplog):
+    caplog.set_level(logging.INFO, logger=app.logger.name)
+    make_home()
+
+    client.get('/api/homes/')
+
+    [(level, entry)] = sql_entries(caplog, 'request_sql')
+    assert level == logging.INFO
+    assert entry['endpoint'] == 'homes.get_homes' and entry['queries'] > 0
+
+
+def test_n_plus_one_logged_as_warning(app, client, caplog):
+    for number in range(3):
+        make_home(f'Home {number}')
+    app.config['SQL_N_PLUS_ONE_THRESHOLD'] = 0
+
+    client.get('/api/homes/')
+
+    entries = sql_entries(caplog, 'sql_n_plus_one')
+    assert entries and all(level == logging.WARNING for level, _ in entries)
+
+
+def test_server_timing_only_sent_when_enabled(app, client):
+    make_home()
+
+    assert 'queries' in client.get('/api/homes/').headers['Server-Timing']
+
+    app.config['SQL_SERVER_TIMING'] = False
+    assert 'Server-Timing' not in client.get('/api/homes/').headers
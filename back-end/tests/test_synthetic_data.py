@@ -0,0 +1,61 @@
+from datetime import date, timedelta
+
+from sqlalchemy import func, select
+
+import main
+from app import db
+from app.models.review import Review
+from app.models.visit import Visit
+from app.models.visit_capacity import VisitCapacity
+from app.services.synthetic_data import generate
+from app.services.visit_capacity import HOLDING_STATUSES
+from conftest import make_home, make_user
+
+
+def quiet(message):
+    pass
+
+
+def test_visits_stay_within_capacity(app):
+    today = date(2024, 6, 3)
+    users = [make_user(f'visitor{number}') for number in range(20)]
+    home = make_home()
+    db.session.add(VisitCapacity(home_id=home.id, visit_date=today + timedelta(days=1), capacity=1, reserved=0))
+    db.session.add(Visit(user_id=users[0].id, home_id=home.id, visit_date=today + timedelta(days=2),
+                         number_of_visitors=1, status='confirmed'))
+    db.session.commit()
+
+    generate(0, 0, 0, reviews=0, visits=2000, as_of=today, log=quiet)
+
+    held = dict(db.session.execute(
+        select(Visit.visit_date, func.count(Visit.id))
+        .where(Visit.status.in_(HOLDING_STATUSES))
+        .group_by(Visit.visit_date)
+    ).all())
+    assert held[today + timedelta(days=1)] == 1
+    assert max(held.values()) == app.config['VISIT_DAILY_CAPACITY']
+
+
+def test_reviews_skip_pairs_already_reviewed(app):
+    users = [make_user(f'reviewer{number}') for number in range(10)]
+    homes = [make_home(f'Home {number}') for number in range(3)]
+    db.session.add_all(Review(user_id=user.id, home_id=homes[0].id, rating=5) for user in users)
+    db.session.commit()
+
+    generate(0, 0, 0, reviews=5, visits=0, log=quiet)
+
+    pairs = db.session.execute(select(Review.user_id, Review.home_id)).all()
+    assert len(pairs) == len(set(pairs)) == 15
+
+
+def test_seed_db_reports_skipped_sample_data(app):
+    runner = app.test_cli_runner()
+
+    first = runner.invoke(main.seed_db)
+    assert first.exit_code == 0, first.output
+    assert 'Database seeded with sample data.' in first.output
+
+    second = runner.invoke(main.seed_db)
+    assert second.exit_code == 0, second.output
+    assert 'Sample data already present, skipping it.' in second.output
+    assert 'Database seeded with sample data.' not in second.output
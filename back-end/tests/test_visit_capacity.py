@@ -0,0 +1,135 @@
+from sqlalchemy import func, select
+
+from app import db
+from app.models.visit import Visit
+from app.models.visit_capacity import VisitCapacity
+from app.services.visit_capacity import HOLDING_STATUSES, rebuild_reservations
+from conftest import future_date, login, make_home, make_user
+
+
+def reserved(home_id, visit_date):
+    db.session.expire_all()
+    row = db.session.get(VisitCapacity, (home_id, visit_date))
+    return row.reserved if row else 0
+
+
+def book(client, headers, home_id, visit_date):
+    return client.post('/api/visits/', json={'home_id': home_id, 'visit_date': visit_date.isoformat()}, headers=headers)
+
+
+def test_capacity_accepts_that_many_visits_then_refuses(app, client):
+    make_user('donor')
+    headers = login(client, 'donor')
+    home_id = make_home().id
+    day = future_date(7)
+    capacity = app.config['VISIT_DAILY_CAPACITY']
+
+    for _ in range(capacity):
+        assert book(client, headers, home_id, day).status_code == 201
+    response = book(client, headers, home_id, day)
+
+    assert response.status_code == 409
+    assert reserved(home_id, day) == capacity
+    assert Visit.query.count() == capacity
+
+
+def test_cancelling_and_admin_status_change_free_slots(app, client):
+    make_user('admin', role='admin')
+    make_user('donor')
+    admin_headers = login(client, 'admin')
+    headers = login(client, 'donor')
+    home_id = make_home().id
+    day = future_date(7)
+    visit_ids = [book(client, headers, home_id, day).get_json()['visit']['id']
+                 for _ in range(app.config['VISIT_DAILY_CAPACITY'])]
+    assert book(client, headers, home_id, day).status_code == 409
+
+    assert client.put(f'/api/visits/{visit_ids[0]}/cancel', headers=headers).status_code == 200
+    assert reserved(home_id, day) == len(visit_ids) - 1
+    assert book(client, headers, home_id, day).status_code == 201
+
+    response = client.put(f'/api/admin/visits/{visit_ids[1]}/status', json={'status': 'cancelled'}, headers=admin_headers)
+    assert response.status_code == 200
+    assert reserved(home_id, day) == len(visit_ids) - 1
+    assert book(client, headers, home_id, day).status_code == 201
+    assert book(client, headers, home_id, day).status_code == 409
+
+
+def test_moving_a_visit_moves_its_slot(app, client):
+    make_user('donor')
+    headers = login(client, 'donor')
+    home_id = make_home().id
+    first_day, second_day = future_date(7), future_date(8)
+    visit_id = book(client, headers, home_id, first_day).get_json()['visit']['id']
+
+    response = client.put(f'/api/visits/{visit_id}', json={'visit_date': second_day.isoformat()}, headers=headers)
+
+    assert response.status_code == 200
+    assert reserved(home_id, first_day) == 0
+    assert reserved(home_id, second_day) == 1
+
+
+def test_moving_to_a_full_day_keeps_the_old_slot(app, client):
+    make_user('donor')
+    headers = login(client, 'donor')
+    home_id = make_home().id
+    first_day, full_day = future_date(7), future_date(8)
+    visit_id = book(client, headers, home_id, first_day).get_json()['visit']['id']
+    for _ in range(app.config['VISIT_DAILY_CAPACITY']):
+        assert book(client, headers, home_id, full_day).status_code == 201
+
+    response = client.put(f'/api/visits/{visit_id}', json={'visit_date': full_day.isoformat()}, headers=headers)
+
+    assert response.status_code == 409
+    assert reserved(home_id, first_day) == 1
+    assert reserved(home_id, full_day) == app.config['VISIT_DAILY_CAPACITY']
+    assert db.session.get(Visit, visit_id).visit_date == first_day
+
+
+def test_rebuild_matches_visits_table(app, client):
+    make_user('admin', role='admin')
+    make_user('donor')
+    admin_headers = login(client, 'admin')
+    headers = login(client, 'donor')
+    home_ids = [make_home().id, make_home(name='Other Home').id]
+    for home_id in home_ids:
+        for days in (7, 7, 8):
+            book(client, headers, home_id, future_date(days))
+    client.put('/api/visits/1/cancel', headers=headers)
+    client.put('/api/admin/visits/2/status', json={'status': 'confirmed'}, headers=admin_headers)
+    client.put('/api/admin/visits/3/status', json={'status': 'completed'}, headers=admin_headers)
+    expected = dict(((row[0], row[1]), row[2]) for row in db.session.execute(
+        select(Visit.home_id, Visit.visit_date, func.count(Visit.id))
+        .where(Visit.status.in_(HOLDING_STATUSES))
+        .group_by(Visit.home_id, Visit.visit_date)
+    ))
+    db.session.execute(VisitCapacity.__table__.update().values(reserved=0))
+    db.session.commit()
+
+    rebuild_reservations()
+
+    rows = {(row.home_id, row.visit_date): row.reserved
+            for row in VisitCapacity.query.filter(VisitCapacity.reserved > 0)}
+    assert rows == expected
+
+
+def test_capacity_cannot_drop_below_reserved(app, client):
+    make_user('admin', role='admin')
+    make_user('donor')
+    admin_headers = login(client, 'admin')
+    headers = login(client, 'donor')
+    home_id = make_home().id
+    day = future_date(7)
+    book(client, headers, home_id, day)
+    book(client, headers, home_id, day)
+
+    response = client.put(f'/api/admin/homes/{home_id}/visit-capacity',
+                          json={'visit_date': day.isoformat(), 'capacity': 1}, headers=admin_headers)
+    assert response.status_code == 409
+    assert db.session.get(VisitCapacity, (home_id, day)).capacity == app.config['VISIT_DAILY_CAPACITY']
+
+    response = client.put(f'/api/admin/homes/{home_id}/visit-capacity',
+                          json={'visit_date': day.isoformat(), 'capacity': 2}, headers=admin_headers)
+    assert response.status_code == 200
+    assert response.get_json()['visit_capacity']['available_slots'] == 0
+    assert book(client, headers, home_id, day).status_code == 409